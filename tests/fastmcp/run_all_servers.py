@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 """Quick start script to run all servers for demonstration."""
 
+import importlib
 import multiprocessing
+import signal
+import socket
+import threading
 import time
 from typing import Any
 
@@ -17,66 +21,138 @@ from src.common.constants import (
     PORT_NO_AUTH_SSE,
     OAUTH2_PROVIDER_PORT,
 )
-from src.servers.basic_auth import http_server as basic_http
-from src.servers.basic_auth import sse_server as basic_sse
-from src.servers.api_key import http_server as api_http
-from src.servers.api_key import sse_server as api_sse
-from src.servers.oauth2 import provider as oauth_provider
-from src.servers.oauth2 import http_server as oauth_http
-from src.servers.security_keys import http_server as security_http
-from src.servers.security_keys import sse_server as security_sse
-from src.servers.no_auth import http_server as no_auth_http
-from src.servers.no_auth import sse_server as no_auth_sse
-
-
-def run_server(create_func: Any, transport: str, port: int) -> None:
+
+
+def run_server(module_path: str, transport: str, port: int) -> None:
     """Run a server in a separate process.
     
+    The server module is imported here so each child only loads the one
+    server it runs.
+    
     Args:
-        create_func: Function that creates the server
+        module_path: Import path of the server module exposing create_server()
         transport: Transport type (http or sse)
         port: Port to run on
     """
-    server = create_func()
+    module = importlib.import_module(module_path)
+    server = module.create_server()
     server.run(transport=transport, port=port)
 
 
-def run_oauth_provider_process() -> None:
-    """Run OAuth2 provider."""
+def run_oauth_provider_process(port: int) -> None:
+    """Run OAuth2 provider.
+    
+    Args:
+        port: Port to run on
+    """
     import uvicorn
     
+    from src.servers.oauth2 import provider as oauth_provider
+    
     app = oauth_provider.create_app()
-    uvicorn.run(app, host="127.0.0.1", port=OAUTH2_PROVIDER_PORT, log_level="error", reload=True)
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="error")
+
+
+def port_accepts(port: int) -> bool:
+    """Check whether something on localhost accepts connections on ``port``."""
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+            return True
+    except OSError:
+        return False
+
+
+def wait_until_serving(process: Any, port: int, timeout: float) -> bool:
+    """Wait until ``process`` is listening on ``port``.
+
+    A server that fails to start (e.g. it cannot bind the port) exits, so
+    the wait gives up as soon as its process is gone.
+
+    Args:
+        process: The server's process
+        port: Port the server listens on
+        timeout: Seconds to wait
+
+    Returns:
+        True if the port accepts connections while the process is alive
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not process.is_alive():
+            return False
+        if port_accepts(port):
+            # Still alive after accepting: the listener is this server's
+            return process.is_alive()
+        time.sleep(0.05)
+    return False
+
+
+def get_process_context() -> Any:
+    """Get the multiprocessing context used to spawn servers.
+    
+    Prefers forkserver (POSIX) so children fork from a small, clean process
+    instead of the parent; falls back to spawn elsewhere. The shared server
+    frameworks are preloaded once in the fork server, so each child only
+    imports its own server module.
+    
+    Returns:
+        multiprocessing context
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(["fastmcp", "uvicorn", "starlette"])
+        return ctx
+    return multiprocessing.get_context("spawn")
 
 
 def main() -> None:
     """Start all servers."""
     print("Starting all FastMCP authentication servers...\n")
+    ctx = get_process_context()
     
     servers = [
-        ("Basic Auth HTTP", run_server, (basic_http.create_server, "http", PORT_BASIC_AUTH_HTTP)),
-        ("Basic Auth SSE", run_server, (basic_sse.create_server, "sse", PORT_BASIC_AUTH_SSE)),
-        ("API Key HTTP", run_server, (api_http.create_server, "http", PORT_API_KEY_HTTP)),
-        ("API Key SSE", run_server, (api_sse.create_server, "sse", PORT_API_KEY_SSE)),
-        ("Security Keys HTTP", run_server, (security_http.create_server, "http", PORT_SECURITY_KEYS_HTTP)),
-        ("Security Keys SSE", run_server, (security_sse.create_server, "sse", PORT_SECURITY_KEYS_SSE)),
-        ("OAuth2 MCP Server", run_server, (oauth_http.create_server, "http", PORT_OAUTH2_HTTP)),
-        ("No Auth HTTP", run_server, (no_auth_http.create_server, "http", PORT_NO_AUTH_HTTP)),
-        ("No Auth SSE", run_server, (no_auth_sse.create_server, "sse", PORT_NO_AUTH_SSE)),
-        ("OAuth2 Provider", run_oauth_provider_process, ()),
+        ("Basic Auth HTTP", PORT_BASIC_AUTH_HTTP, run_server, ("src.servers.basic_auth.http_server", "http")),
+        ("Basic Auth SSE", PORT_BASIC_AUTH_SSE, run_server, ("src.servers.basic_auth.sse_server", "sse")),
+        ("API Key HTTP", PORT_API_KEY_HTTP, run_server, ("src.servers.api_key.http_server", "http")),
+        ("API Key SSE", PORT_API_KEY_SSE, run_server, ("src.servers.api_key.sse_server", "sse")),
+        ("Security Keys HTTP", PORT_SECURITY_KEYS_HTTP, run_server, ("src.servers.security_keys.http_server", "http")),
+        ("Security Keys SSE", PORT_SECURITY_KEYS_SSE, run_server, ("src.servers.security_keys.sse_server", "sse")),
+        ("OAuth2 MCP Server", PORT_OAUTH2_HTTP, run_server, ("src.servers.oauth2.http_server", "http")),
+        ("No Auth HTTP", PORT_NO_AUTH_HTTP, run_server, ("src.servers.no_auth.http_server", "http")),
+        ("No Auth SSE", PORT_NO_AUTH_SSE, run_server, ("src.servers.no_auth.sse_server", "sse")),
+        ("OAuth2 Provider", OAUTH2_PROVIDER_PORT, run_oauth_provider_process, ()),
     ]
     
     processes = []
+    pending = []
+    failed = []
     
-    for name, func, args in servers:
+    # Start every server first so they boot in parallel, then wait for readiness
+    for name, port, func, args in servers:
+        # Something else already answering on the port would pass the
+        # readiness probe below, so refuse to start over it
+        if port_accepts(port):
+            print(f"Error: port {port} for {name} is already in use")
+            failed.append(name)
+            continue
         print(f"Starting {name}...")
-        p = multiprocessing.Process(target=func, args=args, daemon=True)
+        p = ctx.Process(target=func, args=(*args, port), daemon=True)
         p.start()
         processes.append(p)
-        time.sleep(0.5)
+        pending.append((name, port, p))
+    
+    # Ready means the port accepts connections, i.e. uvicorn has bound it
+    for name, port, p in pending:
+        if not wait_until_serving(p, port, timeout=15.0):
+            state = "exited" if not p.is_alive() else "is not listening after 15s"
+            print(f"Error: {name} {state} (port {port})")
+            failed.append(name)
     
     print("==================================================================")
-    print("All servers are running!")
+    if failed:
+        print(f"{len(failed)} of {len(servers)} servers failed to start: {', '.join(failed)}")
+    else:
+        print("All servers are running!")
     print("==================================================================")
     print("\nServer URLs:")
     print(f"  Basic Auth HTTP:     http://localhost:{PORT_BASIC_AUTH_HTTP}/mcp")
@@ -92,14 +168,22 @@ def main() -> None:
     print("\nPress Ctrl+C to stop all servers")
     print("==================================================================")
     
+    # Treat SIGTERM like Ctrl+C so children are stopped on normal shutdown too
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    
     try:
-        # Keep main process alive
-        while True:
-            time.sleep(1)
+        # Keep main process alive, blocked until a signal arrives
+        if hasattr(signal, "pause"):
+            while True:
+                signal.pause()
+        else:
+            threading.Event().wait()
     except KeyboardInterrupt:
         print("\n\nStopping all servers...")
         for p in processes:
             p.terminate()
+        for p in processes:
+            p.join(timeout=5)
         print("All servers stopped.")
 
 
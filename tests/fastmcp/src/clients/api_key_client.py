@@ -7,10 +7,12 @@ import asyncio
 import os
 
 from fastmcp import Client
+from fastmcp.client.transports import StreamableHttpTransport
 
-from src.common.constants import DEFAULT_API_KEY
+from src.common.constants import DEFAULT_API_KEY, PORT_API_KEY_HTTP
 from src.common.logging import get_logger, setup_logging
 from src.common.client_logging import default_log_handler
+from src.common.http_client import close_http_transport, get_http_client
 
 
 # Setup logging
@@ -18,38 +20,31 @@ setup_logging()
 logger = get_logger(__name__)
 
 
-async def test_api_key_http_client() -> None:
-    """Test API Key HTTP client connectivity and tool execution."""
-    api_key = os.environ.get("API_KEY", DEFAULT_API_KEY)
-    port = int(os.environ.get("PORT", PORT_API_KEY_HTTP))
-
-    # Create client with API key as bearer token and log handler
-    async with Client(
-        f"http://localhost:{port}/mcp",
-        auth=api_key,
-        log_handler=default_log_handler  # Capture server logs
-    ) as client:
-        logger.info(f"Connected to API Key HTTP Server on port {port}")
+async def test_api_key_http_client(client: Client) -> None:
+    """Test API Key HTTP client tool execution.
 
-        # Test ping
-        await client.ping()
-        logger.info("✓ Ping successful")
+    Args:
+        client: Connected client authenticated with a valid API key
+    """
+    # Test ping
+    await client.ping()
+    logger.info("✓ Ping successful")
 
-        # List tools
-        tools = await client.list_tools()
-        logger.info(f"✓ Available tools: {[tool.name for tool in tools.tools]}")
+    # List tools
+    tools = await client.list_tools()
+    logger.info(f"✓ Available tools: {[tool.name for tool in tools]}")
 
-        # Test get_current_weather tool
-        result = await client.call_tool("get_current_weather", {"city": "London", "units": "metric"})
-        logger.info(f"✓ Current weather result: {result.content[0].text}")
+    # Test get_current_weather tool
+    result = await client.call_tool("get_current_weather", {"city": "London", "units": "metric"})
+    logger.info(f"✓ Current weather result: {result.content[0].text}")
 
-        # Test get_forecast tool
-        result = await client.call_tool("get_forecast", {"city": "Paris", "days": 5})
-        logger.info(f"✓ Forecast result: {result.content[0].text}")
+    # Test get_forecast tool
+    result = await client.call_tool("get_forecast", {"city": "Paris", "days": 5})
+    logger.info(f"✓ Forecast result: {result.content[0].text}")
 
-        # Test get_weather_alerts tool
-        result = await client.call_tool("get_weather_alerts", {"city": "Miami"})
-        logger.info(f"✓ Weather alerts result: {result.content[0].text}")
+    # Test get_weather_alerts tool
+    result = await client.call_tool("get_weather_alerts", {"city": "Miami"})
+    logger.info(f"✓ Weather alerts result: {result.content[0].text}")
 
 
 async def test_without_auth() -> None:
@@ -57,7 +52,12 @@ async def test_without_auth() -> None:
     port = int(os.environ.get("PORT", PORT_API_KEY_HTTP))
 
     try:
-        async with Client(f"http://localhost:{port}/mcp") as client:
+        async with Client(
+            StreamableHttpTransport(
+                f"http://localhost:{port}/mcp",
+                httpx_client_factory=get_http_client,
+            ),
+        ) as client:
             await client.ping()
             logger.error("✗ Request without auth should have failed but succeeded!")
     except Exception as e:
@@ -70,8 +70,11 @@ async def test_with_invalid_key() -> None:
 
     try:
         async with Client(
-            f"http://localhost:{port}/mcp",
-            auth="invalid-api-key-xyz",
+            StreamableHttpTransport(
+                f"http://localhost:{port}/mcp",
+                auth="invalid-api-key-xyz",
+                httpx_client_factory=get_http_client,
+            ),
         ) as client:
             await client.ping()
             logger.error("✗ Request with invalid key should have failed but succeeded!")
@@ -79,16 +82,41 @@ async def test_with_invalid_key() -> None:
         logger.info(f"✓ Request with invalid key properly rejected: {type(e).__name__}")
 
 
+async def run_all_tests() -> None:
+    """Run all client tests on a single event loop.
+
+    The authenticated session is opened once and shared by the positive-path
+    checks; the negative tests need their own unauthenticated connections.
+    """
+    try:
+        api_key = os.environ.get("API_KEY", DEFAULT_API_KEY)
+        port = int(os.environ.get("PORT", PORT_API_KEY_HTTP))
+
+        logger.info("\nTest 1: With valid API key")
+        # Create client with API key as bearer token and log handler
+        async with Client(
+            StreamableHttpTransport(
+                f"http://localhost:{port}/mcp",
+                auth=api_key,
+                httpx_client_factory=get_http_client,
+            ),
+            log_handler=default_log_handler  # Capture server logs
+        ) as client:
+            logger.info(f"Connected to API Key HTTP Server on port {port}")
+            await test_api_key_http_client(client)
+
+        logger.info("\nTest 2: Without API key")
+        await test_without_auth()
+
+        logger.info("\nTest 3: With invalid API key")
+        await test_with_invalid_key()
+    finally:
+        await close_http_transport()
+
+
 if __name__ == "__main__":
     logger.debug("=====================================================")
     logger.info("Testing API Key HTTP Client")
     logger.debug("=====================================================")
 
-    logger.info("\nTest 1: With valid API key")
-    asyncio.run(test_api_key_http_client())
-
-    logger.info("\nTest 2: Without API key")
-    asyncio.run(test_without_auth())
-
-    logger.info("\nTest 3: With invalid API key")
-    asyncio.run(test_with_invalid_key())
+    asyncio.run(run_all_tests())
@@ -17,6 +17,7 @@ from src.common.constants import (
 )
 from src.common.logging import get_logger, setup_logging
 from src.common.client_logging import default_log_handler
+from src.common.http_client import close_http_transport, get_http_client
 
 
 # Setup logging
@@ -24,54 +25,41 @@ setup_logging()
 logger = get_logger(__name__)
 
 
-async def test_basic_auth_http_client() -> None:
-    """Test Basic Auth HTTP client connectivity and tool execution."""
-    username = os.environ.get("AUTH_USERNAME", DEFAULT_USERNAME)
-    password = os.environ.get("AUTH_PASSWORD", DEFAULT_PASSWORD)
-    port = int(os.environ.get("PORT", DEFAULT_HTTP_PORT))
+async def test_basic_auth_http_client(client: Client) -> None:
+    """Test Basic Auth HTTP client tool execution.
+
+    Args:
+        client: Connected client authenticated with valid credentials
+    """
+    # Test ping
+    await client.ping()
+    logger.info("✓ Ping successful")
+
+    # List tools
+    tools = await client.list_tools()
+    logger.info(f"✓ Available tools: {[tool.name for tool in tools]}")
+
+    # Test create_project tool
+    result = await client.call_tool("create_project", {
+        "name": "Test Project",
+        "description": "A test project",
+        "deadline": "2024-12-31",
+        "priority": "high"
+    })
+    logger.info(f"✓ Create project result: {result.content[0].text}")
 
-    # Create basic auth header
-    auth_header = create_basic_auth_header(username, password)
-
-    # Create transport with basic auth
-    transport = StreamableHttpTransport(
-        f"http://localhost:{port}/mcp",
-        headers={"Authorization": auth_header},
-    )
-
-    # Create client
-    async with Client(transport, log_handler=default_log_handler) as client:
-        logger.info(f"Connected to Basic Auth HTTP Server on port {port}")
-
-        # Test ping
-        await client.ping()
-        logger.info("✓ Ping successful")
-
-        # List tools
-        tools = await client.list_tools()
-        logger.info(f"✓ Available tools: {[tool.name for tool in tools.tools]}")
-
-        # Test create_project tool
-        result = await client.call_tool("create_project", {
-            "name": "Test Project",
-            "description": "A test project",
-            "deadline": "2024-12-31",
-            "priority": "high"
-        })
-        logger.info(f"✓ Create project result: {result.content[0].text}")
-
-        # Test add_task tool
-        result = await client.call_tool("add_task", {
-            "project_id": "proj_001",
-            "title": "Implement feature",
-            "assignee": "Alice",
-            "due_date": "2024-06-01"
-        })
-        logger.info(f"✓ Add task result: {result.content[0].text}")
-
-        # Test get_project_status tool
-        result = await client.call_tool("get_project_status", {"project_id": "proj_001"})
-        logger.info(f"✓ Project status result: {result.content[0].text}")
+    # Test add_task tool
+    result = await client.call_tool("add_task", {
+        "project_id": "proj_001",
+        "title": "Implement feature",
+        "assignee": "Alice",
+        "due_date": "2024-06-01"
+    })
+    logger.info(f"✓ Add task result: {result.content[0].text}")
+
+    # Test get_project_status tool
+    result = await client.call_tool("get_project_status", {"project_id": "proj_001"})
+    logger.info(f"✓ Project status result: {result.content[0].text}")
 
 
 async def test_without_auth() -> None:
@@ -80,7 +68,10 @@ async def test_without_auth() -> None:
 
     try:
         # Create transport without auth
-        transport = StreamableHttpTransport(f"http://localhost:{port}/mcp")
+        transport = StreamableHttpTransport(
+            f"http://localhost:{port}/mcp",
+            httpx_client_factory=get_http_client,
+        )
 
         async with Client(transport) as client:
             await client.ping()
@@ -89,13 +80,41 @@ async def test_without_auth() -> None:
         logger.info(f"✓ Request without auth properly rejected: {type(e).__name__}")
 
 
+async def run_all_tests() -> None:
+    """Run all client tests on a single event loop.
+
+    The authenticated session is opened once and shared by the positive-path
+    checks; the negative test needs its own unauthenticated connection.
+    """
+    try:
+        username = os.environ.get("AUTH_USERNAME", DEFAULT_USERNAME)
+        password = os.environ.get("AUTH_PASSWORD", DEFAULT_PASSWORD)
+        port = int(os.environ.get("PORT", DEFAULT_HTTP_PORT))
+
+        # Create basic auth header
+        auth_header = create_basic_auth_header(username, password)
+
+        # Create transport with basic auth
+        transport = StreamableHttpTransport(
+            f"http://localhost:{port}/mcp",
+            headers={"Authorization": auth_header},
+            httpx_client_factory=get_http_client,
+        )
+
+        logger.info("\nTest 1: With valid credentials")
+        async with Client(transport, log_handler=default_log_handler) as client:
+            logger.info(f"Connected to Basic Auth HTTP Server on port {port}")
+            await test_basic_auth_http_client(client)
+
+        logger.info("\nTest 2: Without credentials")
+        await test_without_auth()
+    finally:
+        await close_http_transport()
+
+
 if __name__ == "__main__":
     logger.debug("=====================================================")
     logger.info("Testing Basic Auth HTTP Client")
     logger.debug("=====================================================")
 
-    logger.info("\nTest 1: With valid credentials")
-    asyncio.run(test_basic_auth_http_client())
-
-    logger.info("\nTest 2: Without credentials")
-    asyncio.run(test_without_auth())
+    asyncio.run(run_all_tests())
@@ -9,10 +9,12 @@ import asyncio
 import os
 
 from fastmcp import Client
+from fastmcp.client.transports import StreamableHttpTransport
 
 from src.common.constants import OAUTH2_PROVIDER_PORT, PORT_OAUTH2_HTTP
 from src.common.logging import get_logger, setup_logging
 from src.common.client_logging import default_log_handler
+from src.common.http_client import close_http_transport, get_http_client
 
 
 # Setup logging
@@ -20,41 +22,31 @@ setup_logging()
 logger = get_logger(__name__)
 
 
-async def test_oauth2_client_with_token(access_token: str) -> None:
-    """Test OAuth2 HTTP client with an access token.
+async def test_oauth2_client_with_token(client: Client) -> None:
+    """Test OAuth2 HTTP client tool execution.
 
     Args:
-        access_token: OAuth2 access token
+        client: Connected client authenticated with an OAuth2 access token
     """
-    port = int(os.environ.get("PORT", PORT_OAUTH2_HTTP))
-
-    # Use access token as bearer token
-    async with Client(
-        f"http://localhost:{port}/mcp",
-        auth=access_token,
-        log_handler=default_log_handler
-    ) as client:
-        logger.info(f"Connected to OAuth2 HTTP Server on port {port}")
-
-        # Test ping
-        await client.ping()
-        logger.info("✓ Ping successful")
+    # Test ping
+    await client.ping()
+    logger.info("✓ Ping successful")
 
-        # List tools
-        tools = await client.list_tools()
-        logger.info(f"✓ Available tools: {[tool.name for tool in tools.tools]}")
+    # List tools
+    tools = await client.list_tools()
+    logger.info(f"✓ Available tools: {[tool.name for tool in tools]}")
 
-        # Test send_email tool
-        result = await client.call_tool("send_email", {
-            "to": "dave@example.com",
-            "subject": "Test Email",
-            "body": "Hello from OAuth2 client!"
-        })
-        logger.info(f"✓ Send email result: {result.content[0].text}")
+    # Test send_email tool
+    result = await client.call_tool("send_email", {
+        "to": "dave@example.com",
+        "subject": "Test Email",
+        "body": "Hello from OAuth2 client!"
+    })
+    logger.info(f"✓ Send email result: {result.content[0].text}")
 
-        # Test get_inbox tool
-        result = await client.call_tool("get_inbox", {"folder": "inbox", "limit": 10})
-        logger.info(f"✓ Get inbox result: {result.content[0].text}")
+    # Test get_inbox tool
+    result = await client.call_tool("get_inbox", {"folder": "inbox", "limit": 10})
+    logger.info(f"✓ Get inbox result: {result.content[0].text}")
 
 
 async def test_with_oauth_flow() -> None:
@@ -76,13 +68,51 @@ async def test_without_auth() -> None:
     port = int(os.environ.get("PORT", PORT_OAUTH2_HTTP))
 
     try:
-        async with Client(f"http://localhost:{port}/mcp") as client:
+        async with Client(
+            StreamableHttpTransport(
+                f"http://localhost:{port}/mcp",
+                httpx_client_factory=get_http_client,
+            ),
+        ) as client:
             await client.ping()
             logger.error("✗ Request without auth should have failed but succeeded!")
     except Exception as e:
         logger.info(f"✓ Request without auth properly rejected: {type(e).__name__}")
 
 
+async def run_all_tests(access_token: str | None = None) -> None:
+    """Run all client tests on a single event loop.
+
+    Args:
+        access_token: Optional OAuth2 access token; when given, one authenticated
+            session is opened and shared by the positive-path checks
+    """
+    try:
+        port = int(os.environ.get("PORT", PORT_OAUTH2_HTTP))
+
+        # Test with full OAuth flow info
+        await test_with_oauth_flow()
+
+        logger.info("\nTest: Without authentication")
+        await test_without_auth()
+
+        if access_token:
+            logger.info("\nTest: With access token")
+            # Use access token as bearer token
+            async with Client(
+                StreamableHttpTransport(
+                    f"http://localhost:{port}/mcp",
+                    auth=access_token,
+                    httpx_client_factory=get_http_client,
+                ),
+                log_handler=default_log_handler
+            ) as client:
+                logger.info(f"Connected to OAuth2 HTTP Server on port {port}")
+                await test_oauth2_client_with_token(client)
+    finally:
+        await close_http_transport()
+
+
 if __name__ == "__main__":
     logger.debug("=====================================================")
     logger.info("Testing OAuth2 HTTP Client")
@@ -94,12 +124,6 @@ if __name__ == "__main__":
     logger.info("2. Use the FastMCP OAuth helper with auth='oauth'")
     logger.info(f"3. OAuth2 Provider: http://localhost:{OAUTH2_PROVIDER_PORT}")
 
-    # Test with full OAuth flow info
-    asyncio.run(test_with_oauth_flow())
-
-    logger.info("\nTest: Without authentication")
-    asyncio.run(test_without_auth())
-
-    # If you have a token, you can test with it:
-    # token = "your-access-token-here"
-    # asyncio.run(test_oauth2_client_with_token(token))
+    # If you have a token, export it to also run the authenticated checks:
+    # OAUTH2_ACCESS_TOKEN=your-access-token-here
+    asyncio.run(run_all_tests(os.environ.get("OAUTH2_ACCESS_TOKEN")))
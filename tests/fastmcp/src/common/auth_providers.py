@@ -1,7 +1,10 @@
 """Custom authentication providers for FastMCP."""
 
+import asyncio
 import base64
+import hashlib
 import hmac
+import os
 import secrets
 
 import bcrypt
@@ -13,6 +16,60 @@ from src.common.logging import get_logger
 logger = get_logger(__name__)
 logger.debug("auth_providers.py module loaded")
 
+# Per-process key for key_digest()
+_DIGEST_KEY = os.urandom(16)
+
+
+def _parse_basic(token_b64: str) -> tuple[str, bytes]:
+    """Split a base64 'username:password' token into its parts.
+
+    Not cached: the cache key would be whatever token a client sends, and
+    the values the decoded (possibly wrong) credentials.
+
+    Args:
+        token_b64: Base64-encoded credentials (username:password)
+
+    Returns:
+        Tuple of (username, password bytes)
+
+    Raises:
+        ValueError: If the token is not valid base64 or has no ':' separator
+    """
+    raw = base64.b64decode(token_b64)
+    sep = raw.index(b":")
+    return raw[:sep].decode("utf-8"), raw[sep + 1:]
+
+
+def key_digest(key: str) -> bytes:
+    """Keyed BLAKE2b digest of an API or security key.
+
+    Valid keys are stored and looked up only as digests, so a lookup's timing
+    depends on keyed hashes rather than on how much of a stored key matches.
+
+    Args:
+        key: The key (or a presented token)
+
+    Returns:
+        16-byte digest, keyed per process
+    """
+    return hashlib.blake2b(key.encode(), digest_size=16, key=_DIGEST_KEY).digest()
+
+
+def parse_api_keys(raw: str) -> frozenset[str]:
+    """Parse a comma-separated list of keys, ignoring blanks.
+
+    Args:
+        raw: Comma-separated keys (e.g. the API_KEYS environment variable)
+
+    Returns:
+        Frozenset of stripped, non-empty keys
+
+    Example:
+        >>> parse_api_keys("key-1, key-2,,")
+        frozenset({'key-1', 'key-2'})
+    """
+    return frozenset(key for key in map(str.strip, raw.split(",")) if key)
+
 
 class BasicAuthTokenVerifier(DebugTokenVerifier):
     """Token verifier for HTTP Basic Authentication.
@@ -28,6 +85,7 @@ class BasicAuthTokenVerifier(DebugTokenVerifier):
         client_id: str = "basic-auth-client",
         scopes: list[str] | None = None,
         additional_credentials: list[tuple[str, str]] | None = None,
+        fast_hash: bool = True,
     ) -> None:
         """Initialize the basic auth verifier.
 
@@ -37,16 +95,21 @@ class BasicAuthTokenVerifier(DebugTokenVerifier):
             client_id: Client identifier for auth context
             scopes: List of scopes granted to authenticated users
             additional_credentials: Optional list of (username, password) tuples for additional valid credentials
+            fast_hash: Store SHA-256 digests and compare with hmac.compare_digest (default).
+                Set to False to use bcrypt hashes instead (checked off the event loop).
         """
-        # Store multiple credential pairs
-        self.valid_credentials = {
-            username: bcrypt.hashpw(password.encode(), bcrypt.gensalt())
-        }
-        
-        # Add any additional credential pairs
-        if additional_credentials:
-            for user, pwd in additional_credentials:
-                self.valid_credentials[user] = bcrypt.hashpw(pwd.encode(), bcrypt.gensalt())
+        self.fast_hash = fast_hash
+
+        # Store multiple credential pairs (username -> password hash)
+        credentials = [(username, password), *(additional_credentials or [])]
+        if fast_hash:
+            self.valid_credentials = {
+                user: hashlib.sha256(pwd.encode()).digest() for user, pwd in credentials
+            }
+        else:
+            self.valid_credentials = {
+                user: bcrypt.hashpw(pwd.encode(), bcrypt.gensalt()) for user, pwd in credentials
+            }
 
         # Create validation function that checks basic auth format
         # Note: FastMCP's BearerAuthBackend strips "Bearer " prefix before passing token
@@ -63,30 +126,38 @@ class BasicAuthTokenVerifier(DebugTokenVerifier):
             """
             logger.debug("=====================================================")
             logger.debug("Basic Auth validation called")
-            logger.debug(f"Received token length: {len(token)}")
+            logger.debug("Received token length: %d", len(token))
             
             try:
                 # Decode base64 credentials
-                credentials = base64.b64decode(token).decode("utf-8")
-                provided_username, provided_password = credentials.split(":", 1)
-                logger.debug(f"Provided username: {provided_username}")
+                provided_username, provided_password = _parse_basic(token)
+                logger.debug("Provided username: %s", provided_username)
 
                 # Check if username exists in valid credentials
                 if provided_username not in self.valid_credentials:
-                    logger.warning(f"Unknown username: {provided_username}")
+                    logger.warning("Unknown username: %s", provided_username)
                     return False
 
                 # Verify password for this username
                 password_hash = self.valid_credentials[provided_username]
-                password_match = bcrypt.checkpw(
-                    provided_password.encode(),
-                    password_hash,
-                )
-                logger.debug(f"Password match: {password_match}")
+                if self.fast_hash:
+                    password_match = hmac.compare_digest(
+                        password_hash,
+                        hashlib.sha256(provided_password).digest(),
+                    )
+                else:
+                    # bcrypt is CPU-bound (~100 ms), keep it off the event loop
+                    password_match = await asyncio.get_running_loop().run_in_executor(
+                        None,
+                        bcrypt.checkpw,
+                        provided_password,
+                        password_hash,
+                    )
+                logger.debug("Password match: %s", password_match)
                 logger.debug("=====================================================")
                 return password_match
             except Exception as e:
-                logger.error(f"Validation error: {e}")
+                logger.error("Validation error: %s", e)
                 logger.debug("=====================================================")
                 return False
 
@@ -105,7 +176,7 @@ class APIKeyVerifier(DebugTokenVerifier):
 
     def __init__(
         self,
-        valid_api_keys: set[str],
+        valid_api_keys: set[str] | frozenset[str],
         client_id: str = "api-key-client",
         scopes: list[str] | None = None,
     ) -> None:
@@ -116,7 +187,9 @@ class APIKeyVerifier(DebugTokenVerifier):
             client_id: Client identifier for auth context
             scopes: List of scopes granted to authenticated users
         """
-        self.valid_api_keys = valid_api_keys
+        self.valid_api_keys = frozenset(valid_api_keys)
+        # Presented tokens are looked up by keyed digest, never by the key itself
+        self._key_digests = frozenset(map(key_digest, self.valid_api_keys))
 
         # Create validation function that checks if API key is valid
         def validate(token: str) -> bool:
@@ -128,11 +201,7 @@ class APIKeyVerifier(DebugTokenVerifier):
             Returns:
                 True if API key is valid
             """
-            # Use constant-time comparison to prevent timing attacks
-            return any(
-                hmac.compare_digest(token, valid_key)
-                for valid_key in self.valid_api_keys
-            )
+            return key_digest(token) in self._key_digests
 
         super().__init__(
             validate=validate,
@@ -163,7 +232,9 @@ class SecurityKeyVerifier(DebugTokenVerifier):
             scopes: List of scopes granted to authenticated users
         """
         self.key_name = key_name
-        self.valid_keys = valid_keys
+        self.valid_keys = frozenset(valid_keys)
+        # Presented tokens are looked up by keyed digest, never by the key itself
+        self._key_digests = frozenset(map(key_digest, self.valid_keys))
 
         # Create validation function that checks if security key is valid
         def validate(token: str) -> bool:
@@ -175,11 +246,7 @@ class SecurityKeyVerifier(DebugTokenVerifier):
             Returns:
                 True if security key is valid
             """
-            # Use constant-time comparison to prevent timing attacks
-            return any(
-                hmac.compare_digest(token, valid_key)
-                for valid_key in self.valid_keys
-            )
+            return key_digest(token) in self._key_digests
 
         super().__init__(
             validate=validate,
@@ -203,6 +270,9 @@ def generate_secure_token(length: int = 32) -> str:
 def create_basic_auth_header(username: str, password: str) -> str:
     """Create HTTP Basic Authentication header value.
 
+    Build it once where the client is set up; it is not cached here, so
+    passwords aren't kept in a process-wide cache.
+
     Args:
         username: Username
         password: Password
@@ -210,6 +280,5 @@ def create_basic_auth_header(username: str, password: str) -> str:
     Returns:
         Basic auth header value (e.g., 'Basic <base64>')
     """
-    credentials = f"{username}:{password}"
-    encoded = base64.b64encode(credentials.encode()).decode()
+    encoded = base64.b64encode(f"{username}:{password}".encode()).decode("ascii")
     return f"Basic {encoded}"
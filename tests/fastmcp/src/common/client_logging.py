@@ -25,6 +25,46 @@ LOGGING_LEVEL_MAP = {
     "emergency": logging.CRITICAL,  # MCP emergency -> Python CRITICAL
 }
 
+# MCP levels forwarded by error_only_log_handler
+_ERROR_LEVELS = frozenset({"error", "critical", "alert", "emergency", "warning"})
+
+# Loggers resolved per source name on first use
+_logger_cache: dict[str, logging.Logger] = {}
+
+
+def _resolve_level(level_name: str, default: int) -> int:
+    """Map an MCP level name to a Python logging level.
+
+    MCP level names are lowercase on the wire, so the exact name is tried
+    first and str.lower() only runs for non-conforming input.
+
+    Args:
+        level_name: MCP logging level name
+        default: Level to use for unknown names
+
+    Returns:
+        Python logging level
+    """
+    level = LOGGING_LEVEL_MAP.get(level_name)
+    if level is None:
+        level = LOGGING_LEVEL_MAP.get(level_name.lower(), default)
+    return level
+
+
+def _get_cached_logger(name: str) -> logging.Logger:
+    """Get a logger by name, caching it for subsequent log messages.
+
+    Args:
+        name: Logger name
+
+    Returns:
+        Logger instance for the given name
+    """
+    cached = _logger_cache.get(name)
+    if cached is not None:
+        return cached
+    return _logger_cache.setdefault(name, logging.getLogger(name))
+
 
 async def default_log_handler(message: LogMessage) -> None:
     """Default log handler for MCP clients.
@@ -46,21 +86,25 @@ async def default_log_handler(message: LogMessage) -> None:
         ...     log_handler=default_log_handler
         ... )
     """
-    msg = message.data.get('msg', '')
-    extra = message.data.get('extra')
-    logger_name = message.logger or 'mcp.server'
-    
     # Get appropriate log level
-    level = LOGGING_LEVEL_MAP.get(message.level.lower(), logging.INFO)
+    level = _resolve_level(message.level, logging.INFO)
     
     # Get or create logger for this source
-    server_logger = logging.getLogger(logger_name)
+    server_logger = _get_cached_logger(message.logger or 'mcp.server')
+    if not server_logger.isEnabledFor(level):
+        return
+    
+    data = message.data
+    msg = data.get('msg', '')
+    extra = data.get('extra')
     
     # Log with extra data if present
+    # Formatting is deferred to the logging handlers via %s args;
+    # the raw extra dict is also attached to the record as mcp_extra
     if extra:
-        server_logger.log(level, f"{msg} | Extra: {extra}")
+        server_logger.log(level, "%s | Extra: %s", msg, extra, extra={"mcp_extra": extra})
     else:
-        server_logger.log(level, msg)
+        server_logger.log(level, "%s", msg)
 
 
 async def detailed_log_handler(message: LogMessage) -> None:
@@ -78,8 +122,9 @@ async def detailed_log_handler(message: LogMessage) -> None:
         ...     log_handler=detailed_log_handler
         ... )
     """
-    msg = message.data.get('msg', '')
-    extra = message.data.get('extra')
+    data = message.data
+    msg = data.get('msg', '')
+    extra = data.get('extra')
     
     level_upper = message.level.upper()
     
@@ -89,10 +134,10 @@ async def detailed_log_handler(message: LogMessage) -> None:
         prefix = f"[{level_upper}]"
     
     if extra:
-        logger.info(f"{prefix} {msg}")
-        logger.info(f"  Extra data: {extra}")
+        logger.info("%s %s", prefix, msg)
+        logger.info("  Extra data: %s", extra)
     else:
-        logger.info(f"{prefix} {msg}")
+        logger.info("%s %s", prefix, msg)
 
 
 async def error_only_log_handler(message: LogMessage) -> None:
@@ -110,14 +155,22 @@ async def error_only_log_handler(message: LogMessage) -> None:
         ...     log_handler=error_only_log_handler
         ... )
     """
-    if message.level.lower() in ['error', 'critical', 'alert', 'emergency', 'warning']:
-        msg = message.data.get('msg', '')
-        extra = message.data.get('extra')
-        
-        level = LOGGING_LEVEL_MAP.get(message.level.lower(), logging.ERROR)
-        server_logger = logging.getLogger(f'mcp.server.{message.logger or "unknown"}')
-        
-        if extra:
-            server_logger.log(level, f"{msg} | Extra: {extra}")
-        else:
-            server_logger.log(level, msg)
+    level_name = message.level
+    if level_name not in _ERROR_LEVELS and level_name.lower() not in _ERROR_LEVELS:
+        return
+    
+    level = _resolve_level(level_name, logging.ERROR)
+    server_logger = _get_cached_logger(f'mcp.server.{message.logger or "unknown"}')
+    if not server_logger.isEnabledFor(level):
+        return
+    
+    data = message.data
+    msg = data.get('msg', '')
+    extra = data.get('extra')
+    
+    # Formatting is deferred to the logging handlers via %s args;
+    # the raw extra dict is also attached to the record as mcp_extra
+    if extra:
+        server_logger.log(level, "%s | Extra: %s", msg, extra, extra={"mcp_extra": extra})
+    else:
+        server_logger.log(level, "%s", msg)
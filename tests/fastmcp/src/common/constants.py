@@ -28,6 +28,8 @@ DEFAULT_BRAVE_API_KEY = "BSA1234567890abcdefghijklmnopqrstuvwxyz"
 DEFAULT_OAUTH2_CLIENT_ID = "test-client-id"
 DEFAULT_OAUTH2_CLIENT_SECRET = "test-client-secret"
 DEFAULT_OAUTH2_TOKEN_EXPIRY = 3600  # 1 hour in seconds
+DEFAULT_OAUTH2_JWT_SECRET = "mcp-oauth2-test-secret-key-do-not-use-in-production"
+OAUTH2_JWT_ALGORITHM = "HS256"
 
 # Server names - User-friendly with versions
 SERVER_NAME_BASIC_HTTP = "Project Manager v1.0"
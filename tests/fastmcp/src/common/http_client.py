@@ -0,0 +1,94 @@
+"""Shared HTTP connection pool for FastMCP clients.
+
+FastMCP transports build (and close) a fresh ``httpx.AsyncClient`` for every
+session. This module provides an ``httpx_client_factory`` whose clients all
+send requests through one pooled transport, so TCP connections are kept alive
+and reused across sessions instead of being re-established each time.
+"""
+
+import functools
+
+import httpx
+
+# Connection pool tuning shared by all clients
+HTTP_LIMITS = httpx.Limits(
+    max_keepalive_connections=20,
+    max_connections=100,
+    keepalive_expiry=30.0,
+)
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+
+class _SharedTransport(httpx.AsyncBaseTransport):
+    """Transport that delegates to the shared pool.
+
+    Closing a client only closes this wrapper; the pool stays open for the
+    next session until close_http_transport() is called.
+    """
+
+    def __init__(self, pool: httpx.AsyncHTTPTransport) -> None:
+        self._pool = pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._pool.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        # The pool outlives individual clients
+        pass
+
+
+@functools.lru_cache(maxsize=1)
+def get_http_transport() -> httpx.AsyncHTTPTransport:
+    """Get the process-wide pooled HTTP transport.
+
+    Returns:
+        Shared AsyncHTTPTransport configured with HTTP_LIMITS
+    """
+    return httpx.AsyncHTTPTransport(limits=HTTP_LIMITS)
+
+
+def get_http_client(
+    headers: dict[str, str] | None = None,
+    timeout: httpx.Timeout | None = None,
+    auth: httpx.Auth | None = None,
+    follow_redirects: bool = True,
+) -> httpx.AsyncClient:
+    """Create an httpx client backed by the shared connection pool.
+
+    Matches FastMCP's ``httpx_client_factory`` signature, so it can be passed
+    straight to StreamableHttpTransport / SSETransport.
+
+    Args:
+        headers: Headers sent with every request
+        timeout: Request timeout (defaults to HTTP_TIMEOUT)
+        auth: Optional httpx auth handler
+        follow_redirects: Whether to follow redirects
+
+    Returns:
+        AsyncClient sharing the process-wide connection pool
+
+    Example:
+        >>> transport = StreamableHttpTransport(
+        ...     "http://localhost:8002/mcp",
+        ...     auth=api_key,
+        ...     httpx_client_factory=get_http_client,
+        ... )
+    """
+    return httpx.AsyncClient(
+        headers=headers,
+        timeout=timeout or HTTP_TIMEOUT,
+        auth=auth,
+        follow_redirects=follow_redirects,
+        transport=_SharedTransport(get_http_transport()),
+    )
+
+
+async def close_http_transport() -> None:
+    """Close the shared connection pool.
+
+    Call this once, on the event loop that used the pool, when all
+    clients are done.
+    """
+    if get_http_transport.cache_info().currsize:
+        await get_http_transport().aclose()
+        get_http_transport.cache_clear()
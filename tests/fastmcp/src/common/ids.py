@@ -0,0 +1,26 @@
+"""Identifier helpers shared by the demo servers."""
+
+import os
+
+# Bound once; new_uuid4_str() is called for every generated ID
+_urandom = os.urandom
+
+
+def new_uuid4_str() -> str:
+    """Generate a random (version 4) UUID string.
+
+    Same output format as ``str(uuid.uuid4())``, built straight from
+    os.urandom without creating a UUID object.
+
+    Returns:
+        Canonical 36-character UUID string
+
+    Example:
+        >>> len(new_uuid4_str())
+        36
+    """
+    b = bytearray(_urandom(16))
+    b[6] = (b[6] & 0x0F) | 0x40  # version 4
+    b[8] = (b[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = b.hex()
+    return f"{h[0:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:32]}"
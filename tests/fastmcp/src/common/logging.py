@@ -4,15 +4,51 @@ This module provides structured logging capabilities using Python's built-in
 logging module, following FastMCP best practices.
 """
 
+import atexit
+import contextlib
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any
 
-# Configure the root logger for the application
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
+# Configure the root logger for the application, once per process.
+# %(created).3f is the raw epoch time from the record, which avoids a
+# localtime/strftime call per emitted line that %(asctime)s would need.
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(created).3f - %(name)s - %(levelname)s - %(message)s',
+    )
+
+# Pre-built mask characters, sliced by mask_sensitive_value
+_STAR_POOL = '*' * 256
+
+# log_startup keyword -> display name (e.g. api_keys_count -> Api Keys Count)
+_DISPLAY_KEY_CACHE: dict[str, str] = {}
+
+# Background listener started by setup_logging (drains the log queue to stderr)
+_listener: QueueListener | None = None
+
+
+class _DropOnFullQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full."""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        with contextlib.suppress(queue.Full):
+            self.queue.put_nowait(record)
+
+
+def _stop_listener() -> None:
+    """Flush and stop the background log listener, if one is running."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(_stop_listener)
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -36,14 +72,22 @@ def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
 
 
-def setup_logging(level: int = logging.INFO, format_string: str | None = None) -> None:
+def setup_logging(
+    level: int = logging.INFO,
+    format_string: str | None = None,
+    queue_size: int = 10_000,
+) -> None:
     """Configure global logging settings.
     
     Call this at application startup to customize logging behavior.
+    Records are handed to a bounded queue and written to stderr by a
+    background thread, so logging calls never block on stream I/O.
+    If the queue is full, new records are dropped.
     
     Args:
         level: Logging level (e.g., logging.DEBUG, logging.INFO)
         format_string: Custom format string for log messages
+        queue_size: Maximum number of records buffered for the writer thread
         
     Example:
         >>> setup_logging(level=logging.DEBUG)
@@ -52,15 +96,33 @@ def setup_logging(level: int = logging.INFO, format_string: str | None = None) -
         ...     format_string='%(asctime)s [%(levelname)s] %(name)s: %(message)s'
         ... )
     """
+    global _listener
+    _stop_listener()
+    
+    # Drop existing handlers so repeated calls never stack up duplicates
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    
     if format_string:
         logging.basicConfig(
             level=level,
             format=format_string,
             datefmt='%Y-%m-%d %H:%M:%S',
-            force=True  # Override existing configuration
         )
     else:
-        logging.basicConfig(level=level, force=True)
+        logging.basicConfig(level=level)
+    
+    # Move the configured stream handler behind a queue
+    handlers = root.handlers[:]
+    for handler in handlers:
+        root.removeHandler(handler)
+    
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=queue_size)
+    root.addHandler(_DropOnFullQueueHandler(log_queue))
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
 
 
 def log_startup(logger: logging.Logger, server_name: str, port: int, **kwargs: Any) -> None:
@@ -77,13 +139,15 @@ def log_startup(logger: logging.Logger, server_name: str, port: int, **kwargs: A
         >>> log_startup(logger, "API Key SSE Server", 8003, api_keys_count=5)
     """
     logger.debug("=====================================================")
-    logger.info(f"Starting {server_name}")
-    logger.info(f"Port: {port}")
+    logger.info("Starting %s", server_name)
+    logger.info("Port: %d", port)
     
     for key, value in kwargs.items():
-        # Format key name nicely (e.g., api_keys_count -> API Keys Count)
-        formatted_key = key.replace('_', ' ').title()
-        logger.info(f"{formatted_key}: {value}")
+        # Format key name nicely (e.g., api_keys_count -> Api Keys Count)
+        formatted_key = _DISPLAY_KEY_CACHE.get(key)
+        if formatted_key is None:
+            formatted_key = _DISPLAY_KEY_CACHE.setdefault(key, key.replace('_', ' ').title())
+        logger.info("%s: %s", formatted_key, value)
     
     logger.debug("=====================================================")
 
@@ -99,10 +163,10 @@ def log_request(logger: logging.Logger, method: str, **details: Any) -> None:
     Example:
         >>> log_request(logger, "tools/call", tool_name="greet", args={"name": "Alice"})
     """
-    logger.debug(f"Request: {method}")
+    logger.debug("Request: %s", method)
     if details:
         for key, value in details.items():
-            logger.debug(f"  {key}: {value}")
+            logger.debug("  %s: %s", key, value)
 
 
 def log_response(logger: logging.Logger, method: str, success: bool, **details: Any) -> None:
@@ -118,10 +182,10 @@ def log_response(logger: logging.Logger, method: str, success: bool, **details:
         >>> log_response(logger, "tools/call", True, result="Hello, Alice!")
     """
     status = "Success" if success else "Failed"
-    logger.debug(f"Response: {method} - {status}")
+    logger.debug("Response: %s - %s", method, status)
     if details:
         for key, value in details.items():
-            logger.debug(f"  {key}: {value}")
+            logger.debug("  %s: %s", key, value)
 
 
 def mask_sensitive_value(value: str, show_chars: int = 30) -> str:
@@ -136,8 +200,10 @@ def mask_sensitive_value(value: str, show_chars: int = 30) -> str:
         
     Example:
         >>> mask_sensitive_value("secret-api-key-12345678", 10)
-        'secret-api... (len=22)'
+        'secret-api... (len=23)'
     """
-    if len(value) <= show_chars:
-        return f"{'*' * len(value)} (len={len(value)})"
-    return f"{value[:show_chars]}... (len={len(value)})"
+    n = len(value)
+    if n <= show_chars:
+        stars = _STAR_POOL[:n] if n <= len(_STAR_POOL) else '*' * n
+        return f"{stars} (len={n})"
+    return f"{value[:show_chars]}... (len={n})"
@@ -4,9 +4,11 @@ This module provides reusable middleware components following FastMCP best pract
 Uses structured logging for production-ready request/response logging.
 """
 
+import logging
+import time
 from typing import Any
 
-from fastmcp.server.middleware import Middleware, MiddlewareContext
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
 from fastmcp.server.middleware.logging import StructuredLoggingMiddleware
 from fastmcp.server.dependencies import get_http_headers
 
@@ -16,55 +18,97 @@ from src.common.logging import get_logger, mask_sensitive_value
 # Get module logger
 logger = get_logger(__name__)
 
+# Separator line around each request's header dump
+_SEP = "=" * 53
+
+# Headers whose values are masked when mask_auth is enabled
+_SENSITIVE_HEADERS = frozenset({"authorization", "proxy-authorization"})
+
 
 class RequestHeaderLoggingMiddleware(Middleware):
     """Custom middleware to log HTTP headers for debugging.
-    
+
     This middleware logs incoming HTTP headers, masking sensitive values
     like Authorization headers. Useful for debugging authentication and
     transport issues.
-    
+
     Example:
         >>> mcp = FastMCP("MyServer")
         >>> mcp.add_middleware(RequestHeaderLoggingMiddleware(server_prefix="MY_SERVER"))
     """
-    
+
     def __init__(self, server_prefix: str = "SERVER", mask_auth: bool = True):
         """Initialize the middleware.
-        
+
         Args:
             server_prefix: Prefix for log messages to identify the server
             mask_auth: Whether to mask Authorization headers (recommended: True)
         """
         self.server_prefix = server_prefix
         self.mask_auth = mask_auth
+        # Bracketed prefix built once for every log line
+        self._prefix = f"[{server_prefix}]"
     
     async def on_request(self, context: MiddlewareContext, call_next):
         """Log HTTP headers when available."""
+        # Nothing below is emitted unless DEBUG is on, so skip the header lookup entirely
+        if not logger.isEnabledFor(logging.DEBUG):
+            return await call_next(context)
+        
         headers = get_http_headers()
         if headers:
-            logger.debug("=====================================================")
-            logger.debug(f"[{self.server_prefix}] Request: {context.method}")
-            logger.debug(f"[{self.server_prefix}] HTTP Headers:")
+            # Build the whole dump as one record so it is queued once and
+            # never interleaves with other requests' lines in the log
+            prefix = self._prefix
+            lines = [
+                _SEP,
+                f"{prefix} Request: {context.method}",
+                f"{prefix} HTTP Headers:",
+            ]
             
             for header_name, header_value in headers.items():
-                if self.mask_auth and 'authorization' in header_name.lower():
+                # ASGI header names are already lowercase; only lower() the odd one out
+                low = header_name if header_name.islower() else header_name.lower()
+                if self.mask_auth and low in _SENSITIVE_HEADERS:
                     # Mask auth header for security
-                    masked_value = mask_sensitive_value(header_value, show_chars=20)
-                    logger.debug(f"[{self.server_prefix}]   {header_name}: {masked_value}")
-                else:
-                    logger.debug(f"[{self.server_prefix}]   {header_name}: {header_value}")
+                    header_value = mask_sensitive_value(header_value, show_chars=20)
+                lines.append(f"{prefix}   {header_name}: {header_value}")
             
-            logger.debug("=====================================================")
+            lines.append(_SEP)
+            logger.debug("%s", "\n".join(lines))
         
         return await call_next(context)
 
 
+class LevelGatedStructuredLoggingMiddleware(StructuredLoggingMiddleware):
+    """StructuredLoggingMiddleware that skips its work while its level is off.
+    
+    The base class serializes the payload for every message before the
+    logger decides whether to emit it. This checks the logger level on each
+    request instead, so the middleware can always be installed and follows
+    level changes made after the server was built.
+    """
+    
+    async def on_message(self, context: MiddlewareContext[Any], call_next: CallNext[Any, Any]) -> Any:
+        """Log the message when the logger's level allows it."""
+        if self.logger.isEnabledFor(self.log_level):
+            return await super().on_message(context, call_next)
+        
+        start_time = time.perf_counter()
+        try:
+            return await call_next(context)
+        except Exception as e:
+            # Errors are logged at ERROR, which may still be enabled
+            if self.logger.isEnabledFor(logging.ERROR):
+                self._log_message(self._create_error_message(context, start_time, e), logging.ERROR)
+            raise
+
+
 def get_default_logging_middleware(
     include_payloads: bool = True,
     include_payload_length: bool = True
 ) -> StructuredLoggingMiddleware:
-    """Get a configured StructuredLoggingMiddleware instance.
+    """Get a configured (level-gated) StructuredLoggingMiddleware instance.
     
     This is the recommended logging middleware for FastMCP servers,
     providing structured JSON logging for production environments.
@@ -81,7 +125,7 @@ def get_default_logging_middleware(
         >>> mcp = FastMCP("MyServer")
         >>> mcp.add_middleware(get_default_logging_middleware())
     """
-    return StructuredLoggingMiddleware(
+    return LevelGatedStructuredLoggingMiddleware(
         include_payloads=include_payloads,
         include_payload_length=include_payload_length
     )
@@ -106,6 +150,11 @@ def add_standard_middleware(
     3. Timing (if needed)
     4. Logging (last in, first out)
     
+    StructuredLoggingMiddleware is installed whenever
+    enable_structured_logging is True, whatever the current log level; it
+    checks its logger's level on each request, so logging configured after
+    the server is built still takes effect.
+    
     Args:
         mcp: FastMCP server instance
         server_prefix: Prefix for log messages
@@ -128,7 +177,7 @@ def add_standard_middleware(
     """
     # Add structured logging (recommended for production)
     if enable_structured_logging:
-        logger.info(f"[{server_prefix}] Adding StructuredLoggingMiddleware")
+        logger.info("[%s] Adding StructuredLoggingMiddleware", server_prefix)
         mcp.add_middleware(get_default_logging_middleware(
             include_payloads=include_payloads,
             include_payload_length=include_payload_length
@@ -136,5 +185,5 @@ def add_standard_middleware(
     
     # Add header logging for debugging (optional)
     if enable_header_logging:
-        logger.info(f"[{server_prefix}] Adding RequestHeaderLoggingMiddleware")
+        logger.info("[%s] Adding RequestHeaderLoggingMiddleware", server_prefix)
         mcp.add_middleware(RequestHeaderLoggingMiddleware(server_prefix=server_prefix))
@@ -0,0 +1,114 @@
+"""Security key header authentication middleware.
+
+Shared by the Security Keys HTTP and SSE servers. A request is accepted when
+either the X-GitHub-Token or the X-Brave-Key header carries a valid key.
+"""
+
+import logging
+from typing import Literal
+
+from fastmcp.server.dependencies import get_http_headers
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+from starlette.responses import Response
+
+from src.common.auth_providers import key_digest
+from src.common.logging import get_logger
+
+
+# Get module logger
+logger = get_logger(__name__)
+
+# Separator line around each request's header dump
+_SEP = "=" * 53
+
+# Security key header names; get_http_headers() returns a plain dict with
+# lowercased names, so these are looked up directly
+_GITHUB_HEADER = 'x-github-token'
+_BRAVE_HEADER = 'x-brave-key'
+
+# Header names whose values are masked in debug logs
+_SENSITIVE_HEADERS: frozenset[str] = frozenset({_GITHUB_HEADER, _BRAVE_HEADER})
+
+# Leading characters of a sensitive header value shown in debug logs
+_MASK_SHOW_CHARS = 20
+
+# Pre-serialized 401 bodies (same bytes JSONResponse would render)
+_INVALID_KEY_BODY = (
+    b'{"error":"invalid_token","error_description":'
+    b'"Either X-GitHub-Token or X-Brave-Key header required and must be valid"}'
+)
+_MISSING_HEADER_BODY = (
+    b'{"error":"invalid_token","error_description":'
+    b'"X-GitHub-Token and X-Brave-Key headers required"}'
+)
+
+
+def _log_headers(context: MiddlewareContext, headers: dict[str, str], github_valid: bool, brave_valid: bool) -> None:
+    """Dump request headers (security keys masked) and the key check outcome at DEBUG."""
+    logger.debug(_SEP)
+    logger.debug("Request: %s", context.method)
+    logger.debug("HTTP Headers:")
+
+    for header_name, header_value in headers.items():
+        if header_name in _SENSITIVE_HEADERS:
+            # Same output as mask_sensitive_value(), inlined; short values stay fully hidden
+            n = len(header_value)
+            if n > _MASK_SHOW_CHARS:
+                logger.debug("  %s: %s... (len=%d)", header_name, header_value[:_MASK_SHOW_CHARS], n)
+            else:
+                logger.debug("  %s: %s (len=%d)", header_name, '*' * n, n)
+        else:
+            logger.debug("  %s: %s", header_name, header_value)
+
+    logger.debug("GitHub token valid: %s", github_valid)
+    logger.debug("Brave key valid: %s", brave_valid)
+    logger.debug(_SEP)
+
+
+class SecurityKeysAuthMiddleware(Middleware):
+    """Middleware to validate custom security key headers.
+
+    Args:
+        github_pats: Accepted X-GitHub-Token values
+        brave_keys: Accepted X-Brave-Key values
+        reject_mode: "response" returns a 401 JSON response (HTTP transport);
+            "raise" raises ValueError to reject the connection (SSE transport)
+    """
+
+    def __init__(
+        self,
+        github_pats: frozenset[str],
+        brave_keys: frozenset[str],
+        reject_mode: Literal["response", "raise"] = "response",
+    ):
+        self._github_digests = frozenset(map(key_digest, github_pats))
+        self._brave_digests = frozenset(map(key_digest, brave_keys))
+        self.reject_mode = reject_mode
+
+    async def on_request(self, context: MiddlewareContext, call_next):
+        """Validate X-GitHub-Token and X-Brave-Key headers."""
+        headers = get_http_headers()
+        if not headers:
+            # No headers = no auth
+            if self.reject_mode == "raise":
+                raise ValueError("Unauthorized: X-GitHub-Token or X-Brave-Key header required")
+            return Response(content=_MISSING_HEADER_BODY, status_code=401, media_type="application/json")
+
+        # Decide first; the debug dump below never affects the outcome
+        github_token = headers.get(_GITHUB_HEADER)
+        brave_key = headers.get(_BRAVE_HEADER)
+
+        github_valid = key_digest(github_token) in self._github_digests if github_token else False
+        brave_valid = key_digest(brave_key) in self._brave_digests if brave_key else False
+
+        if logger.isEnabledFor(logging.DEBUG):
+            _log_headers(context, headers, github_valid, brave_valid)
+
+        # Accept if EITHER key is valid (simulates different MCP servers)
+        if not (github_valid or brave_valid):
+            if self.reject_mode == "raise":
+                # For SSE, raise an exception to reject the connection
+                raise ValueError("Unauthorized: Either X-GitHub-Token or X-Brave-Key header required and must be valid")
+            return Response(content=_INVALID_KEY_BODY, status_code=401, media_type="application/json")
+
+        return await call_next(context)
@@ -0,0 +1,45 @@
+"""UTC timestamp helpers shared by the demo servers."""
+
+from math import modf
+from time import gmtime
+from time import time as _time
+
+# Seconds per hour/day, for shifting epoch timestamps by whole hours/days
+SECONDS_PER_HOUR = 3_600
+SECONDS_PER_DAY = 86_400
+
+
+def utc_iso(ts: float | None = None) -> str:
+    """Format an epoch timestamp as a naive UTC ISO-8601 string.
+
+    Produces the same text as ``datetime.utcnow().isoformat(timespec="microseconds")``,
+    which always prints six fractional digits (plain ``isoformat()`` drops
+    them when the microsecond is 0), without allocating a datetime per call.
+
+    Args:
+        ts: Seconds since the epoch (defaults to now)
+
+    Returns:
+        Timestamp like ``"2024-01-31T12:00:00.123456"``
+
+    Example:
+        >>> utc_iso(0)
+        '1970-01-01T00:00:00.000000'
+    """
+    if ts is None:
+        ts = _time()
+    # Split and round like datetime.fromtimestamp: round-half-even on the
+    # fractional microseconds, carrying into the whole seconds
+    frac, whole = modf(ts)
+    us = round(frac * 1_000_000)
+    if us < 0:
+        whole -= 1
+        us += 1_000_000
+    if us >= 1_000_000:
+        whole += 1
+        us -= 1_000_000
+    g = gmtime(whole)
+    return (
+        f"{g.tm_year:04d}-{g.tm_mon:02d}-{g.tm_mday:02d}"
+        f"T{g.tm_hour:02d}:{g.tm_min:02d}:{g.tm_sec:02d}.{us:06d}"
+    )
@@ -0,0 +1,68 @@
+"""Shared FastMCP server construction for the demo servers.
+
+Each server module defines its domain tools at module scope and builds its
+FastMCP instance through make_server(), so the server/middleware/tool wiring
+lives in one place.
+"""
+
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from fastmcp import FastMCP
+from fastmcp.server.auth import AuthProvider
+from fastmcp.server.middleware import Middleware
+
+from src.common.middleware import add_standard_middleware
+
+
+def make_server(
+    name: str,
+    server_prefix: str,
+    tools: Iterable[Callable[..., Any]],
+    auth: AuthProvider | None = None,
+    header_logging: bool = False,
+    include_payloads: bool = False,
+    middleware: Iterable[Middleware] = (),
+    lifespan: Callable[[FastMCP], Any] | None = None,
+) -> FastMCP:
+    """Create a FastMCP server with the standard middleware and tools.
+
+    Args:
+        name: Server name advertised to clients
+        server_prefix: Prefix for middleware log messages
+        tools: Tool functions to register (tool name = function name)
+        auth: Optional auth provider/verifier
+        header_logging: Add request header logging middleware (debug)
+        include_payloads: Include request/response payloads in structured logs
+        middleware: Extra middleware added after the standard stack (e.g. auth)
+        lifespan: Optional server lifespan context manager factory
+
+    Returns:
+        Configured FastMCP server
+
+    Example:
+        >>> mcp = make_server(
+        ...     SERVER_NAME_BASIC_HTTP,
+        ...     "BASIC_AUTH_HTTP",
+        ...     (create_project, add_task),
+        ...     auth=verifier,
+        ... )
+    """
+    mcp = FastMCP(name=name, auth=auth, lifespan=lifespan)
+
+    add_standard_middleware(
+        mcp,
+        server_prefix=server_prefix,
+        enable_structured_logging=True,
+        enable_header_logging=header_logging,
+        include_payloads=include_payloads,
+    )
+
+    # Added after logging so rejected requests are still logged
+    for extra in middleware:
+        mcp.add_middleware(extra)
+
+    for tool in tools:
+        mcp.tool()(tool)
+
+    return mcp
@@ -6,18 +6,173 @@ Perfect for applications needing real-time weather data.
 """
 
 import os
+import random
+from time import gmtime, strftime, time
 
 from fastmcp import FastMCP
 
-from src.common.auth_providers import APIKeyVerifier
+from src.common.auth_providers import APIKeyVerifier, parse_api_keys
 from src.common.constants import DEFAULT_API_KEY, PORT_API_KEY_HTTP, SERVER_NAME_API_KEY_HTTP
 from src.common.logging import get_logger, log_startup
-from src.common.middleware import add_standard_middleware
+from src.common.timestamps import SECONDS_PER_DAY, SECONDS_PER_HOUR, utc_iso
+from src.servers._factory import make_server
 
 
 # Get module logger
 logger = get_logger(__name__)
 
+# Tool constants, built once at import instead of on every call
+# units -> (temperature low, temperature high, label)
+_UNITS = {"metric": (15, 30, "°C"), "imperial": (60, 85, "°F")}
+_CONDITIONS = ("Clear", "Cloudy", "Partly Cloudy", "Rainy", "Sunny")
+_FORECAST_CONDITIONS = ("Sunny", "Cloudy", "Rainy", "Partly Cloudy")
+_WIND_DIRS = ("N", "NE", "E", "SE", "S", "SW", "W", "NW")
+_ALERT_TYPES = ("Thunderstorm Warning", "Heat Advisory", "Wind Advisory", "Flood Watch")
+_SEVERITIES = ("Minor", "Moderate", "Severe")
+
+# get_weather_alerts response when nothing is active ("city" is added per call)
+_NO_ALERTS_TEMPLATE = {
+    "success": True,
+    "alerts_count": 0,
+    "status": "all_clear",
+    "message": "No active weather alerts for this location",
+}
+
+
+def get_current_weather(city: str, units: str = "metric") -> dict:
+    """Get current weather conditions for a specified city.
+
+    Args:
+        city: City name (e.g., "London", "New York", "Tokyo")
+        units: Temperature units - "metric" (Celsius) or "imperial" (Fahrenheit)
+
+    Returns:
+        Dictionary with current weather data including temperature, conditions, and wind
+    """
+    unit_spec = _UNITS.get(units)
+    if unit_spec is None:
+        return {"error": "Units must be 'metric' or 'imperial'", "success": False}
+
+    # Compute every value up front so the response is a single constant-key literal
+    temp_low, temp_high, unit_label = unit_spec
+    temp_base = random.randint(temp_low, temp_high)
+    timestamp = utc_iso()
+
+    return {
+        "success": True,
+        "city": city,
+        "timestamp": timestamp,
+        "temperature": temp_base,
+        "feels_like": temp_base + random.randint(-3, 3),
+        "units": unit_label,
+        "condition": random.choice(_CONDITIONS),
+        "humidity": random.randint(30, 90),
+        "wind_speed": round(random.uniform(0, 25), 1),
+        "wind_direction": random.choice(_WIND_DIRS),
+        "pressure": random.randint(980, 1030),
+        "visibility": round(random.uniform(5, 15), 1)
+    }
+
+
+def get_forecast(city: str, days: int = 5) -> dict:
+    """Get weather forecast for upcoming days.
+
+    Args:
+        city: City name for the forecast
+        days: Number of days to forecast (1-7)
+
+    Returns:
+        Dictionary with daily forecasts including high/low temps and conditions
+    """
+    if days < 1 or days > 7:
+        return {"error": "Days must be between 1 and 7", "success": False}
+
+    # One timestamp per call; every forecast date is derived from it
+    now_ts = time()
+
+    # Draw each per-day field for all days in one call
+    temp_highs = random.choices(range(20, 36), k=days)
+    temp_spreads = random.choices(range(5, 16), k=days)
+    conditions = random.choices(_FORECAST_CONDITIONS, k=days)
+    precipitation = random.choices(range(0, 101), k=days)
+    uv_indexes = random.choices(range(1, 12), k=days)
+
+    forecast = []
+    for i, temp_high, spread, condition, precip, uv_index in zip(
+        range(days), temp_highs, temp_spreads, conditions, precipitation, uv_indexes, strict=True
+    ):
+        date = gmtime(now_ts + i * SECONDS_PER_DAY)
+        forecast.append({
+            "date": strftime("%Y-%m-%d", date),
+            "day": strftime("%A", date),
+            "temp_high": temp_high,
+            "temp_low": temp_high - spread,
+            "condition": condition,
+            "precipitation_chance": precip,
+            "wind_speed": round(random.uniform(5, 20), 1),
+            "uv_index": uv_index
+        })
+
+    return {
+        "success": True,
+        "city": city,
+        "forecast_days": days,
+        "generated_at": utc_iso(now_ts),
+        "forecast": forecast
+    }
+
+
+def get_weather_alerts(city: str) -> dict:
+    """Check for active weather alerts and warnings.
+
+    Args:
+        city: City name to check for alerts
+
+    Returns:
+        Dictionary with active alerts, severity levels, and recommendations
+    """
+    # Simulate weather alerts (80% chance of no alerts)
+    has_alert = random.random() < 0.2
+
+    if not has_alert:
+        return {**_NO_ALERTS_TEMPLATE, "city": city}
+
+    now_ts = time()
+    num_alerts = random.randint(1, 2)
+
+    # Draw each per-alert field for all alerts in one call
+    alert_ids = random.choices(range(10000, 100000), k=num_alerts)
+    alert_types = random.choices(_ALERT_TYPES, k=num_alerts)
+    severities = random.choices(_SEVERITIES, k=num_alerts)
+    issued_hours = random.choices(range(1, 7), k=num_alerts)
+    expires_hours = random.choices(range(6, 25), k=num_alerts)
+
+    alerts = []
+    for alert_id, alert_type, severity, issued, expires in zip(
+        alert_ids, alert_types, severities, issued_hours, expires_hours, strict=True
+    ):
+        alerts.append({
+            "alert_id": f"alert_{alert_id}",
+            "type": alert_type,
+            "severity": severity,
+            "issued_at": utc_iso(now_ts - issued * SECONDS_PER_HOUR),
+            "expires_at": utc_iso(now_ts + expires * SECONDS_PER_HOUR),
+            "description": "Monitor weather conditions and take appropriate precautions"
+        })
+
+    return {
+        "success": True,
+        "city": city,
+        "alerts_count": len(alerts),
+        "status": "active_alerts",
+        "alerts": alerts,
+        "checked_at": utc_iso(now_ts)
+    }
+
+
+# Tools registered by create_server()
+TOOLS = (get_current_weather, get_forecast, get_weather_alerts)
+
 
 def create_server() -> FastMCP:
     """Create API Key HTTP server.
@@ -26,8 +181,7 @@ def create_server() -> FastMCP:
         Configured FastMCP server with API key auth
     """
     # Get valid API keys from environment or use default
-    api_keys_str = os.environ.get("API_KEYS", DEFAULT_API_KEY)
-    valid_api_keys = {key.strip() for key in api_keys_str.split(",") if key.strip()}
+    valid_api_keys = parse_api_keys(os.environ.get("API_KEYS", DEFAULT_API_KEY))
 
     # Create API key verifier
     auth = APIKeyVerifier(
@@ -36,155 +190,22 @@ def create_server() -> FastMCP:
         scopes=["read", "write"],
     )
 
-    # Create FastMCP server with authentication
-    mcp = FastMCP(name=SERVER_NAME_API_KEY_HTTP, auth=auth)
-    
-    # Add standard middleware stack
-    add_standard_middleware(
-        mcp,
-        server_prefix="API_KEY_HTTP",
-        enable_structured_logging=True,
-        enable_header_logging=False,  # Set to True for debugging
+    # Create FastMCP server with the standard middleware stack and domain tools
+    return make_server(
+        SERVER_NAME_API_KEY_HTTP,
+        "API_KEY_HTTP",
+        TOOLS,
+        auth=auth,
+        header_logging=False,  # Set to True for debugging
     )
 
-    # Domain: Weather Service
-    @mcp.tool()
-    def get_current_weather(city: str, units: str = "metric") -> dict:
-        """Get current weather conditions for a specified city.
-
-        Args:
-            city: City name (e.g., "London", "New York", "Tokyo")
-            units: Temperature units - "metric" (Celsius) or "imperial" (Fahrenheit)
-
-        Returns:
-            Dictionary with current weather data including temperature, conditions, and wind
-        """
-        import random
-        from datetime import datetime
-        
-        if units not in ["metric", "imperial"]:
-            return {"error": "Units must be 'metric' or 'imperial'", "success": False}
-        
-        temp_base = random.randint(15, 30) if units == "metric" else random.randint(60, 85)
-        conditions = ["Clear", "Cloudy", "Partly Cloudy", "Rainy", "Sunny"]
-        
-        return {
-            "success": True,
-            "city": city,
-            "timestamp": datetime.utcnow().isoformat(),
-            "temperature": temp_base,
-            "feels_like": temp_base + random.randint(-3, 3),
-            "units": "°C" if units == "metric" else "°F",
-            "condition": random.choice(conditions),
-            "humidity": random.randint(30, 90),
-            "wind_speed": round(random.uniform(0, 25), 1),
-            "wind_direction": random.choice(["N", "NE", "E", "SE", "S", "SW", "W", "NW"]),
-            "pressure": random.randint(980, 1030),
-            "visibility": round(random.uniform(5, 15), 1)
-        }
-
-    @mcp.tool()
-    def get_forecast(city: str, days: int = 5) -> dict:
-        """Get weather forecast for upcoming days.
-
-        Args:
-            city: City name for the forecast
-            days: Number of days to forecast (1-7)
-
-        Returns:
-            Dictionary with daily forecasts including high/low temps and conditions
-        """
-        import random
-        from datetime import datetime, timedelta
-        
-        if days < 1 or days > 7:
-            return {"error": "Days must be between 1 and 7", "success": False}
-        
-        forecast = []
-        for i in range(days):
-            date = datetime.utcnow() + timedelta(days=i)
-            temp_high = random.randint(20, 35)
-            temp_low = temp_high - random.randint(5, 15)
-            
-            forecast.append({
-                "date": date.strftime("%Y-%m-%d"),
-                "day": date.strftime("%A"),
-                "temp_high": temp_high,
-                "temp_low": temp_low,
-                "condition": random.choice(["Sunny", "Cloudy", "Rainy", "Partly Cloudy"]),
-                "precipitation_chance": random.randint(0, 100),
-                "wind_speed": round(random.uniform(5, 20), 1),
-                "uv_index": random.randint(1, 11)
-            })
-        
-        return {
-            "success": True,
-            "city": city,
-            "forecast_days": days,
-            "generated_at": datetime.utcnow().isoformat(),
-            "forecast": forecast
-        }
-
-    @mcp.tool()
-    def get_weather_alerts(city: str) -> dict:
-        """Check for active weather alerts and warnings.
-
-        Args:
-            city: City name to check for alerts
-
-        Returns:
-            Dictionary with active alerts, severity levels, and recommendations
-        """
-        import random
-        from datetime import datetime, timedelta
-        
-        # Simulate weather alerts (80% chance of no alerts)
-        has_alert = random.random() < 0.2
-        
-        if not has_alert:
-            return {
-                "success": True,
-                "city": city,
-                "alerts_count": 0,
-                "status": "all_clear",
-                "message": "No active weather alerts for this location"
-            }
-        
-        alert_types = ["Thunderstorm Warning", "Heat Advisory", "Wind Advisory", "Flood Watch"]
-        severity_levels = ["Minor", "Moderate", "Severe"]
-        
-        alerts = []
-        num_alerts = random.randint(1, 2)
-        
-        for i in range(num_alerts):
-            alerts.append({
-                "alert_id": f"alert_{random.randint(10000, 99999)}",
-                "type": random.choice(alert_types),
-                "severity": random.choice(severity_levels),
-                "issued_at": (datetime.utcnow() - timedelta(hours=random.randint(1, 6))).isoformat(),
-                "expires_at": (datetime.utcnow() + timedelta(hours=random.randint(6, 24))).isoformat(),
-                "description": "Monitor weather conditions and take appropriate precautions"
-            })
-        
-        return {
-            "success": True,
-            "city": city,
-            "alerts_count": len(alerts),
-            "status": "active_alerts",
-            "alerts": alerts,
-            "checked_at": datetime.utcnow().isoformat()
-        }
-
-    return mcp
-
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", PORT_API_KEY_HTTP))
     server = create_server()
     
-    # Get API keys count for logging
-    api_keys_str = os.environ.get("API_KEYS", DEFAULT_API_KEY)
-    api_keys_count = len([k for k in api_keys_str.split(",") if k.strip()])
+    # Get API keys count for logging (reuses the keys parsed by create_server)
+    api_keys_count = len(server.auth.valid_api_keys)
     
     # Use centralized logging for startup
     log_startup(
@@ -6,18 +6,208 @@ Perfect for staying updated with news from multiple sources.
 """
 
 import os
+import random
+import threading
+import time
+from datetime import datetime
+from operator import itemgetter
 
 from fastmcp import FastMCP
 
-from src.common.auth_providers import APIKeyVerifier
+from src.common.auth_providers import APIKeyVerifier, parse_api_keys
 from src.common.constants import DEFAULT_API_KEY, PORT_API_KEY_SSE, SERVER_NAME_API_KEY_SSE
 from src.common.logging import get_logger, log_startup
-from src.common.middleware import add_standard_middleware
+from src.common.timestamps import SECONDS_PER_DAY, SECONDS_PER_HOUR, utc_iso
+from src.servers._factory import make_server
 
 
 # Get module logger
 logger = get_logger(__name__)
 
+# Tool constants, built once at import instead of on every call
+_CATEGORIES = ("general", "business", "technology", "sports", "entertainment")
+_VALID_CATEGORIES = frozenset(_CATEGORIES)
+_CATEGORIES_MESSAGE = f"Category must be one of: {', '.join(_CATEGORIES)}"
+_SOURCES = ("Reuters", "BBC", "CNN", "TechCrunch", "The Verge", "ESPN")
+_AUTHORS = ("Smith", "Johnson", "Williams", "Brown")
+_SEARCH_SOURCES = ("Reuters", "AP News", "Bloomberg")
+_TOPICS = (
+    "Climate Summit", "Tech Innovation", "Space Exploration",
+    "Economic Update", "Sports Championship", "Entertainment Awards",
+    "Political Election", "Health Breakthrough", "Market Trends",
+)
+_TOPIC_CATEGORIES = ("politics", "technology", "sports", "business")
+
+# Trending topics are served from a cache for one refresh interval
+_TRENDING_REFRESH_MINUTES = 15
+_TRENDING_TTL = _TRENDING_REFRESH_MINUTES * 60
+_trending_cache: tuple[float, dict] | None = None
+_trending_lock = threading.Lock()
+
+
+def get_latest_news(category: str = "general", limit: int = 10) -> dict:
+    """Fetch latest news articles from multiple sources.
+
+    Args:
+        category: News category (general, business, technology, sports, entertainment)
+        limit: Maximum number of articles to return (1-50)
+
+    Returns:
+        Dictionary with list of news articles and metadata
+    """
+    if category not in _VALID_CATEGORIES:
+        return {"error": _CATEGORIES_MESSAGE, "success": False}
+
+    if limit < 1 or limit > 50:
+        return {"error": "Limit must be between 1 and 50", "success": False}
+
+    # One timestamp per call; publish times are offsets from it
+    now_ts = time.time()
+
+    # Draw each per-article field for all articles in one call
+    article_ids = random.choices(range(1000, 10000), k=limit)
+    sources = random.choices(_SOURCES, k=limit)
+    authors = random.choices(_AUTHORS, k=limit)
+    hours_ago = random.choices(range(1, 25), k=limit)
+
+    articles = []
+    for i, article_id, source, author, hours in zip(
+        range(limit), article_ids, sources, authors, hours_ago, strict=True
+    ):
+        articles.append({
+            "id": f"article_{i}_{article_id}",
+            "title": f"Breaking: Important {category} news story #{i+1}",
+            "source": source,
+            "author": f"Reporter {author}",
+            "published_at": utc_iso(now_ts - hours * SECONDS_PER_HOUR),
+            "url": f"https://news.example.com/article-{i}",
+            "category": category,
+            "summary": f"This is a summary of the {category} news article about recent developments..."
+        })
+
+    return {
+        "success": True,
+        "category": category,
+        "article_count": len(articles),
+        "fetched_at": utc_iso(now_ts),
+        "articles": articles
+    }
+
+
+def search_news(query: str, from_date: str = None) -> dict:
+    """Search news articles by keyword or phrase.
+
+    Args:
+        query: Search query string
+        from_date: Optional start date in YYYY-MM-DD format
+
+    Returns:
+        Dictionary with matching articles and search metadata
+    """
+    if from_date:
+        try:
+            datetime.strptime(from_date, "%Y-%m-%d")
+        except ValueError:
+            return {"error": "Invalid from_date format. Use YYYY-MM-DD", "success": False}
+
+    # Simulate search results
+    num_results = random.randint(5, 15)
+    now_ts = time.time()
+    result_ids = random.choices(range(1000, 10000), k=num_results)
+    sources = random.choices(_SEARCH_SOURCES, k=num_results)
+    days_ago = random.choices(range(0, 31), k=num_results)
+
+    articles = []
+    for i, result_id, source, days in zip(
+        range(num_results), result_ids, sources, days_ago, strict=True
+    ):
+        articles.append({
+            "id": f"search_{i}_{result_id}",
+            "title": f"Article about {query} - Story #{i+1}",
+            "source": source,
+            "published_at": utc_iso(now_ts - days * SECONDS_PER_DAY),
+            "relevance_score": round(random.uniform(0.6, 1.0), 2),
+            "snippet": f"...{query} has been a trending topic with significant developments...",
+            "url": f"https://news.example.com/search/{i}"
+        })
+
+    # Sort by relevance
+    articles.sort(key=itemgetter("relevance_score"), reverse=True)
+
+    return {
+        "success": True,
+        "query": query,
+        "from_date": from_date,
+        "results_count": len(articles),
+        "searched_at": utc_iso(now_ts),
+        "articles": articles
+    }
+
+
+def get_trending_topics() -> dict:
+    """Get currently trending news topics and hashtags.
+
+    Results are cached for refresh_interval_minutes, so repeated calls
+    within that window return copies of the same snapshot.
+
+    Returns:
+        Dictionary with trending topics, their popularity, and related articles
+    """
+    global _trending_cache
+    with _trending_lock:
+        checked = time.monotonic()
+        if _trending_cache is not None and checked - _trending_cache[0] < _TRENDING_TTL:
+            snapshot = _trending_cache[1]
+        else:
+            snapshot = _compute_trending_topics()
+            _trending_cache = (checked, snapshot)
+    # Each caller gets its own dicts, so mutating a result can't alter the cache
+    return {**snapshot, "trending_topics": [dict(topic) for topic in snapshot["trending_topics"]]}
+
+
+def _compute_trending_topics() -> dict:
+    """Build a fresh trending topics snapshot.
+
+    Returns:
+        Dictionary with trending topics, their popularity, and related articles
+    """
+    now_ts = time.time()
+
+    # Draw each per-topic field for all five topics in one call
+    topics = random.sample(_TOPICS, k=5)
+    mentions = random.choices(range(1000, 50001), k=5)
+    categories = random.choices(_TOPIC_CATEGORIES, k=5)
+    related = random.choices(range(10, 101), k=5)
+    hours_ago = random.choices(range(1, 13), k=5)
+
+    trending = []
+    for topic, mention_count, category, related_count, hours in zip(
+        topics, mentions, categories, related, hours_ago, strict=True
+    ):
+        trending.append({
+            "topic": topic,
+            "mentions": mention_count,
+            "trend_score": round(random.uniform(70, 100), 1),
+            "category": category,
+            "related_articles": related_count,
+            "trending_since": utc_iso(now_ts - hours * SECONDS_PER_HOUR)
+        })
+
+    # Sort by trend score
+    trending.sort(key=itemgetter("trend_score"), reverse=True)
+
+    return {
+        "success": True,
+        "trending_count": len(trending),
+        "updated_at": utc_iso(now_ts),
+        "trending_topics": trending,
+        "refresh_interval_minutes": _TRENDING_REFRESH_MINUTES
+    }
+
+
+# Tools registered by create_server()
+TOOLS = (get_latest_news, search_news, get_trending_topics)
+
 
 def create_server() -> FastMCP:
     """Create API Key SSE server.
@@ -26,8 +216,7 @@ def create_server() -> FastMCP:
         Configured FastMCP server with API key auth
     """
     # Get valid API keys from environment or use default
-    api_keys_str = os.environ.get("API_KEYS", DEFAULT_API_KEY)
-    valid_api_keys = {key.strip() for key in api_keys_str.split(",") if key.strip()}
+    valid_api_keys = parse_api_keys(os.environ.get("API_KEYS", DEFAULT_API_KEY))
 
     # Create API key verifier
     auth = APIKeyVerifier(
@@ -36,158 +225,23 @@ def create_server() -> FastMCP:
         scopes=["read", "write"],
     )
 
-    # Create FastMCP server with authentication
-    mcp = FastMCP(name=SERVER_NAME_API_KEY_SSE, auth=auth)
-    
-    # Add standard middleware stack (structured logging + optional header logging)
-    add_standard_middleware(
-        mcp,
-        server_prefix="API_KEY_SSE",
-        enable_structured_logging=True,
-        enable_header_logging=True,  # Enable for debugging auth issues
+    # Create FastMCP server with the standard middleware stack and domain tools
+    return make_server(
+        SERVER_NAME_API_KEY_SSE,
+        "API_KEY_SSE",
+        TOOLS,
+        auth=auth,
+        header_logging=True,  # Enable for debugging auth issues
         include_payloads=False,  # Set to True for detailed debugging
     )
 
-    # Domain: News Aggregator
-    @mcp.tool()
-    def get_latest_news(category: str = "general", limit: int = 10) -> dict:
-        """Fetch latest news articles from multiple sources.
-
-        Args:
-            category: News category (general, business, technology, sports, entertainment)
-            limit: Maximum number of articles to return (1-50)
-
-        Returns:
-            Dictionary with list of news articles and metadata
-        """
-        from datetime import datetime, timedelta
-        import random
-        
-        valid_categories = ["general", "business", "technology", "sports", "entertainment"]
-        if category not in valid_categories:
-            return {"error": f"Category must be one of: {', '.join(valid_categories)}", "success": False}
-        
-        if limit < 1 or limit > 50:
-            return {"error": "Limit must be between 1 and 50", "success": False}
-        
-        sources = ["Reuters", "BBC", "CNN", "TechCrunch", "The Verge", "ESPN"]
-        articles = []
-        
-        for i in range(limit):
-            articles.append({
-                "id": f"article_{i}_{random.randint(1000, 9999)}",
-                "title": f"Breaking: Important {category} news story #{i+1}",
-                "source": random.choice(sources),
-                "author": f"Reporter {random.choice(['Smith', 'Johnson', 'Williams', 'Brown'])}",
-                "published_at": (datetime.utcnow() - timedelta(hours=random.randint(1, 24))).isoformat(),
-                "url": f"https://news.example.com/article-{i}",
-                "category": category,
-                "summary": f"This is a summary of the {category} news article about recent developments..."
-            })
-        
-        return {
-            "success": True,
-            "category": category,
-            "article_count": len(articles),
-            "fetched_at": datetime.utcnow().isoformat(),
-            "articles": articles
-        }
-
-    @mcp.tool()
-    def search_news(query: str, from_date: str = None) -> dict:
-        """Search news articles by keyword or phrase.
-
-        Args:
-            query: Search query string
-            from_date: Optional start date in YYYY-MM-DD format
-
-        Returns:
-            Dictionary with matching articles and search metadata
-        """
-        from datetime import datetime, timedelta
-        import random
-        
-        if from_date:
-            try:
-                datetime.strptime(from_date, "%Y-%m-%d")
-            except ValueError:
-                return {"error": "Invalid from_date format. Use YYYY-MM-DD", "success": False}
-        
-        # Simulate search results
-        num_results = random.randint(5, 15)
-        articles = []
-        
-        for i in range(num_results):
-            articles.append({
-                "id": f"search_{i}_{random.randint(1000, 9999)}",
-                "title": f"Article about {query} - Story #{i+1}",
-                "source": random.choice(["Reuters", "AP News", "Bloomberg"]),
-                "published_at": (datetime.utcnow() - timedelta(days=random.randint(0, 30))).isoformat(),
-                "relevance_score": round(random.uniform(0.6, 1.0), 2),
-                "snippet": f"...{query} has been a trending topic with significant developments...",
-                "url": f"https://news.example.com/search/{i}"
-            })
-        
-        # Sort by relevance
-        articles.sort(key=lambda x: x["relevance_score"], reverse=True)
-        
-        return {
-            "success": True,
-            "query": query,
-            "from_date": from_date,
-            "results_count": len(articles),
-            "searched_at": datetime.utcnow().isoformat(),
-            "articles": articles
-        }
-
-    @mcp.tool()
-    def get_trending_topics() -> dict:
-        """Get currently trending news topics and hashtags.
-
-        Returns:
-            Dictionary with trending topics, their popularity, and related articles
-        """
-        from datetime import datetime, timedelta
-        import random
-        
-        topics = [
-            "Climate Summit", "Tech Innovation", "Space Exploration", 
-            "Economic Update", "Sports Championship", "Entertainment Awards",
-            "Political Election", "Health Breakthrough", "Market Trends"
-        ]
-        
-        trending = []
-        for topic in random.sample(topics, k=5):
-            trending.append({
-                "topic": topic,
-                "mentions": random.randint(1000, 50000),
-                "trend_score": round(random.uniform(70, 100), 1),
-                "category": random.choice(["politics", "technology", "sports", "business"]),
-                "related_articles": random.randint(10, 100),
-                "trending_since": (datetime.utcnow() - timedelta(hours=random.randint(1, 12))).isoformat()
-            })
-        
-        # Sort by trend score
-        trending.sort(key=lambda x: x["trend_score"], reverse=True)
-        
-        return {
-            "success": True,
-            "trending_count": len(trending),
-            "updated_at": datetime.utcnow().isoformat(),
-            "trending_topics": trending,
-            "refresh_interval_minutes": 15
-        }
-
-    return mcp
-
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", PORT_API_KEY_SSE))
     server = create_server()
     
-    # Get API keys count for logging
-    api_keys_str = os.environ.get("API_KEYS", DEFAULT_API_KEY)
-    api_keys_count = len([k for k in api_keys_str.split(",") if k.strip()])
+    # Get API keys count for logging (reuses the keys parsed by create_server)
+    api_keys_count = len(server.auth.valid_api_keys)
     
     # Use centralized logging for startup
     log_startup(
@@ -5,7 +5,12 @@ Domain: Project Management - Create tasks, manage projects, track deadlines.
 Perfect for team collaboration and project tracking workflows.
 """
 
+import calendar
+import functools
 import os
+import random
+import re
+from datetime import datetime, timedelta
 
 from fastmcp import FastMCP
 
@@ -16,18 +21,149 @@ from src.common.constants import (
     DEFAULT_USERNAME,
     SERVER_NAME_BASIC_HTTP,
 )
+from src.common.ids import new_uuid4_str
 from src.common.logging import get_logger, log_startup
-from src.common.middleware import add_standard_middleware
+from src.common.timestamps import utc_iso
+from src.servers._factory import make_server
 
 
 # Get module logger
 logger = get_logger(__name__)
 logger.info("Module loaded! Starting server setup...")
 
+# Deadlines and due dates must be YYYY-MM-DD
+_DATE_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
 
+
+def _is_valid_date(value: str) -> bool:
+    """Check that value is a real calendar date in YYYY-MM-DD format.
+
+    Args:
+        value: Date string to check
+
+    Returns:
+        True if the format matches and the day exists in that month
+    """
+    m = _DATE_RE.fullmatch(value)
+    if not m:
+        return False
+    year, month, day = int(m[1]), int(m[2]), int(m[3])
+    return year >= 1 and 1 <= month <= 12 and 1 <= day <= calendar.monthrange(year, month)[1]
+
+
+# Domain: Project Management
+async def create_project(name: str, description: str, deadline: str, priority: str = "medium") -> dict:
+    """Create a new project with tasks and milestones.
+
+    Args:
+        name: Project name
+        description: Detailed project description
+        deadline: Deadline in YYYY-MM-DD format
+        priority: Priority level (low, medium, high, critical)
+
+    Returns:
+        Dictionary with created project details and ID
+    """
+    valid_priorities = ["low", "medium", "high", "critical"]
+    if priority not in valid_priorities:
+        return {"error": f"Priority must be one of: {', '.join(valid_priorities)}", "success": False}
+    
+    if not _is_valid_date(deadline):
+        return {"error": "Invalid deadline format. Use YYYY-MM-DD", "success": False}
+    
+    project_id = new_uuid4_str()
+    return {
+        "success": True,
+        "project_id": project_id,
+        "name": name,
+        "description": description,
+        "deadline": deadline,
+        "priority": priority,
+        "status": "active",
+        "created_at": utc_iso(),
+        "team_members": [],
+        "completion_percentage": 0,
+        "estimated_hours": 0
+    }
+
+
+async def add_task(project_id: str, title: str, assignee: str, due_date: str) -> dict:
+    """Add a new task to an existing project.
+
+    Args:
+        project_id: ID of the project to add task to
+        title: Task title/description
+        assignee: Person assigned to the task
+        due_date: Task due date in YYYY-MM-DD format
+
+    Returns:
+        Dictionary with task details and status
+    """
+    if not _is_valid_date(due_date):
+        return {"error": "Invalid due_date format. Use YYYY-MM-DD", "success": False}
+    
+    task_id = new_uuid4_str()
+    return {
+        "success": True,
+        "task_id": task_id,
+        "project_id": project_id,
+        "title": title,
+        "assignee": assignee,
+        "due_date": due_date,
+        "status": "todo",
+        "created_at": utc_iso(),
+        "priority": "medium",
+        "estimated_hours": 0,
+        "comments": []
+    }
+
+
+async def get_project_status(project_id: str) -> dict:
+    """Get comprehensive status report for a project including tasks and progress.
+
+    Args:
+        project_id: ID of the project to check
+
+    Returns:
+        Dictionary with project status, tasks, and completion metrics
+    """
+    # Simulate project status
+    randint = random.randint
+    total_tasks = randint(5, 20)
+    completed = randint(0, total_tasks)
+    in_progress = randint(0, total_tasks - completed)
+    todo = total_tasks - completed - in_progress
+    today = datetime.utcnow().date()
+    
+    return {
+        "project_id": project_id,
+        "name": f"Project {project_id[:8]}",
+        "status": "active",
+        "deadline": (today + timedelta(days=randint(7, 90))).isoformat(),
+        "completion_percentage": round((completed / total_tasks) * 100, 1) if total_tasks > 0 else 0,
+        "tasks": {
+            "total": total_tasks,
+            "completed": completed,
+            "in_progress": in_progress,
+            "todo": todo
+        },
+        "team_members": randint(2, 10),
+        "recent_activity": "Task 'Implement login' completed 2 hours ago",
+        "next_milestone": (today + timedelta(days=randint(1, 30))).isoformat()
+    }
+
+
+# Tools registered by create_server()
+TOOLS = (create_project, add_task, get_project_status)
+
+
+@functools.lru_cache(maxsize=1)
 def create_server() -> FastMCP:
     """Create Basic Auth HTTP server.
 
+    The server is built once per process. Call create_server.cache_clear()
+    after changing AUTH_* environment variables to rebuild it.
+
     Returns:
         Configured FastMCP server with basic auth
     """
@@ -48,132 +184,14 @@ def create_server() -> FastMCP:
         additional_credentials=additional_creds,
     )
 
-    # Create FastMCP server with authentication
-    mcp = FastMCP(name=SERVER_NAME_BASIC_HTTP, auth=auth)
-    
-    # Add standard middleware stack
-    add_standard_middleware(
-        mcp,
-        server_prefix="BASIC_AUTH_HTTP",
-        enable_structured_logging=True,
-        enable_header_logging=False,  # Set to True for debugging
+    # Create FastMCP server with the standard middleware stack and domain tools
+    return make_server(
+        SERVER_NAME_BASIC_HTTP,
+        "BASIC_AUTH_HTTP",
+        TOOLS,
+        auth=auth,
     )
 
-    # Domain: Project Management
-    @mcp.tool()
-    def create_project(name: str, description: str, deadline: str, priority: str = "medium") -> dict:
-        """Create a new project with tasks and milestones.
-
-        Args:
-            name: Project name
-            description: Detailed project description
-            deadline: Deadline in YYYY-MM-DD format
-            priority: Priority level (low, medium, high, critical)
-
-        Returns:
-            Dictionary with created project details and ID
-        """
-        import uuid
-        from datetime import datetime
-        
-        valid_priorities = ["low", "medium", "high", "critical"]
-        if priority not in valid_priorities:
-            return {"error": f"Priority must be one of: {', '.join(valid_priorities)}", "success": False}
-        
-        try:
-            datetime.strptime(deadline, "%Y-%m-%d")
-        except ValueError:
-            return {"error": "Invalid deadline format. Use YYYY-MM-DD", "success": False}
-        
-        project_id = str(uuid.uuid4())
-        return {
-            "success": True,
-            "project_id": project_id,
-            "name": name,
-            "description": description,
-            "deadline": deadline,
-            "priority": priority,
-            "status": "active",
-            "created_at": datetime.utcnow().isoformat(),
-            "team_members": [],
-            "completion_percentage": 0,
-            "estimated_hours": 0
-        }
-
-    @mcp.tool()
-    def add_task(project_id: str, title: str, assignee: str, due_date: str) -> dict:
-        """Add a new task to an existing project.
-
-        Args:
-            project_id: ID of the project to add task to
-            title: Task title/description
-            assignee: Person assigned to the task
-            due_date: Task due date in YYYY-MM-DD format
-
-        Returns:
-            Dictionary with task details and status
-        """
-        import uuid
-        from datetime import datetime
-        
-        try:
-            datetime.strptime(due_date, "%Y-%m-%d")
-        except ValueError:
-            return {"error": "Invalid due_date format. Use YYYY-MM-DD", "success": False}
-        
-        task_id = str(uuid.uuid4())
-        return {
-            "success": True,
-            "task_id": task_id,
-            "project_id": project_id,
-            "title": title,
-            "assignee": assignee,
-            "due_date": due_date,
-            "status": "todo",
-            "created_at": datetime.utcnow().isoformat(),
-            "priority": "medium",
-            "estimated_hours": 0,
-            "comments": []
-        }
-
-    @mcp.tool()
-    def get_project_status(project_id: str) -> dict:
-        """Get comprehensive status report for a project including tasks and progress.
-
-        Args:
-            project_id: ID of the project to check
-
-        Returns:
-            Dictionary with project status, tasks, and completion metrics
-        """
-        from datetime import datetime, timedelta
-        import random
-        
-        # Simulate project status
-        total_tasks = random.randint(5, 20)
-        completed = random.randint(0, total_tasks)
-        in_progress = random.randint(0, total_tasks - completed)
-        todo = total_tasks - completed - in_progress
-        
-        return {
-            "project_id": project_id,
-            "name": f"Project {project_id[:8]}",
-            "status": "active",
-            "deadline": (datetime.utcnow() + timedelta(days=random.randint(7, 90))).strftime("%Y-%m-%d"),
-            "completion_percentage": round((completed / total_tasks) * 100, 1) if total_tasks > 0 else 0,
-            "tasks": {
-                "total": total_tasks,
-                "completed": completed,
-                "in_progress": in_progress,
-                "todo": todo
-            },
-            "team_members": random.randint(2, 10),
-            "recent_activity": "Task 'Implement login' completed 2 hours ago",
-            "next_milestone": (datetime.utcnow() + timedelta(days=random.randint(1, 30))).strftime("%Y-%m-%d")
-        }
-
-    return mcp
-
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", DEFAULT_HTTP_PORT))
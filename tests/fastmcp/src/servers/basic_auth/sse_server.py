@@ -5,7 +5,11 @@ Domain: File Storage - Upload, download, organize, and manage files.
 Perfect for file management and cloud storage workflows.
 """
 
+import functools
 import os
+import random
+import secrets
+from time import time
 
 from fastmcp import FastMCP
 
@@ -16,17 +20,128 @@ from src.common.constants import (
     DEFAULT_USERNAME,
     SERVER_NAME_BASIC_SSE,
 )
+from src.common.ids import new_uuid4_str
 from src.common.logging import get_logger, log_startup
-from src.common.middleware import add_standard_middleware
+from src.common.timestamps import SECONDS_PER_DAY, utc_iso
+from src.servers._factory import make_server
 
 
 # Get module logger
 logger = get_logger(__name__)
 
+# Name stems and extensions for simulated list_files entries
+_NAMES = ("Report", "Image", "Video", "Data")
+_EXTS = ("pdf", "png", "mp4", "csv")
 
+
+# Domain: File Storage
+async def upload_file(filename: str, size_mb: float, folder: str = "/") -> dict:
+    """Upload a file to cloud storage with metadata.
+
+    Args:
+        filename: Name of the file to upload
+        size_mb: File size in megabytes
+        folder: Destination folder path (default: root "/")
+
+    Returns:
+        Dictionary with upload status, file ID, and storage details
+    """
+    if size_mb <= 0 or size_mb > 5000:  # Max 5GB
+        return {"error": "File size must be between 0 and 5000 MB", "success": False}
+    
+    file_id = new_uuid4_str()
+    _, dot, extension = filename.rpartition(".")
+    return {
+        "success": True,
+        "file_id": file_id,
+        "filename": filename,
+        "size_mb": size_mb,
+        "folder": folder,
+        "uploaded_at": utc_iso(),
+        "storage_location": f"s3://my-bucket{folder}{filename}",
+        "url": f"https://storage.example.com{folder}{filename}",
+        "checksum": f"md5:{secrets.token_hex(16)}",
+        "mime_type": extension if dot else "application/octet-stream"
+    }
+
+
+async def list_files(folder: str = "/", sort_by: str = "name") -> dict:
+    """List all files in a specific folder with sorting options.
+
+    Args:
+        folder: Folder path to list files from (default: root "/")
+        sort_by: Sort criterion (name, size, date) 
+
+    Returns:
+        Dictionary with list of files and folder metadata
+    """
+    valid_sort = ["name", "size", "date"]
+    if sort_by not in valid_sort:
+        return {"error": f"sort_by must be one of: {', '.join(valid_sort)}", "success": False}
+    
+    # Simulate file list
+    num_files = random.randint(3, 10)
+    randint = random.randint
+    uniform = random.uniform
+    names = random.choices(_NAMES, k=num_files)
+    exts = random.choices(_EXTS, k=num_files)
+    
+    now_ts = time()
+    sizes_mb = [round(uniform(0.1, 500), 2) for _ in range(num_files)]
+    files = [
+        {
+            "file_id": f"file_{i}_{randint(1000, 9999)}",
+            "filename": f"{name}_{i}.{ext}",
+            "size_mb": size_mb,
+            "uploaded_at": utc_iso(now_ts - randint(1, 90) * SECONDS_PER_DAY),
+            "folder": folder
+        }
+        for i, (name, ext, size_mb) in enumerate(zip(names, exts, sizes_mb, strict=True))
+    ]
+    total_size_mb = sum(sizes_mb)
+    
+    return {
+        "success": True,
+        "folder": folder,
+        "file_count": num_files,
+        "total_size_mb": round(total_size_mb, 2),
+        "sort_by": sort_by,
+        "files": files
+    }
+
+
+async def delete_file(file_id: str, permanent: bool = False) -> dict:
+    """Delete or move a file to trash.
+
+    Args:
+        file_id: Unique identifier of the file to delete
+        permanent: If True, permanently delete; if False, move to trash
+
+    Returns:
+        Dictionary with deletion status and details
+    """
+    return {
+        "success": True,
+        "file_id": file_id,
+        "deleted_at": utc_iso(),
+        "deletion_type": "permanent" if permanent else "trash",
+        "recoverable": not permanent,
+        "recovery_window_days": 0 if permanent else 30,
+        "message": f"File {'permanently deleted' if permanent else 'moved to trash'}"
+    }
+
+
+# Tools registered by create_server()
+TOOLS = (upload_file, list_files, delete_file)
+
+
+@functools.lru_cache(maxsize=1)
 def create_server() -> FastMCP:
     """Create Basic Auth SSE server.
 
+    The server is built once per process. Call create_server.cache_clear()
+    after changing AUTH_* environment variables to rebuild it.
+
     Returns:
         Configured FastMCP server with basic auth
     """
@@ -47,116 +162,14 @@ def create_server() -> FastMCP:
         additional_credentials=additional_creds,
     )
 
-    # Create FastMCP server with authentication
-    mcp = FastMCP(name=SERVER_NAME_BASIC_SSE, auth=auth)
-    
-    # Add standard middleware stack
-    add_standard_middleware(
-        mcp,
-        server_prefix="BASIC_AUTH_SSE",
-        enable_structured_logging=True,
-        enable_header_logging=False,  # Set to True for debugging
+    # Create FastMCP server with the standard middleware stack and domain tools
+    return make_server(
+        SERVER_NAME_BASIC_SSE,
+        "BASIC_AUTH_SSE",
+        TOOLS,
+        auth=auth,
     )
 
-    # Domain: File Storage
-    @mcp.tool()
-    def upload_file(filename: str, size_mb: float, folder: str = "/") -> dict:
-        """Upload a file to cloud storage with metadata.
-
-        Args:
-            filename: Name of the file to upload
-            size_mb: File size in megabytes
-            folder: Destination folder path (default: root "/")
-
-        Returns:
-            Dictionary with upload status, file ID, and storage details
-        """
-        import uuid
-        from datetime import datetime
-        
-        if size_mb <= 0 or size_mb > 5000:  # Max 5GB
-            return {"error": "File size must be between 0 and 5000 MB", "success": False}
-        
-        file_id = str(uuid.uuid4())
-        return {
-            "success": True,
-            "file_id": file_id,
-            "filename": filename,
-            "size_mb": size_mb,
-            "folder": folder,
-            "uploaded_at": datetime.utcnow().isoformat(),
-            "storage_location": f"s3://my-bucket{folder}{filename}",
-            "url": f"https://storage.example.com{folder}{filename}",
-            "checksum": f"md5:{uuid.uuid4().hex[:32]}",
-            "mime_type": filename.split(".")[-1] if "." in filename else "application/octet-stream"
-        }
-
-    @mcp.tool()
-    def list_files(folder: str = "/", sort_by: str = "name") -> dict:
-        """List all files in a specific folder with sorting options.
-
-        Args:
-            folder: Folder path to list files from (default: root "/")
-            sort_by: Sort criterion (name, size, date) 
-
-        Returns:
-            Dictionary with list of files and folder metadata
-        """
-        from datetime import datetime, timedelta
-        import random
-        
-        valid_sort = ["name", "size", "date"]
-        if sort_by not in valid_sort:
-            return {"error": f"sort_by must be one of: {', '.join(valid_sort)}", "success": False}
-        
-        # Simulate file list
-        file_types = ["document.pdf", "image.png", "video.mp4", "data.csv", "report.docx"]
-        num_files = random.randint(3, 10)
-        
-        files = []
-        for i in range(num_files):
-            files.append({
-                "file_id": f"file_{i}_{random.randint(1000, 9999)}",
-                "filename": f"{random.choice(['Report', 'Image', 'Video', 'Data'])}_{i}.{random.choice(['pdf', 'png', 'mp4', 'csv'])}",
-                "size_mb": round(random.uniform(0.1, 500), 2),
-                "uploaded_at": (datetime.utcnow() - timedelta(days=random.randint(1, 90))).isoformat(),
-                "folder": folder
-            })
-        
-        return {
-            "success": True,
-            "folder": folder,
-            "file_count": len(files),
-            "total_size_mb": round(sum(f["size_mb"] for f in files), 2),
-            "sort_by": sort_by,
-            "files": files
-        }
-
-    @mcp.tool()
-    def delete_file(file_id: str, permanent: bool = False) -> dict:
-        """Delete or move a file to trash.
-
-        Args:
-            file_id: Unique identifier of the file to delete
-            permanent: If True, permanently delete; if False, move to trash
-
-        Returns:
-            Dictionary with deletion status and details
-        """
-        from datetime import datetime
-        
-        return {
-            "success": True,
-            "file_id": file_id,
-            "deleted_at": datetime.utcnow().isoformat(),
-            "deletion_type": "permanent" if permanent else "trash",
-            "recoverable": not permanent,
-            "recovery_window_days": 0 if permanent else 30,
-            "message": f"File {'permanently deleted' if permanent else 'moved to trash'}"
-        }
-
-    return mcp
-
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", DEFAULT_SSE_PORT))
@@ -174,4 +187,4 @@ if __name__ == "__main__":
         auth_type="Basic Auth"
     )
     
-    server.run(transport="sse", port=port, log_level="debug")
+    server.run(transport="sse", port=port, log_level=os.environ.get("LOG_LEVEL", "warning"))
@@ -1,190 +1,250 @@
 """Calculator & Utilities v1.0 - No Authentication HTTP Server.
 
-This server has NO authentication requirements and logs all incoming HTTP headers.
+This server has NO authentication requirements and logs all incoming HTTP headers
+when DEBUG_HEADERS=1.
 Domain: Calculator & Utilities - Perform calculations, unit conversions, and random generation.
 Useful for testing and utility operations.
 """
 
+import ast
+import functools
 import json
+import math
+import operator
 import os
+import random
+import re
+import string
 from typing import Any
 
 from fastmcp import FastMCP
 
 from src.common.constants import SERVER_NAME_NO_AUTH_HTTP, PORT_NO_AUTH_HTTP
+from src.common.ids import new_uuid4_str
 from src.common.logging import get_logger, log_startup
-from src.common.middleware import add_standard_middleware
+from src.servers._factory import make_server
 
 
 # Get module logger
 logger = get_logger(__name__)
 logger.info("Module loaded! Starting server setup...")
 
+# Security: Only allow safe math operations in calculate()
+_ALLOWED_NAMES = {k: v for k, v in math.__dict__.items() if not k.startswith("__")}
+_ALLOWED_NAMES.update({"abs": abs, "round": round})
 
-def create_server() -> FastMCP:
-    """Create No-Auth HTTP server with header logging.
+# Any character outside this set is rejected before evaluation
+_EXPR_SANITIZER = re.compile(r'[^0-9+\-*/().\s,a-z_]', re.IGNORECASE)
 
-    Returns:
-        Configured FastMCP server without authentication
+# convert_units() factors to each category's base unit (meters, kilograms)
+_LENGTH = {"m": 1.0, "km": 1000.0, "mi": 1609.34, "ft": 0.3048, "in": 0.0254}
+_WEIGHT = {"kg": 1.0, "g": 0.001, "lb": 0.453592, "oz": 0.0283495}
+_TEMP = frozenset({"c", "f", "k"})
+_UNIT_CAT = (
+    dict.fromkeys(_LENGTH, "length")
+    | dict.fromkeys(_WEIGHT, "weight")
+    | dict.fromkeys(_TEMP, "temperature")
+)
+_FACTORS = {"length": _LENGTH, "weight": _WEIGHT}
+
+# Temperature has offsets, so each (from, to) pair gets its own formula
+_TEMP_CONV = {
+    ("c", "c"): lambda v: v,
+    ("c", "f"): lambda v: (v * 9/5) + 32,
+    ("c", "k"): lambda v: v + 273.15,
+    ("f", "c"): lambda v: (v - 32) * 5/9,
+    ("f", "f"): lambda v: v,
+    ("f", "k"): lambda v: (v - 32) * 5/9 + 273.15,
+    ("k", "c"): lambda v: v - 273.15,
+    ("k", "f"): lambda v: ((v - 273.15) * 9/5) + 32,
+    ("k", "k"): lambda v: v,
+}
+
+# Alphabet and length for generate_random(type="password")
+_PWD_CHARS = string.ascii_letters + string.digits + "!@#$%^&*"
+_PWD_LENGTH = 16
+
+# Operators calculate() may evaluate; any other AST node is rejected
+_SAFE_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_expr(expression: str) -> ast.expr:
+    """Parse an expression once; repeated calculations reuse the tree."""
+    return ast.parse(expression, mode="eval").body
+
+
+def _eval_node(node: ast.expr) -> Any:
+    """Evaluate a whitelisted expression tree.
+
+    Only numeric constants, arithmetic operators, and names/calls from
+    _ALLOWED_NAMES are supported.
+
+    Raises:
+        ValueError: If the tree contains anything outside the whitelist
     """
-    # Create FastMCP server WITHOUT authentication
-    mcp = FastMCP(name="No Auth HTTP Server")
-    
-    # Add standard middleware stack with header logging
-    add_standard_middleware(
-        mcp,
-        server_prefix="NO_AUTH_HTTP",
-        enable_structured_logging=True,
-        enable_header_logging=True,  # Enable for debugging
-    )
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _SAFE_OPS:
+        return _SAFE_OPS[type(node.op)](_eval_node(node.left), _eval_node(node.right))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _SAFE_OPS:
+        return _SAFE_OPS[type(node.op)](_eval_node(node.operand))
+    if isinstance(node, ast.Name):
+        if node.id not in _ALLOWED_NAMES:
+            raise ValueError(f"name '{node.id}' is not defined")
+        return _ALLOWED_NAMES[node.id]
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+        func = _eval_node(node.func)
+        if not callable(func):
+            raise ValueError(f"'{node.func.id}' is not callable")
+        return func(*(_eval_node(arg) for arg in node.args))
+    raise ValueError(f"Unsupported expression element: {type(node).__name__}")
 
-    # Domain: Calculator & Utilities
-    @mcp.tool()
-    def calculate(expression: str) -> dict:
-        """Evaluate a mathematical expression safely.
 
-        Args:
-            expression: Mathematical expression (e.g., "2 + 2", "sqrt(16)", "sin(pi/2)")
+# Domain: Calculator & Utilities
+async def calculate(expression: str) -> dict:
+    """Evaluate a mathematical expression safely.
 
-        Returns:
-            Dictionary with calculation result and details
-        """
-        import math
-        import re
-        
-        try:
-            # Security: Only allow safe math operations
-            allowed_names = {
-                k: v for k, v in math.__dict__.items() if not k.startswith("__")
-            }
-            allowed_names.update({"abs": abs, "round": round})
-            
-            # Remove any potentially dangerous characters
-            if re.search(r'[^0-9+\-*/().\s,a-z_]', expression, re.IGNORECASE):
-                return {
-                    "error": "Expression contains invalid characters",
-                    "success": False
-                }
-            
-            # Evaluate the expression
-            result = eval(expression, {"__builtins__": {}}, allowed_names)
-            
-            return {
-                "success": True,
-                "expression": expression,
-                "result": result,
-                "result_type": type(result).__name__,
-                "formatted": f"{result:,.6f}" if isinstance(result, float) else str(result)
-            }
-        except Exception as e:
+    Args:
+        expression: Mathematical expression (e.g., "2 + 2", "sqrt(16)", "sin(pi/2)")
+
+    Returns:
+        Dictionary with calculation result and details
+    """
+    try:
+        # Remove any potentially dangerous characters
+        if _EXPR_SANITIZER.search(expression):
             return {
-                "error": str(e),
-                "expression": expression,
+                "error": "Expression contains invalid characters",
                 "success": False
             }
-
-    @mcp.tool()
-    def convert_units(value: float, from_unit: str, to_unit: str) -> dict:
-        """Convert between different units of measurement.
-
-        Args:
-            value: Numeric value to convert
-            from_unit: Source unit (m, km, mi, kg, lb, c, f, etc.)
-            to_unit: Target unit
-
-        Returns:
-            Dictionary with converted value and conversion details
-        """
-        # Define conversion factors (all to base unit)
-        conversions = {
-            # Length (meters)
-            "m": 1.0, "km": 1000.0, "mi": 1609.34, "ft": 0.3048, "in": 0.0254,
-            # Weight (kilograms)
-            "kg": 1.0, "g": 0.001, "lb": 0.453592, "oz": 0.0283495,
-            # Temperature (special handling)
-            "c": None, "f": None, "k": None,
-        }
         
-        from_unit = from_unit.lower()
-        to_unit = to_unit.lower()
-        
-        # Temperature conversions (special case)
-        if from_unit in ["c", "f", "k"] or to_unit in ["c", "f", "k"]:
-            # Convert to Celsius first
-            if from_unit == "f":
-                celsius = (value - 32) * 5/9
-            elif from_unit == "k":
-                celsius = value - 273.15
-            else:
-                celsius = value
-            
-            # Convert from Celsius to target
-            if to_unit == "f":
-                result = (celsius * 9/5) + 32
-            elif to_unit == "k":
-                result = celsius + 273.15
-            else:
-                result = celsius
-        else:
-            # Check if units are valid and in same category
-            if from_unit not in conversions or to_unit not in conversions:
-                return {"error": f"Unknown unit: {from_unit} or {to_unit}", "success": False}
-            
-            # Convert: value → base unit → target unit
-            base_value = value * conversions[from_unit]
-            result = base_value / conversions[to_unit]
+        # Evaluate the expression against the operator/name whitelist
+        result = _eval_node(_parse_expr(expression))
         
         return {
             "success": True,
-            "original_value": value,
-            "original_unit": from_unit,
-            "converted_value": round(result, 6),
-            "converted_unit": to_unit,
-            "formatted": f"{value} {from_unit} = {round(result, 4)} {to_unit}"
+            "expression": expression,
+            "result": result,
+            "result_type": type(result).__name__,
+            "formatted": f"{result:,.6f}" if isinstance(result, float) else str(result)
         }
-
-    @mcp.tool()
-    def generate_random(type: str = "number", count: int = 1, min: int = 0, max: int = 100) -> dict:
-        """Generate random data (numbers, UUIDs, passwords).
-
-        Args:
-            type: Type of random data (number, uuid, password, hex)
-            count: Number of items to generate (1-100)
-            min: Minimum value for numbers (default: 0)
-            max: Maximum value for numbers (default: 100)
-
-        Returns:
-            Dictionary with generated random data
-        """
-        import random
-        import uuid
-        import string
-        
-        if count < 1 or count > 100:
-            return {"error": "Count must be between 1 and 100", "success": False}
-        
-        results = []
-        
-        if type == "number":
-            results = [random.randint(min, max) for _ in range(count)]
-        elif type == "uuid":
-            results = [str(uuid.uuid4()) for _ in range(count)]
-        elif type == "password":
-            chars = string.ascii_letters + string.digits + "!@#$%^&*"
-            results = [''.join(random.choices(chars, k=16)) for _ in range(count)]
-        elif type == "hex":
-            results = [uuid.uuid4().hex for _ in range(count)]
-        else:
-            return {"error": f"Invalid type. Must be: number, uuid, password, hex", "success": False}
-        
+    except Exception as e:
         return {
-            "success": True,
-            "type": type,
-            "count": count,
-            "results": results
+            "error": str(e),
+            "expression": expression,
+            "success": False
         }
 
-    return mcp
+
+async def convert_units(value: float, from_unit: str, to_unit: str) -> dict:
+    """Convert between different units of measurement.
+
+    Args:
+        value: Numeric value to convert
+        from_unit: Source unit (m, km, mi, kg, lb, c, f, etc.)
+        to_unit: Target unit
+
+    Returns:
+        Dictionary with converted value and conversion details
+    """
+    from_unit = from_unit.lower()
+    to_unit = to_unit.lower()
+    
+    from_cat = _UNIT_CAT.get(from_unit)
+    to_cat = _UNIT_CAT.get(to_unit)
+    if from_cat is None or to_cat is None:
+        return {"error": f"Unknown unit: {from_unit} or {to_unit}", "success": False}
+    if from_cat != to_cat:
+        return {"error": f"Cannot convert {from_cat} ({from_unit}) to {to_cat} ({to_unit})", "success": False}
+    
+    # Temperature conversions (special case)
+    if from_cat == "temperature":
+        result = _TEMP_CONV[from_unit, to_unit](value)
+    else:
+        # Convert: value → base unit → target unit
+        factors = _FACTORS[from_cat]
+        result = value * factors[from_unit] / factors[to_unit]
+    
+    return {
+        "success": True,
+        "original_value": value,
+        "original_unit": from_unit,
+        "converted_value": round(result, 6),
+        "converted_unit": to_unit,
+        "formatted": f"{value} {from_unit} = {round(result, 4)} {to_unit}"
+    }
+
+
+async def generate_random(type: str = "number", count: int = 1, min: int = 0, max: int = 100) -> dict:
+    """Generate random data (numbers, UUIDs, passwords).
+
+    Args:
+        type: Type of random data (number, uuid, password, hex)
+        count: Number of items to generate (1-100)
+        min: Minimum value for numbers (default: 0)
+        max: Maximum value for numbers (default: 100)
+
+    Returns:
+        Dictionary with generated random data
+    """
+    if count < 1 or count > 100:
+        return {"error": "Count must be between 1 and 100", "success": False}
+    
+    results = []
+    
+    if type == "number":
+        results = [random.randint(min, max) for _ in range(count)]
+    elif type == "uuid":
+        results = [new_uuid4_str() for _ in range(count)]
+    elif type == "password":
+        # Draw every character in one call, then slice it into passwords
+        chars = ''.join(random.choices(_PWD_CHARS, k=_PWD_LENGTH * count))
+        results = [chars[i:i + _PWD_LENGTH] for i in range(0, len(chars), _PWD_LENGTH)]
+    elif type == "hex":
+        results = [os.urandom(16).hex() for _ in range(count)]
+    else:
+        return {"error": f"Invalid type. Must be: number, uuid, password, hex", "success": False}
+    
+    return {
+        "success": True,
+        "type": type,
+        "count": count,
+        "results": results
+    }
+
+
+# Tools registered by create_server()
+TOOLS = (calculate, convert_units, generate_random)
+
+
+@functools.lru_cache(maxsize=1)
+def create_server() -> FastMCP:
+    """Create No-Auth HTTP server with optional header logging.
+
+    The server is built once per process; call create_server.cache_clear()
+    to rebuild it.
+
+    Returns:
+        Configured FastMCP server without authentication
+    """
+    # Create FastMCP server with the standard middleware stack and domain tools
+    return make_server(
+        "No Auth HTTP Server",
+        "NO_AUTH_HTTP",
+        TOOLS,
+        header_logging=os.environ.get("DEBUG_HEADERS") == "1",  # Set DEBUG_HEADERS=1 for debugging
+    )
 
 
 if __name__ == "__main__":
@@ -200,6 +260,7 @@ if __name__ == "__main__":
         transport="HTTP",
         warning="⚠️  This server has NO authentication!"
     )
-    logger.info("🔍 All HTTP headers will be logged for debugging")
+    if os.environ.get("DEBUG_HEADERS") == "1":
+        logger.info("🔍 All HTTP headers will be logged for debugging")
     
-    server.run(transport="http", port=port, log_level="debug")
+    server.run(transport="http", port=port, log_level=os.environ.get("LOG_LEVEL", "warning"))
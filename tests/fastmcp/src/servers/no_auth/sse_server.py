@@ -1,164 +1,168 @@
 """System Monitor v1.0 - No Authentication SSE Server.
 
-This server has NO authentication requirements and logs all incoming HTTP headers.
+This server has NO authentication requirements and logs all incoming HTTP headers
+when DEBUG_HEADERS=1.
 Domain: System Monitor - Track CPU usage, memory stats, and disk space.
 Useful for monitoring system resources over SSE transport.
 """
 
+import functools
 import json
 import os
+import random
 from typing import Any
 
 from fastmcp import FastMCP
 
 from src.common.constants import PORT_NO_AUTH_SSE
 from src.common.logging import get_logger, log_startup
-from src.common.middleware import add_standard_middleware
+from src.common.timestamps import utc_iso
+from src.servers._factory import make_server
 
 
 # Get module logger
 logger = get_logger(__name__)
 logger.info("Module loaded! Starting server setup...")
 
+# Uniform [0, 1) source for the simulated stats; tools scale draws inline
+_rand = random.random
 
+
+# Domain: System Monitor
+async def get_cpu_usage(interval_seconds: int = 1) -> dict:
+    """Get current CPU usage statistics.
+
+    Args:
+        interval_seconds: Measurement interval in seconds (1-60)
+
+    Returns:
+        Dictionary with CPU usage percentages and core details
+    """
+    if interval_seconds < 1 or interval_seconds > 60:
+        return {"error": "Interval must be between 1 and 60 seconds", "success": False}
+    
+    # Simulate CPU usage
+    num_cores = random.choice([4, 6, 8, 12, 16])
+    # One batch of draws: overall usage, three load averages, then one per core
+    draws = [_rand() for _ in range(num_cores + 4)]
+    overall_usage = round(10 + 75 * draws[0], 2)
+    load_1, load_5, load_15 = (round(1 + 7 * v, 2) for v in draws[1:4])
+    
+    core_usage = [round(5 + 90 * v, 2) for v in draws[4:]]
+    
+    return {
+        "success": True,
+        "timestamp": utc_iso(),
+        "interval_seconds": interval_seconds,
+        "cpu_count": num_cores,
+        "overall_usage_percent": overall_usage,
+        "per_core_usage_percent": core_usage,
+        "load_average": {
+            "1min": load_1,
+            "5min": load_5,
+            "15min": load_15
+        },
+        "status": "healthy" if overall_usage < 80 else "warning" if overall_usage < 90 else "critical"
+    }
+
+
+async def get_memory_stats() -> dict:
+    """Get current memory (RAM) usage statistics.
+
+    Returns:
+        Dictionary with memory usage, available RAM, and swap details
+    """
+    # Simulate memory stats (in GB)
+    total_gb = random.choice([8, 16, 32, 64])
+    used_r, swap_r, cached_r, buffers_r = _rand(), _rand(), _rand(), _rand()
+    used_gb = round(total_gb * (0.3 + 0.55 * used_r), 2)
+    available_gb = round(total_gb - used_gb, 2)
+    percent_used = round((used_gb / total_gb) * 100, 2)
+    
+    # Swap memory
+    swap_total_gb = random.choice([0, 2, 4, 8])
+    swap_used_gb = round(swap_total_gb * 0.5 * swap_r, 2) if swap_total_gb > 0 else 0
+    
+    return {
+        "success": True,
+        "timestamp": utc_iso(),
+        "memory": {
+            "total_gb": total_gb,
+            "used_gb": used_gb,
+            "available_gb": available_gb,
+            "percent_used": percent_used,
+            "cached_gb": round(1 + 4 * cached_r, 2),
+            "buffers_gb": round(0.1 + 0.9 * buffers_r, 2)
+        },
+        "swap": {
+            "total_gb": swap_total_gb,
+            "used_gb": swap_used_gb,
+            "free_gb": round(swap_total_gb - swap_used_gb, 2),
+            "percent_used": round((swap_used_gb / swap_total_gb * 100), 2) if swap_total_gb > 0 else 0
+        },
+        "status": "healthy" if percent_used < 80 else "warning" if percent_used < 90 else "critical"
+    }
+
+
+async def get_disk_usage(path: str = "/") -> dict:
+    """Get disk space usage for a filesystem path.
+
+    Args:
+        path: Filesystem path to check (default: root)
+
+    Returns:
+        Dictionary with disk space usage and availability
+    """
+    # Simulate disk stats (in GB)
+    total_gb = random.choice([250, 500, 1000, 2000])
+    used_gb = round(total_gb * (0.4 + 0.45 * _rand()), 2)
+    free_gb = round(total_gb - used_gb, 2)
+    percent_used = round((used_gb / total_gb) * 100, 2)
+    
+    return {
+        "success": True,
+        "timestamp": utc_iso(),
+        "path": path,
+        "filesystem": random.choice(["ext4", "NTFS", "APFS", "btrfs"]),
+        "disk": {
+            "total_gb": total_gb,
+            "used_gb": used_gb,
+            "free_gb": free_gb,
+            "percent_used": percent_used
+        },
+        "inodes": {
+            "total": random.randint(1000000, 10000000),
+            "used": random.randint(100000, 500000),
+            "free": random.randint(500000, 9500000)
+        },
+        "mount_point": path,
+        "status": "healthy" if percent_used < 80 else "warning" if percent_used < 90 else "critical",
+        "read_only": False
+    }
+
+
+# Tools registered by create_server()
+TOOLS = (get_cpu_usage, get_memory_stats, get_disk_usage)
+
+
+@functools.lru_cache(maxsize=1)
 def create_server() -> FastMCP:
-    """Create No-Auth SSE server with header logging.
+    """Create No-Auth SSE server with optional header logging.
+
+    The server is built once per process; call create_server.cache_clear()
+    to rebuild it.
 
     Returns:
         Configured FastMCP server without authentication
     """
-    # Create FastMCP server WITHOUT authentication
-    mcp = FastMCP(name="No Auth SSE Server")
-    
-    # Add standard middleware stack with header logging for debugging
-    add_standard_middleware(
-        mcp,
-        server_prefix="NO_AUTH_SSE",
-        enable_structured_logging=True,
-        enable_header_logging=True,  # Enable for debugging
-        include_payloads=False,
+    # Create FastMCP server with the standard middleware stack and domain tools
+    return make_server(
+        "No Auth SSE Server",
+        "NO_AUTH_SSE",
+        TOOLS,
+        header_logging=os.environ.get("DEBUG_HEADERS") == "1",  # Set DEBUG_HEADERS=1 for debugging
     )
 
-    # Domain: System Monitor
-    @mcp.tool()
-    def get_cpu_usage(interval_seconds: int = 1) -> dict:
-        """Get current CPU usage statistics.
-
-        Args:
-            interval_seconds: Measurement interval in seconds (1-60)
-
-        Returns:
-            Dictionary with CPU usage percentages and core details
-        """
-        import random
-        from datetime import datetime
-        
-        if interval_seconds < 1 or interval_seconds > 60:
-            return {"error": "Interval must be between 1 and 60 seconds", "success": False}
-        
-        # Simulate CPU usage
-        num_cores = random.choice([4, 6, 8, 12, 16])
-        overall_usage = round(random.uniform(10, 85), 2)
-        
-        core_usage = [round(random.uniform(5, 95), 2) for _ in range(num_cores)]
-        
-        return {
-            "success": True,
-            "timestamp": datetime.utcnow().isoformat(),
-            "interval_seconds": interval_seconds,
-            "cpu_count": num_cores,
-            "overall_usage_percent": overall_usage,
-            "per_core_usage_percent": core_usage,
-            "load_average": {
-                "1min": round(random.uniform(1, 8), 2),
-                "5min": round(random.uniform(1, 8), 2),
-                "15min": round(random.uniform(1, 8), 2)
-            },
-            "status": "healthy" if overall_usage < 80 else "warning" if overall_usage < 90 else "critical"
-        }
-
-    @mcp.tool()
-    def get_memory_stats() -> dict:
-        """Get current memory (RAM) usage statistics.
-
-        Returns:
-            Dictionary with memory usage, available RAM, and swap details
-        """
-        import random
-        from datetime import datetime
-        
-        # Simulate memory stats (in GB)
-        total_gb = random.choice([8, 16, 32, 64])
-        used_gb = round(random.uniform(total_gb * 0.3, total_gb * 0.85), 2)
-        available_gb = round(total_gb - used_gb, 2)
-        percent_used = round((used_gb / total_gb) * 100, 2)
-        
-        # Swap memory
-        swap_total_gb = random.choice([0, 2, 4, 8])
-        swap_used_gb = round(random.uniform(0, swap_total_gb * 0.5), 2) if swap_total_gb > 0 else 0
-        
-        return {
-            "success": True,
-            "timestamp": datetime.utcnow().isoformat(),
-            "memory": {
-                "total_gb": total_gb,
-                "used_gb": used_gb,
-                "available_gb": available_gb,
-                "percent_used": percent_used,
-                "cached_gb": round(random.uniform(1, 5), 2),
-                "buffers_gb": round(random.uniform(0.1, 1), 2)
-            },
-            "swap": {
-                "total_gb": swap_total_gb,
-                "used_gb": swap_used_gb,
-                "free_gb": round(swap_total_gb - swap_used_gb, 2),
-                "percent_used": round((swap_used_gb / swap_total_gb * 100), 2) if swap_total_gb > 0 else 0
-            },
-            "status": "healthy" if percent_used < 80 else "warning" if percent_used < 90 else "critical"
-        }
-
-    @mcp.tool()
-    def get_disk_usage(path: str = "/") -> dict:
-        """Get disk space usage for a filesystem path.
-
-        Args:
-            path: Filesystem path to check (default: root)
-
-        Returns:
-            Dictionary with disk space usage and availability
-        """
-        import random
-        from datetime import datetime
-        
-        # Simulate disk stats (in GB)
-        total_gb = random.choice([250, 500, 1000, 2000])
-        used_gb = round(random.uniform(total_gb * 0.4, total_gb * 0.85), 2)
-        free_gb = round(total_gb - used_gb, 2)
-        percent_used = round((used_gb / total_gb) * 100, 2)
-        
-        return {
-            "success": True,
-            "timestamp": datetime.utcnow().isoformat(),
-            "path": path,
-            "filesystem": random.choice(["ext4", "NTFS", "APFS", "btrfs"]),
-            "disk": {
-                "total_gb": total_gb,
-                "used_gb": used_gb,
-                "free_gb": free_gb,
-                "percent_used": percent_used
-            },
-            "inodes": {
-                "total": random.randint(1000000, 10000000),
-                "used": random.randint(100000, 500000),
-                "free": random.randint(500000, 9500000)
-            },
-            "mount_point": path,
-            "status": "healthy" if percent_used < 80 else "warning" if percent_used < 90 else "critical",
-            "read_only": False
-        }
-
-    return mcp
-
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", PORT_NO_AUTH_SSE))
@@ -173,6 +177,7 @@ if __name__ == "__main__":
         transport="SSE",
         warning="⚠️  This server has NO authentication!"
     )
-    logger.info("🔍 All HTTP headers will be logged for debugging")
+    if os.environ.get("DEBUG_HEADERS") == "1":
+        logger.info("🔍 All HTTP headers will be logged for debugging")
     
-    server.run(transport="sse", port=port, log_level="debug")
+    server.run(transport="sse", port=port, log_level=os.environ.get("LOG_LEVEL", "warning"))
@@ -15,32 +15,96 @@ Flow:
 This uses FastMCP's native auth system by passing AuthSettings and TokenVerifier.
 """
 
+import hashlib
+import json
 import os
+import random
+import re
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 import httpx
+import jwt  # PyJWT
 from fastmcp import FastMCP
 from fastmcp.server.auth.auth import TokenVerifier, AccessToken, RemoteAuthProvider
 
-from src.common.constants import (SERVER_NAME_OAUTH2, OAUTH2_PROVIDER_PORT, PORT_OAUTH2_HTTP, DEFAULT_OAUTH2_CLIENT_ID, )
+from src.common.constants import (SERVER_NAME_OAUTH2, OAUTH2_PROVIDER_PORT, PORT_OAUTH2_HTTP, DEFAULT_OAUTH2_CLIENT_ID,
+                                  DEFAULT_OAUTH2_JWT_SECRET, OAUTH2_JWT_ALGORITHM, )
 from src.common.logging import get_logger
-
-# Global provider URL (set at startup)
-PROVIDER_BASE_URL = ""
-SERVER_BASE_URL = ""
+from src.common.timestamps import SECONDS_PER_DAY, utc_iso
+from src.servers._factory import make_server
 
 logger = get_logger(__name__)
 
+# Connection pool for token introspection calls to the provider
+_INTROSPECTION_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+
+# Successful introspection results are reused for up to this many seconds
+# (never past the token's own exp); a revoked token may be accepted until then
+_INTROSPECTION_CACHE_TTL = 60.0
+_INTROSPECTION_CACHE_SIZE = 1024
+# Per-process key for the cache digests, so cache keys can't be precomputed from tokens
+_CACHE_SALT = os.urandom(16)
+
+# Bearer token syntax (RFC 6750 b64token); anything else is rejected unseen
+_B64TOKEN_RE = re.compile(r"[A-Za-z0-9\-._~+/]+=*")
+
+# Claims every locally verified JWT must carry
+_REQUIRED_CLAIMS = ["exp", "iat", "iss", "aud", "jti"]
+
+# Sample inbox contents served by get_inbox
+_SENDERS = ("alice@example.com", "bob@company.com", "support@service.com", "news@newsletter.com")
+_SUBJECTS = (
+    "Meeting reminder", "Project update", "Invoice #12345",
+    "Weekly newsletter", "Account notification", "Re: Question about..."
+)
+_SEARCH_FOLDERS = ("inbox", "sent", "archives")
+_BOOLS = (True, False)
+
 
 class OAuth2TokenVerifier(TokenVerifier):
     """Token verifier that validates Bearer tokens against the OAuth2 provider.
     
+    JWTs issued by the provider are verified locally (signature, exp, iss,
+    aud) with the shared signing key. Tokens that are not shaped like a
+    provider token are rejected outright; the rest are sent to the
+    provider's introspection endpoint.
+
+    Successful introspection results are cached for up to
+    ``_INTROSPECTION_CACHE_TTL`` seconds (60s, never past the token's exp),
+    so an opaque token revoked at the provider may still be accepted for
+    up to a minute afterwards.
+    
     This extends FastMCP's TokenVerifier base class.
     """
     
-    def __init__(self, provider_url: str, base_url: str | None = None):
+    def __init__(
+        self,
+        provider_url: str,
+        base_url: str | None = None,
+        jwt_secret: str | None = None,
+        audience: str | None = None,
+    ):
         super().__init__(base_url=base_url, required_scopes=["mcp:tools:read"])
         self.provider_url = provider_url
         self.validate_url = f"{provider_url}/oauth/validate"
+        self.jwt_secret = jwt_secret
+        self.audience = audience or base_url
+        # One pooled client for all validations, so connections to the provider are reused
+        self._client = httpx.AsyncClient(
+            base_url=provider_url,
+            limits=_INTROSPECTION_LIMITS,
+            timeout=5.0,
+            headers={"Accept": "application/json"},
+        )
+        # keyed token digest -> (monotonic deadline, AccessToken), least recently used first
+        self._cache: OrderedDict[bytes, tuple[float, AccessToken]] = OrderedDict()
+    
+    async def aclose(self) -> None:
+        """Close the pooled introspection client."""
+        await self._client.aclose()
     
     async def verify_token(self, token: str) -> AccessToken | None:
         """Verify a bearer token and return access info if valid.
@@ -51,48 +115,269 @@ class OAuth2TokenVerifier(TokenVerifier):
         Returns:
             AccessToken if valid, None otherwise
         """
+        # Provider JWTs (header.payload.signature) never need the network
+        dots = token.count(".")
+        if self.jwt_secret and dots == 2:
+            return self._verify_jwt(token)
+        
+        # Reject by shape before the provider round-trip: the provider's
+        # opaque tokens are dot-free b64tokens, and JWTs have exactly two dots
+        if dots not in (0, 2) or not _B64TOKEN_RE.fullmatch(token):
+            logger.warning("Rejected malformed bearer token")
+            return None
+        
+        key = hashlib.blake2b(token.encode(), digest_size=16, key=_CACHE_SALT).digest()
+        cached = self._cache.get(key)
+        if cached is not None:
+            if cached[0] > time.monotonic():
+                self._cache.move_to_end(key)
+                return cached[1]
+            del self._cache[key]
+        
         try:
             logger.debug("Validating token with provider...")
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.validate_url,
-                    headers={"Authorization": f"Bearer {token}"},
-                    timeout=5.0
-                )
-                
-                if response.status_code != 200:
-                    logger.warning(f"Token validation failed (status {response.status_code})")
-                    return None
-                
-                token_info = response.json()
-                
-                if not token_info.get("active"):
-                    logger.warning("Token is not active")
-                    return None
-                
-                # Extract token information
-                client_id = token_info.get("client_id", "unknown")
-                scopes = token_info.get("scope", "").split()
-                expires_at = token_info.get("exp")
-                
-                logger.info(f"Token valid - client_id={client_id}, scopes={scopes}")
-                
-                return AccessToken(
-                    token=token,
-                    client_id=client_id,
-                    scopes=scopes,
-                    expires_at=expires_at,
-                )
-                
+            response = await self._client.post(
+                "/oauth/validate",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            
+            if response.status_code != 200:
+                logger.warning("Token validation failed (status %d)", response.status_code)
+                return None
+            
+            # Provider always answers JSON; skip httpx's encoding detection
+            token_info = json.loads(response.content)
+            
+            if not token_info.get("active"):
+                logger.warning("Token is not active")
+                return None
+            
+            # Extract token information
+            client_id = token_info.get("client_id", "unknown")
+            scopes = token_info.get("scope", "").split()
+            expires_at = token_info.get("exp")
+            
+            logger.info("Token valid - client_id=%s, scopes=%s", client_id, scopes)
+            
+            access_token = AccessToken(
+                token=token,
+                client_id=client_id,
+                scopes=scopes,
+                expires_at=expires_at,
+            )
+            self._remember(key, access_token)
+            return access_token
+            
         except Exception as e:
-            logger.error(f"Token validation error: {e}")
+            logger.error("Token validation error: %s", e)
+            return None
+    
+    def _verify_jwt(self, token: str) -> AccessToken | None:
+        """Verify a provider-issued JWT without calling the provider.
+        
+        Unlike introspection, this cannot see tokens the provider has
+        revoked or forgotten (e.g. after a provider restart); by design they
+        stay valid until exp, so keep provider token lifetimes short.
+        
+        Args:
+            token: The bearer JWT
+            
+        Returns:
+            AccessToken if valid, None otherwise
+        """
+        try:
+            claims = jwt.decode(
+                token,
+                self.jwt_secret,
+                algorithms=[OAUTH2_JWT_ALGORITHM],
+                audience=self.audience,
+                issuer=self.provider_url,
+                options={"require": _REQUIRED_CLAIMS},
+            )
+        except jwt.InvalidTokenError as e:
+            logger.warning("JWT validation failed: %s", e)
             return None
+        
+        return AccessToken(
+            token=token,
+            client_id=claims.get("client_id", claims.get("sub", "unknown")),
+            scopes=claims.get("scope", "").split(),
+            expires_at=claims["exp"],
+            claims=claims,
+        )
+    
+    def _remember(self, key: bytes, access_token: AccessToken) -> None:
+        """Cache a successful validation, evicting the least recently used entry when full.
+        
+        Args:
+            key: Keyed digest of the bearer token
+            access_token: Validated token info
+        """
+        ttl = _INTROSPECTION_CACHE_TTL
+        if access_token.expires_at is not None:
+            ttl = min(ttl, access_token.expires_at - time.time())
+        if ttl <= 0:
+            return
+        
+        self._cache[key] = (time.monotonic() + ttl, access_token)
+        self._cache.move_to_end(key)
+        if len(self._cache) > _INTROSPECTION_CACHE_SIZE:
+            self._cache.popitem(last=False)
 
 
 # Note: PRM endpoint is automatically created by RemoteAuthProvider
 # at /.well-known/oauth-protected-resource/mcp
 
 
+# Domain: Email Service
+def send_email(to: str, subject: str, body: str, cc: str = None) -> dict:
+    """Send an email message.
+
+    Args:
+        to: Recipient email address
+        subject: Email subject line
+        body: Email body content
+        cc: Optional CC recipients (comma-separated)
+
+    Returns:
+        Dictionary with send status and message details
+    """
+    # Basic email validation
+    if "@" not in to:
+        return {"error": "Invalid recipient email address", "success": False}
+    
+    now_ts = time.time()
+    message_id = f"<{random.randint(100000, 999999)}.{int(now_ts)}@mail.example.com>"
+    
+    return {
+        "success": True,
+        "message_id": message_id,
+        "to": to,
+        "cc": cc.split(",") if cc else [],
+        "subject": subject,
+        "body_length": len(body),
+        "sent_at": utc_iso(now_ts),
+        "delivery_status": "queued",
+        "estimated_delivery": "within 1 minute",
+        "size_bytes": len(subject) + len(body)
+    }
+
+
+def get_inbox(folder: str = "inbox", limit: int = 20) -> dict:
+    """Retrieve messages from email inbox.
+
+    Args:
+        folder: Folder to retrieve from (inbox, sent, drafts, spam)
+        limit: Maximum number of messages to return (1-100)
+
+    Returns:
+        Dictionary with list of email messages
+    """
+    valid_folders = ["inbox", "sent", "drafts", "spam", "trash"]
+    if folder not in valid_folders:
+        return {"error": f"Invalid folder. Must be one of: {', '.join(valid_folders)}", "success": False}
+    
+    if limit < 1 or limit > 100:
+        return {"error": "Limit must be between 1 and 100", "success": False}
+    
+    # Generate sample emails, drawing each field for all messages at once
+    randint = random.randint
+    uniform = random.uniform
+    choices = random.choices
+    now_ts = time.time()
+    
+    num_messages = randint(5, limit)
+    senders = choices(_SENDERS, k=num_messages)
+    subjects = choices(_SUBJECTS, k=num_messages)
+    hours_ago = choices(range(1, 169), k=num_messages)
+    read_flags = choices(_BOOLS, k=num_messages)
+    attachment_flags = choices(_BOOLS, k=num_messages)
+    messages = [
+        {
+            "id": f"msg_{i}_{randint(1000, 9999)}",
+            "from": sender,
+            "subject": subject,
+            "preview": "This is a preview of the email content...",
+            "received_at": utc_iso(now_ts - hours * 3600),
+            "size_kb": round(uniform(1, 50), 2),
+            "is_read": is_read,
+            "has_attachments": has_attachments,
+            "folder": folder
+        }
+        for i, (sender, subject, hours, is_read, has_attachments) in enumerate(
+            zip(senders, subjects, hours_ago, read_flags, attachment_flags, strict=True)
+        )
+    ]
+    
+    # Sort by date (newest first)
+    messages.sort(key=lambda x: x["received_at"], reverse=True)
+    
+    return {
+        "success": True,
+        "folder": folder,
+        "message_count": len(messages),
+        "unread_count": sum(1 for m in messages if not m["is_read"]),
+        "fetched_at": utc_iso(now_ts),
+        "messages": messages
+    }
+
+
+def search_emails(query: str, folder: str = "all", limit: int = 50) -> dict:
+    """Search emails by keyword or sender.
+
+    Args:
+        query: Search query (keywords, sender, subject)
+        folder: Folder to search in (all, inbox, sent, etc.)
+        limit: Maximum results to return (1-100)
+
+    Returns:
+        Dictionary with matching email messages
+    """
+    if limit < 1 or limit > 100:
+        return {"error": "Limit must be between 1 and 100", "success": False}
+    
+    # Simulate search results, drawing each field for all results at once
+    randint = random.randint
+    uniform = random.uniform
+    choices = random.choices
+    now_ts = time.time()
+    
+    num_results = randint(2, min(limit, 15))
+    days_ago = choices(range(0, 91), k=num_results)
+    folders = choices(_SEARCH_FOLDERS, k=num_results)
+    read_flags = choices(_BOOLS, k=num_results)
+    snippet = f"...{query} appeared in this message context..."
+    results = [
+        {
+            "id": f"search_{i}_{randint(1000, 9999)}",
+            "from": f"sender{i}@example.com",
+            "subject": f"Email containing '{query}' - #{i+1}",
+            "snippet": snippet,
+            "received_at": utc_iso(now_ts - days * SECONDS_PER_DAY),
+            "relevance_score": round(uniform(0.5, 1.0), 2),
+            "folder": result_folder,
+            "is_read": is_read
+        }
+        for i, (days, result_folder, is_read) in enumerate(zip(days_ago, folders, read_flags, strict=True))
+    ]
+    
+    # Sort by relevance
+    results.sort(key=lambda x: x["relevance_score"], reverse=True)
+    
+    return {
+        "success": True,
+        "query": query,
+        "folder_searched": folder,
+        "results_count": len(results),
+        "searched_at": utc_iso(now_ts),
+        "results": results
+    }
+
+
+# Tools registered by create_server()
+TOOLS = (send_email, get_inbox, search_emails)
+
+
 def create_server(port: int = PORT_OAUTH2_HTTP) -> FastMCP:
     """Create and configure the MCP server with OAuth2 Bearer authentication.
     
@@ -108,186 +393,67 @@ def create_server(port: int = PORT_OAUTH2_HTTP) -> FastMCP:
     # Get provider URL
     provider_port = int(os.environ.get("OAUTH2_PROVIDER_PORT", OAUTH2_PROVIDER_PORT))
     
-    global PROVIDER_BASE_URL, SERVER_BASE_URL
-    # Ensure no trailing slashes in URLs (OAuth2 spec requirement)
-    PROVIDER_BASE_URL = f"http://localhost:{provider_port}".rstrip('/')
-    SERVER_BASE_URL = f"http://localhost:{port}".rstrip('/')
+    # Ensure no trailing slashes in URLs (OAuth2 spec requirement).
+    # Kept local so several servers can be built in one process.
+    provider_base_url = f"http://localhost:{provider_port}".rstrip('/')
+    server_base_url = f"http://localhost:{port}".rstrip('/')
     
     # Create OAuth2 token verifier (extends FastMCP's TokenVerifier)
     token_verifier = OAuth2TokenVerifier(
-        provider_url=PROVIDER_BASE_URL,
-        base_url=SERVER_BASE_URL
+        provider_url=provider_base_url,
+        base_url=server_base_url,
+        jwt_secret=os.environ.get("OAUTH2_JWT_SECRET", DEFAULT_OAUTH2_JWT_SECRET),
+        audience=os.environ.get("OAUTH2_AUDIENCE", server_base_url),
     )
     
     # Wrap with RemoteAuthProvider to advertise authorization servers
     # This automatically creates the /.well-known/oauth-protected-resource/mcp endpoint
     auth = RemoteAuthProvider(
         token_verifier=token_verifier,
-        authorization_servers=[PROVIDER_BASE_URL],
-        base_url=SERVER_BASE_URL,
+        authorization_servers=[provider_base_url],
+        base_url=server_base_url,
         resource_name="OAuth2 MCP Server",
     )
     
-    # Create MCP server with OAuth2 authentication
-    mcp = FastMCP(
-        name=SERVER_NAME_OAUTH2,
+    @asynccontextmanager
+    async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+        # Release the verifier's pooled connections when the server shuts down
+        try:
+            yield
+        finally:
+            await token_verifier.aclose()
+    
+    # Create MCP server with OAuth2 authentication, the standard middleware
+    # stack and domain tools
+    return make_server(
+        SERVER_NAME_OAUTH2,
+        "OAUTH2_HTTP",
+        TOOLS,
         auth=auth,
+        lifespan=lifespan,
     )
-    
-    # Domain: Email Service
-    @mcp.tool()
-    def send_email(to: str, subject: str, body: str, cc: str = None) -> dict:
-        """Send an email message.
-
-        Args:
-            to: Recipient email address
-            subject: Email subject line
-            body: Email body content
-            cc: Optional CC recipients (comma-separated)
-
-        Returns:
-            Dictionary with send status and message details
-        """
-        from datetime import datetime
-        import random
-        
-        # Basic email validation
-        if "@" not in to:
-            return {"error": "Invalid recipient email address", "success": False}
-        
-        message_id = f"<{random.randint(100000, 999999)}.{int(datetime.utcnow().timestamp())}@mail.example.com>"
-        
-        return {
-            "success": True,
-            "message_id": message_id,
-            "to": to,
-            "cc": cc.split(",") if cc else [],
-            "subject": subject,
-            "body_length": len(body),
-            "sent_at": datetime.utcnow().isoformat(),
-            "delivery_status": "queued",
-            "estimated_delivery": "within 1 minute",
-            "size_bytes": len(subject) + len(body)
-        }
-    
-    @mcp.tool()
-    def get_inbox(folder: str = "inbox", limit: int = 20) -> dict:
-        """Retrieve messages from email inbox.
-
-        Args:
-            folder: Folder to retrieve from (inbox, sent, drafts, spam)
-            limit: Maximum number of messages to return (1-100)
 
-        Returns:
-            Dictionary with list of email messages
-        """
-        from datetime import datetime, timedelta
-        import random
-        
-        valid_folders = ["inbox", "sent", "drafts", "spam", "trash"]
-        if folder not in valid_folders:
-            return {"error": f"Invalid folder. Must be one of: {', '.join(valid_folders)}", "success": False}
-        
-        if limit < 1 or limit > 100:
-            return {"error": "Limit must be between 1 and 100", "success": False}
-        
-        # Generate sample emails
-        messages = []
-        senders = ["alice@example.com", "bob@company.com", "support@service.com", "news@newsletter.com"]
-        subjects = [
-            "Meeting reminder", "Project update", "Invoice #12345",
-            "Weekly newsletter", "Account notification", "Re: Question about..."
-        ]
-        
-        num_messages = random.randint(5, limit)
-        for i in range(num_messages):
-            messages.append({
-                "id": f"msg_{i}_{random.randint(1000, 9999)}",
-                "from": random.choice(senders),
-                "subject": random.choice(subjects),
-                "preview": "This is a preview of the email content...",
-                "received_at": (datetime.utcnow() - timedelta(hours=random.randint(1, 168))).isoformat(),
-                "size_kb": round(random.uniform(1, 50), 2),
-                "is_read": random.choice([True, False]),
-                "has_attachments": random.choice([True, False]),
-                "folder": folder
-            })
-        
-        # Sort by date (newest first)
-        messages.sort(key=lambda x: x["received_at"], reverse=True)
-        
-        return {
-            "success": True,
-            "folder": folder,
-            "message_count": len(messages),
-            "unread_count": sum(1 for m in messages if not m["is_read"]),
-            "fetched_at": datetime.utcnow().isoformat(),
-            "messages": messages
-        }
-    
-    @mcp.tool()
-    def search_emails(query: str, folder: str = "all", limit: int = 50) -> dict:
-        """Search emails by keyword or sender.
 
-        Args:
-            query: Search query (keywords, sender, subject)
-            folder: Folder to search in (all, inbox, sent, etc.)
-            limit: Maximum results to return (1-100)
+def main(port: int | None = None) -> None:
+    """Run the OAuth2 MCP server.
 
-        Returns:
-            Dictionary with matching email messages
-        """
-        from datetime import datetime, timedelta
-        import random
-        
-        if limit < 1 or limit > 100:
-            return {"error": "Limit must be between 1 and 100", "success": False}
-        
-        # Simulate search results
-        num_results = random.randint(2, min(limit, 15))
-        results = []
-        
-        for i in range(num_results):
-            results.append({
-                "id": f"search_{i}_{random.randint(1000, 9999)}",
-                "from": f"sender{i}@example.com",
-                "subject": f"Email containing '{query}' - #{i+1}",
-                "snippet": f"...{query} appeared in this message context...",
-                "received_at": (datetime.utcnow() - timedelta(days=random.randint(0, 90))).isoformat(),
-                "relevance_score": round(random.uniform(0.5, 1.0), 2),
-                "folder": random.choice(["inbox", "sent", "archives"]),
-                "is_read": random.choice([True, False])
-            })
-        
-        # Sort by relevance
-        results.sort(key=lambda x: x["relevance_score"], reverse=True)
-        
-        return {
-            "success": True,
-            "query": query,
-            "folder_searched": folder,
-            "results_count": len(results),
-            "searched_at": datetime.utcnow().isoformat(),
-            "results": results
-        }
-    
-    return mcp
-
-
-if __name__ == "__main__":
-    port = int(os.environ.get("PORT", PORT_OAUTH2_HTTP))
+    Args:
+        port: Port to listen on (defaults to $PORT, then PORT_OAUTH2_HTTP)
+    """
+    if port is None:
+        port = int(os.environ.get("PORT", PORT_OAUTH2_HTTP))
     provider_port = int(os.environ.get("OAUTH2_PROVIDER_PORT", OAUTH2_PROVIDER_PORT))
     
-    logger.info(f"Starting {SERVER_NAME_OAUTH2} on port {port}")
-    logger.info(f"OAuth2 Provider: http://localhost:{provider_port}")
-    logger.info(f"Protected Resource Metadata (PUBLIC): http://localhost:{port}/.well-known/oauth-protected-resource/mcp")
-    logger.info(f"Client ID: {os.environ.get('OAUTH2_CLIENT_ID', DEFAULT_OAUTH2_CLIENT_ID)}")
+    logger.info("Starting %s on port %d", SERVER_NAME_OAUTH2, port)
+    logger.info("OAuth2 Provider: http://localhost:%d", provider_port)
+    logger.info("Protected Resource Metadata (PUBLIC): http://localhost:%d/.well-known/oauth-protected-resource/mcp", port)
+    logger.info("Client ID: %s", os.environ.get('OAUTH2_CLIENT_ID', DEFAULT_OAUTH2_CLIENT_ID))
     logger.info("")
     logger.info("Make sure OAuth2 provider is running first!")
     logger.info("")
     logger.info("OAuth2 Client Credentials Flow:")
     logger.info("1. Client tries HTTP request without token → HTTP 401 with WWW-Authenticate header")
-    logger.info(f"2. Client fetches PRM from http://localhost:{port}/.well-known/oauth-protected-resource/mcp (PUBLIC)")
+    logger.info("2. Client fetches PRM from http://localhost:%d/.well-known/oauth-protected-resource/mcp (PUBLIC)", port)
     logger.info("3. Client discovers AS from PRM, fetches AS metadata")
     logger.info("4. Client requests token from AS with client_id/client_secret")
     logger.info("5. Client retries HTTP request with Bearer token → HTTP 200 OK")
@@ -296,3 +462,7 @@ if __name__ == "__main__":
     # RemoteAuthProvider automatically creates the PRM endpoint
     mcp_server = create_server(port)
     mcp_server.run(transport="http", port=port)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,48 +7,229 @@ This is an OAuth2 authorization server implementing:
 - Authorization Server Metadata (RFC 8414)
 """
 
+import asyncio
+import base64
+import binascii
+import hashlib
+import hmac
+import json
 import os
-import secrets
+import re
+import threading
 import time
 import jwt  # PyJWT
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from urllib.parse import urlencode
 
 from starlette.applications import Starlette
 from starlette.requests import Request
-from starlette.responses import HTMLResponse, JSONResponse, RedirectResponse
+from starlette.responses import HTMLResponse, JSONResponse, RedirectResponse, Response
 from starlette.routing import Route
 
 from src.common.constants import (
     DEFAULT_OAUTH2_CLIENT_ID,
     DEFAULT_OAUTH2_CLIENT_SECRET,
+    DEFAULT_OAUTH2_JWT_SECRET,
     DEFAULT_OAUTH2_TOKEN_EXPIRY,
+    OAUTH2_JWT_ALGORITHM,
     OAUTH2_PROVIDER_PORT,
     PORT_OAUTH2_HTTP,
 )
+from src.common.logging import get_logger
+
+# Get module logger
+logger = get_logger(__name__)
 
 # JWT signing key (in production, use proper key management)
-JWT_SECRET_KEY = os.environ.get("OAUTH2_JWT_SECRET", "mcp-oauth2-test-secret-key-do-not-use-in-production")
-JWT_ALGORITHM = "HS256"
+JWT_SECRET_KEY = os.environ.get("OAUTH2_JWT_SECRET", DEFAULT_OAUTH2_JWT_SECRET)
+JWT_ALGORITHM = OAUTH2_JWT_ALGORITHM
+
+# _sign_jwt's HMAC is SHA-256 only; refuse to advertise any other algorithm
+if JWT_ALGORITHM != "HS256":
+    raise RuntimeError(f"_sign_jwt only supports HS256, not {JWT_ALGORITHM}")
+
+# Pre-encoded pieces for _sign_jwt (same bytes PyJWT would produce)
+_JWT_HEADER_B64 = base64.urlsafe_b64encode(
+    json.dumps({"alg": JWT_ALGORITHM, "typ": "JWT"}, separators=(",", ":")).encode()
+).rstrip(b"=")
+_JWT_KEY = JWT_SECRET_KEY.encode()
+
+# Authorization header: scheme and credentials
+_AUTH_RE = re.compile(r"^(Bearer|Basic) (\S+)$")
+
+# state values made only of unreserved URL characters need no quoting
+_UNRESERVED_RE = re.compile(r"[A-Za-z0-9._~-]*")
+
+# Introspection decoder with its options fixed up front; no audience check,
+# introspection should work for any audience
+_JWT_DECODER = jwt.PyJWT(options={
+    "verify_signature": True,
+    "verify_exp": True,
+    "verify_iat": True,
+    "verify_aud": False,
+})
+_JWT_ALGORITHMS = [JWT_ALGORITHM]
+
+# Random bytes read from os.urandom in 4 KiB blocks and handed out by _urlsafe()
+_RNG_BUF = bytearray()
+_RNG_LOCK = threading.Lock()
+_RNG_BLOCK = 4096
+# A forked child must not hand out the same bytes as its parent
+if hasattr(os, "register_at_fork"):  # not available on Windows
+    os.register_at_fork(after_in_child=_RNG_BUF.clear)
+
+
+
+@dataclass(slots=True)
+class ClientRecord:
+    """Registered OAuth2 client."""
+
+    client_id: str
+    client_secret: str
+    redirect_uris: list[str]
+
+
+@dataclass(slots=True)
+class AuthCodeRecord:
+    """Issued, not yet exchanged authorization code."""
+
+    client_id: str
+    redirect_uri: str
+    scope: str
+    code_challenge: str | None
+    code_challenge_method: str | None
+    created_at: float
+
+
+@dataclass(slots=True)
+class AccessTokenRecord:
+    """Issued access token (opaque token or JWT jti)."""
+
+    client_id: str
+    scope: str
+    created_at: float
+    expires_at: float
+    grant_type: str
+    active: bool = True
+    refresh_token: str | None = None
+
 
 # In-memory storage for OAuth2 state
-AUTHORIZATION_CODES: dict[str, dict] = {}
-ACCESS_TOKENS: dict[str, dict] = {}  # Maps JWT token ID (jti) to token data
-CLIENTS: dict[str, dict] = {}
+AUTHORIZATION_CODES: dict[str, AuthCodeRecord] = {}
+ACCESS_TOKENS: dict[str, AccessTokenRecord] = {}  # Maps opaque token or JWT ID (jti) to token data
+CLIENTS: dict[str, ClientRecord] = {}
+REFRESH_INDEX: dict[str, str] = {}  # Maps refresh token to its opaque access token
+
+# Expired-state reaper: sweep interval, authorization code lifetime, and how long
+# an expired opaque token is kept so its refresh token can still be redeemed
+_REAP_INTERVAL = 60.0
+_AUTH_CODE_TTL = 600
+_REFRESH_GRACE = DEFAULT_OAUTH2_TOKEN_EXPIRY
+
+# Client credentials token settings, read from the environment by initialize_clients()
+_TOKEN_EXPIRY = DEFAULT_OAUTH2_TOKEN_EXPIRY
+_ISSUER = f"http://localhost:{OAUTH2_PROVIDER_PORT}"
+_AUDIENCE = f"http://localhost:{PORT_OAUTH2_HTTP}"
+
+
+def _json_bytes(content: dict) -> bytes:
+    """Serialize content exactly like JSONResponse does."""
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def _static_json(body: bytes, status_code: int = 200) -> Response:
+    """Wrap a pre-serialized JSON body in a response."""
+    return Response(body, status_code=status_code, media_type="application/json")
+
+
+# Fixed error bodies, serialized once
+_ERR_INVALID_CLIENT = _json_bytes({"error": "invalid_client"})
+_ERR_INVALID_REQUEST = _json_bytes({"error": "invalid_request"})
+_ERR_INVALID_GRANT = _json_bytes({"error": "invalid_grant"})
+_ERR_UNSUPPORTED_GRANT = _json_bytes({"error": "unsupported_grant_type"})
+_ERR_MISSING_BEARER = _json_bytes({"error": "invalid_request", "error_description": "Missing Bearer token"})
+_ERR_TOKEN_REVOKED = _json_bytes({
+    "active": False,
+    "error": "token_revoked",
+    "error_description": "Token has been revoked"
+})
+_ERR_TOKEN_INACTIVE = _json_bytes({
+    "active": False,
+    "error": "token_inactive",
+    "error_description": "Token is not active"
+})
+_ERR_TOKEN_EXPIRED = _json_bytes({
+    "active": False,
+    "error": "token_expired",
+    "error_description": "Token has expired"
+})
+
+# Serialized metadata documents keyed by base URL (bounded, base URL comes from the Host header)
+_METADATA_JSON: dict[str, bytes] = {}
+_METADATA_JSON_MAX = 16
+
+
+def _urlsafe(n: int = 32) -> str:
+    """Generate a random URL-safe token.
+
+    Same output as ``secrets.token_urlsafe(n)``, but slices the bytes from a
+    buffer refilled with one os.urandom call per 4 KiB instead of one per
+    token.
+
+    Args:
+        n: Number of random bytes
+
+    Returns:
+        Base64url-encoded token without padding
+    """
+    with _RNG_LOCK:
+        if len(_RNG_BUF) < n:
+            _RNG_BUF.extend(os.urandom(_RNG_BLOCK))
+        chunk = bytes(_RNG_BUF[:n])
+        del _RNG_BUF[:n]
+    return base64.urlsafe_b64encode(chunk).rstrip(b"=").decode()
+
+
+def _sign_jwt(payload: dict) -> str:
+    """Encode and sign an HS256 JWT.
+
+    Equivalent to ``jwt.encode(payload, JWT_SECRET_KEY, algorithm="HS256")``
+    but reuses the pre-encoded header and key instead of rebuilding them
+    on every token request.
+
+    Args:
+        payload: JSON-serializable claims
+
+    Returns:
+        Compact JWT string
+    """
+    body = base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).rstrip(b"=")
+    signing_input = _JWT_HEADER_B64 + b"." + body
+    signature = base64.urlsafe_b64encode(hmac.new(_JWT_KEY, signing_input, hashlib.sha256).digest()).rstrip(b"=")
+    return (signing_input + b"." + signature).decode()
 
 
 def initialize_clients() -> None:
-    """Initialize default OAuth2 clients."""
+    """Initialize default OAuth2 clients and token settings."""
+    global _TOKEN_EXPIRY, _ISSUER, _AUDIENCE
+
+    _TOKEN_EXPIRY = int(os.environ.get("OAUTH2_TOKEN_EXPIRY", DEFAULT_OAUTH2_TOKEN_EXPIRY))
+    _ISSUER = f"http://localhost:{int(os.environ.get('PORT', OAUTH2_PROVIDER_PORT))}"
+    _AUDIENCE = os.environ.get("OAUTH2_AUDIENCE", f"http://localhost:{PORT_OAUTH2_HTTP}")
+
     client_id = os.environ.get("OAUTH2_CLIENT_ID", DEFAULT_OAUTH2_CLIENT_ID)
     client_secret = os.environ.get("OAUTH2_CLIENT_SECRET", DEFAULT_OAUTH2_CLIENT_SECRET)
 
-    CLIENTS[client_id] = {
-        "client_id": client_id,
-        "client_secret": client_secret,
-        "redirect_uris": ["*"],  # Accept any redirect URI for testing
-    }
+    CLIENTS[client_id] = ClientRecord(
+        client_id=client_id,
+        client_secret=client_secret,
+        redirect_uris=["*"],  # Accept any redirect URI for testing
+    )
 
 
-async def oauth_authorize(request: Request) -> HTMLResponse | RedirectResponse:
+async def oauth_authorize(request: Request) -> HTMLResponse | RedirectResponse | Response:
     """Handle OAuth2 authorization requests.
 
     Args:
@@ -67,33 +248,35 @@ async def oauth_authorize(request: Request) -> HTMLResponse | RedirectResponse:
 
     # Validate client_id
     if not client_id or client_id not in CLIENTS:
-        return JSONResponse({"error": "invalid_client"}, status_code=400)
+        return _static_json(_ERR_INVALID_CLIENT, 400)
 
     if not redirect_uri:
-        return JSONResponse({"error": "invalid_request"}, status_code=400)
+        return _static_json(_ERR_INVALID_REQUEST, 400)
 
     # Auto-approve for testing (in production, show consent page)
     # Generate authorization code
-    code = secrets.token_urlsafe(32)
-    AUTHORIZATION_CODES[code] = {
-        "client_id": client_id,
-        "redirect_uri": redirect_uri,
-        "scope": scope,
-        "code_challenge": code_challenge,
-        "code_challenge_method": code_challenge_method,
-        "created_at": time.time(),
-    }
-
-    # Build redirect URL
-    params = {"code": code}
-    if state:
-        params["state"] = state
-
-    redirect_url = f"{redirect_uri}?{urlencode(params)}"
+    code = _urlsafe(32)
+    AUTHORIZATION_CODES[code] = AuthCodeRecord(
+        client_id=client_id,
+        redirect_uri=redirect_uri,
+        scope=scope,
+        code_challenge=code_challenge,
+        code_challenge_method=code_challenge_method,
+        created_at=time.time(),
+    )
+
+    # Build redirect URL (code is already URL-safe; only an unusual state needs quoting)
+    sep = "&" if "?" in redirect_uri else "?"
+    if not state:
+        redirect_url = f"{redirect_uri}{sep}code={code}"
+    elif _UNRESERVED_RE.fullmatch(state):
+        redirect_url = f"{redirect_uri}{sep}code={code}&state={state}"
+    else:
+        redirect_url = f"{redirect_uri}{sep}{urlencode({'code': code, 'state': state})}"
     return RedirectResponse(url=redirect_url, status_code=302)
 
 
-async def oauth_token(request: Request) -> JSONResponse:
+async def oauth_token(request: Request) -> Response:
     """Handle OAuth2 token requests.
 
     Args:
@@ -113,10 +296,10 @@ async def oauth_token(request: Request) -> JSONResponse:
     elif grant_type == "client_credentials":
         return await handle_client_credentials(request, form)
     else:
-        return JSONResponse({"error": "unsupported_grant_type"}, status_code=400)
+        return _static_json(_ERR_UNSUPPORTED_GRANT, 400)
 
 
-async def handle_authorization_code(request: Request, form: dict) -> JSONResponse:
+async def handle_authorization_code(request: Request, form: dict) -> Response:
     """Handle authorization code grant.
 
     Args:
@@ -134,52 +317,51 @@ async def handle_authorization_code(request: Request, form: dict) -> JSONRespons
 
     # Validate client credentials
     if not client_id or client_id not in CLIENTS:
-        return JSONResponse({"error": "invalid_client"}, status_code=401)
+        return _static_json(_ERR_INVALID_CLIENT, 401)
 
     client = CLIENTS[client_id]
-    if client_secret and client["client_secret"] != client_secret:
-        return JSONResponse({"error": "invalid_client"}, status_code=401)
-
-    # Validate authorization code
-    if not code or code not in AUTHORIZATION_CODES:
-        return JSONResponse({"error": "invalid_grant"}, status_code=400)
+    if client_secret and client.client_secret != client_secret:
+        return _static_json(_ERR_INVALID_CLIENT, 401)
 
-    auth_code = AUTHORIZATION_CODES[code]
+    # Validate and consume authorization code (single use, even if the exchange fails)
+    auth_code = AUTHORIZATION_CODES.pop(code, None) if code else None
+    if auth_code is None:
+        return _static_json(_ERR_INVALID_GRANT, 400)
 
     # Validate redirect URI
-    if auth_code["redirect_uri"] != redirect_uri:
-        return JSONResponse({"error": "invalid_grant"}, status_code=400)
+    if auth_code.redirect_uri != redirect_uri:
+        return _static_json(_ERR_INVALID_GRANT, 400)
 
     # Validate PKCE if present
-    if auth_code.get("code_challenge") and not code_verifier:
-        return JSONResponse({"error": "invalid_grant"}, status_code=400)
+    if auth_code.code_challenge and not code_verifier:
+        return _static_json(_ERR_INVALID_GRANT, 400)
         # In production, validate PKCE challenge here
 
-    # Delete used authorization code
-    del AUTHORIZATION_CODES[code]
-
     # Generate access token
-    access_token = secrets.token_urlsafe(32)
-    refresh_token = secrets.token_urlsafe(32)
-
-    ACCESS_TOKENS[access_token] = {
-        "client_id": client_id,
-        "scope": auth_code["scope"],
-        "created_at": time.time(),
-        "expires_in": DEFAULT_OAUTH2_TOKEN_EXPIRY,
-        "refresh_token": refresh_token,
-    }
+    access_token = _urlsafe(32)
+    refresh_token = _urlsafe(32)
+
+    now = time.time()
+    ACCESS_TOKENS[access_token] = AccessTokenRecord(
+        client_id=client_id,
+        scope=auth_code.scope,
+        created_at=now,
+        expires_at=now + DEFAULT_OAUTH2_TOKEN_EXPIRY,
+        grant_type="authorization_code",
+        refresh_token=refresh_token,
+    )
+    REFRESH_INDEX[refresh_token] = access_token
 
     return JSONResponse({
         "access_token": access_token,
         "token_type": "Bearer",
         "expires_in": DEFAULT_OAUTH2_TOKEN_EXPIRY,
         "refresh_token": refresh_token,
-        "scope": auth_code["scope"],
+        "scope": auth_code.scope,
     })
 
 
-async def handle_refresh_token(request: Request, form: dict) -> JSONResponse:
+async def handle_refresh_token(request: Request, form: dict) -> Response:
     """Handle refresh token grant.
 
     Args:
@@ -193,41 +375,40 @@ async def handle_refresh_token(request: Request, form: dict) -> JSONResponse:
     client_id = form.get("client_id")
 
     # Find access token by refresh token
-    old_access_token = None
-    for token, data in ACCESS_TOKENS.items():
-        if data.get("refresh_token") == refresh_token and data["client_id"] == client_id:
-            old_access_token = token
-            break
-
-    if not old_access_token:
-        return JSONResponse({"error": "invalid_grant"}, status_code=400)
+    old_access_token = REFRESH_INDEX.get(refresh_token)
+    old_data = ACCESS_TOKENS.get(old_access_token) if old_access_token else None
+    if old_data is None or old_data.client_id != client_id:
+        return _static_json(_ERR_INVALID_GRANT, 400)
 
     # Generate new tokens
-    access_token = secrets.token_urlsafe(32)
-    new_refresh_token = secrets.token_urlsafe(32)
-
-    old_data = ACCESS_TOKENS[old_access_token]
-    ACCESS_TOKENS[access_token] = {
-        "client_id": client_id,
-        "scope": old_data["scope"],
-        "created_at": time.time(),
-        "expires_in": DEFAULT_OAUTH2_TOKEN_EXPIRY,
-        "refresh_token": new_refresh_token,
-    }
-
-    # Delete old token
-    del ACCESS_TOKENS[old_access_token]
+    access_token = _urlsafe(32)
+    new_refresh_token = _urlsafe(32)
+
+    now = time.time()
+    ACCESS_TOKENS[access_token] = AccessTokenRecord(
+        client_id=client_id,
+        scope=old_data.scope,
+        created_at=now,
+        expires_at=now + DEFAULT_OAUTH2_TOKEN_EXPIRY,
+        grant_type="refresh_token",
+        refresh_token=new_refresh_token,
+    )
+    REFRESH_INDEX[new_refresh_token] = access_token
+
+    # Delete old token (refresh tokens are single-use)
+    ACCESS_TOKENS.pop(old_access_token, None)
+    REFRESH_INDEX.pop(refresh_token, None)
 
     return JSONResponse({
         "access_token": access_token,
         "token_type": "Bearer",
         "expires_in": DEFAULT_OAUTH2_TOKEN_EXPIRY,
         "refresh_token": new_refresh_token,
-        "scope": old_data["scope"],
+        "scope": old_data.scope,
     })
 
 
-async def handle_client_credentials(request: Request, form: dict) -> JSONResponse:
+async def handle_client_credentials(request: Request, form: dict) -> Response:
     """Handle client credentials grant.
 
     Args:
@@ -243,48 +424,36 @@ async def handle_client_credentials(request: Request, form: dict) -> JSONRespons
     
     # If not in form, check Authorization header (Basic Auth)
     if not client_id or not client_secret:
-        auth_header = request.headers.get("Authorization", "")
-        if auth_header.startswith("Basic "):
-            import base64
-            try:
-                credentials = base64.b64decode(auth_header[6:]).decode("utf-8")
-                client_id, client_secret = credentials.split(":", 1)
-            except Exception:
-                return JSONResponse({"error": "invalid_client"}, status_code=401)
-        else:
-            return JSONResponse({"error": "invalid_client"}, status_code=401)
+        m = _AUTH_RE.match(request.headers.get("Authorization", ""))
+        if m is None or m[1] != "Basic":
+            return _static_json(_ERR_INVALID_CLIENT, 401)
+        try:
+            raw_id, raw_secret = base64.b64decode(m[2], validate=True).split(b":", 1)
+            client_id, client_secret = raw_id.decode("utf-8"), raw_secret.decode("utf-8")
+        except (binascii.Error, ValueError):
+            return _static_json(_ERR_INVALID_CLIENT, 401)
     
     # Validate client credentials
     if not client_id or client_id not in CLIENTS:
-        return JSONResponse({"error": "invalid_client"}, status_code=401)
+        return _static_json(_ERR_INVALID_CLIENT, 401)
     
     client = CLIENTS[client_id]
-    if client["client_secret"] != client_secret:
-        return JSONResponse({"error": "invalid_client"}, status_code=401)
+    if client.client_secret != client_secret:
+        return _static_json(_ERR_INVALID_CLIENT, 401)
     
     # Get requested scope (default to MCP scopes)
     scope = form.get("scope", "mcp:tools:read mcp:tools:write")
     
-    # Get token expiry
-    token_expiry = int(os.environ.get("OAUTH2_TOKEN_EXPIRY", DEFAULT_OAUTH2_TOKEN_EXPIRY))
-    
     # Generate JWT access token
     now = int(time.time())
-    exp = now + token_expiry
-    jti = secrets.token_urlsafe(16)  # Token ID for revocation
-    
-    # Get provider URL for issuer claim
-    provider_port = int(os.environ.get("PORT", OAUTH2_PROVIDER_PORT))
-    issuer = f"http://localhost:{provider_port}"
-    
-    # Get audience (resource server) from environment or use default
-    audience = os.environ.get("OAUTH2_AUDIENCE", f"http://localhost:{PORT_OAUTH2_HTTP}")
+    exp = now + _TOKEN_EXPIRY
+    jti = _urlsafe(16)  # Token ID for revocation
     
     # JWT payload with standard claims
     payload = {
-        "iss": issuer,  # Issuer
+        "iss": _ISSUER,  # Issuer
         "sub": client_id,  # Subject (client_id for client credentials)
-        "aud": audience,  # Audience (resource server)
+        "aud": _AUDIENCE,  # Audience (resource server)
         "exp": exp,  # Expiration time
         "iat": now,  # Issued at
         "jti": jti,  # JWT ID (for revocation)
@@ -294,27 +463,26 @@ async def handle_client_credentials(request: Request, form: dict) -> JSONRespons
     }
     
     # Generate JWT
-    access_token = jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+    access_token = _sign_jwt(payload)
     
     # Store token metadata for introspection (keyed by jti)
-    ACCESS_TOKENS[jti] = {
-        "client_id": client_id,
-        "scope": scope,
-        "created_at": now,
-        "expires_at": exp,
-        "grant_type": "client_credentials",
-        "active": True,
-    }
+    ACCESS_TOKENS[jti] = AccessTokenRecord(
+        client_id=client_id,
+        scope=scope,
+        created_at=now,
+        expires_at=exp,
+        grant_type="client_credentials",
+    )
     
     return JSONResponse({
         "access_token": access_token,
         "token_type": "Bearer",
-        "expires_in": token_expiry,
+        "expires_in": _TOKEN_EXPIRY,
         "scope": scope,
     })
 
 
-async def oauth_metadata(request: Request) -> JSONResponse:
+async def oauth_metadata(request: Request) -> Response:
     """Provide OAuth2 Authorization Server Metadata (RFC 8414).
 
     Args:
@@ -324,8 +492,24 @@ async def oauth_metadata(request: Request) -> JSONResponse:
         JSON response with AS metadata
     """
     base_url = str(request.base_url).rstrip("/")
+    body = _METADATA_JSON.get(base_url)
+    if body is None:
+        body = _build_metadata(base_url)
+        if len(_METADATA_JSON) < _METADATA_JSON_MAX:
+            _METADATA_JSON[base_url] = body
+    return _static_json(body)
 
-    return JSONResponse({
+
+def _build_metadata(base_url: str) -> bytes:
+    """Serialize the AS metadata document for base_url.
+
+    Args:
+        base_url: Public base URL of the provider
+
+    Returns:
+        JSON-encoded metadata
+    """
+    return _json_bytes({
         "issuer": base_url,
         "authorization_endpoint": f"{base_url}/oauth/authorize",
         "token_endpoint": f"{base_url}/oauth/token",
@@ -340,7 +524,7 @@ async def oauth_metadata(request: Request) -> JSONResponse:
     })
 
 
-async def validate_token(request: Request) -> JSONResponse:
+async def validate_token(request: Request) -> Response:
     """Validate JWT access token (RFC 7662 Token Introspection).
 
     Args:
@@ -349,44 +533,25 @@ async def validate_token(request: Request) -> JSONResponse:
     Returns:
         JSON response with token introspection result
     """
-    auth_header = request.headers.get("Authorization", "")
-    if not auth_header.startswith("Bearer "):
-        return JSONResponse({"error": "invalid_request", "error_description": "Missing Bearer token"}, status_code=401)
+    m = _AUTH_RE.match(request.headers.get("Authorization", ""))
+    if m is None or m[1] != "Bearer":
+        return _static_json(_ERR_MISSING_BEARER, 401)
 
-    token = auth_header[7:]
+    token = m[2]
     
     try:
-        # Decode and verify JWT (without audience validation - introspection should work for any audience)
-        payload = jwt.decode(
-            token,
-            JWT_SECRET_KEY,
-            algorithms=[JWT_ALGORITHM],
-            options={
-                "verify_signature": True,
-                "verify_exp": True,
-                "verify_iat": True,
-                "verify_aud": False,  # Don't validate audience during introspection
-            }
-        )
+        # Decode and verify JWT (without audience validation)
+        payload = _JWT_DECODER.decode(token, _JWT_KEY, algorithms=_JWT_ALGORITHMS)
         
         # Extract jti to check if token was revoked
         jti = payload.get("jti")
-        if not jti or jti not in ACCESS_TOKENS:
-            return JSONResponse({
-                "active": False,
-                "error": "token_revoked",
-                "error_description": "Token has been revoked"
-            }, status_code=401)
-        
-        token_data = ACCESS_TOKENS[jti]
+        token_data = ACCESS_TOKENS.get(jti) if jti else None
+        if token_data is None:
+            return _static_json(_ERR_TOKEN_REVOKED, 401)
         
         # Check if token is still active
-        if not token_data.get("active", False):
-            return JSONResponse({
-                "active": False,
-                "error": "token_inactive",
-                "error_description": "Token is not active"
-            }, status_code=401)
+        if not token_data.active:
+            return _static_json(_ERR_TOKEN_INACTIVE, 401)
         
         # Return introspection response (RFC 7662)
         return JSONResponse({
@@ -403,11 +568,7 @@ async def validate_token(request: Request) -> JSONResponse:
         })
         
     except jwt.ExpiredSignatureError:
-        return JSONResponse({
-            "active": False,
-            "error": "token_expired",
-            "error_description": "Token has expired"
-        }, status_code=401)
+        return _static_json(_ERR_TOKEN_EXPIRED, 401)
     except jwt.InvalidTokenError as e:
         return JSONResponse({
             "active": False,
@@ -416,6 +577,53 @@ async def validate_token(request: Request) -> JSONResponse:
         }, status_code=401)
 
 
+def reap_expired(now: float | None = None) -> None:
+    """Drop expired tokens and authorization codes from the in-memory stores.
+
+    Client credentials tokens are removed once expired (their JWT can no
+    longer validate anyway). Opaque tokens are kept for a grace period past
+    expiry so their refresh token stays usable.
+
+    Args:
+        now: Current epoch time (defaults to time.time())
+    """
+    if now is None:
+        now = time.time()
+
+    refresh_cutoff = now - _REFRESH_GRACE
+    expired = [
+        (token, data.refresh_token)
+        for token, data in ACCESS_TOKENS.items()
+        if data.expires_at < (now if data.refresh_token is None else refresh_cutoff)
+    ]
+    for token, refresh_token in expired:
+        ACCESS_TOKENS.pop(token, None)
+        if refresh_token is not None:
+            REFRESH_INDEX.pop(refresh_token, None)
+
+    code_cutoff = now - _AUTH_CODE_TTL
+    stale_codes = [code for code, data in AUTHORIZATION_CODES.items() if data.created_at < code_cutoff]
+    for code in stale_codes:
+        AUTHORIZATION_CODES.pop(code, None)
+
+
+async def _reaper() -> None:
+    """Run reap_expired() every _REAP_INTERVAL seconds until cancelled."""
+    while True:
+        await asyncio.sleep(_REAP_INTERVAL)
+        reap_expired()
+
+
+@asynccontextmanager
+async def lifespan(app: Starlette) -> AsyncIterator[None]:
+    """Run the expired-state reaper for the lifetime of the app."""
+    task = asyncio.create_task(_reaper())
+    try:
+        yield
+    finally:
+        task.cancel()
+
+
 def create_app() -> Starlette:
     """Create OAuth2 provider application.
 
@@ -431,17 +639,19 @@ def create_app() -> Starlette:
         Route("/oauth/validate", validate_token, methods=["POST"]),
     ]
 
-    return Starlette(debug=True, routes=routes)
+    return Starlette(debug=True, routes=routes, lifespan=lifespan)
 
 
 if __name__ == "__main__":
     import uvicorn
 
     port = int(os.environ.get("PORT", OAUTH2_PROVIDER_PORT))
-    logger.info(f"Starting OAuth2 Provider on port {port}")
-    logger.info(f"Client ID: {os.environ.get('OAUTH2_CLIENT_ID', DEFAULT_OAUTH2_CLIENT_ID)}")
-    logger.info(f"Authorization endpoint: http://localhost:{port}/oauth/authorize")
-    logger.info(f"Token endpoint: http://localhost:{port}/oauth/token")
+    logger.info("Starting OAuth2 Provider on port %d", port)
+    logger.info("Client ID: %s", os.environ.get('OAUTH2_CLIENT_ID', DEFAULT_OAUTH2_CLIENT_ID))
+    logger.info("Authorization endpoint: http://localhost:%d/oauth/authorize", port)
+    logger.info("Token endpoint: http://localhost:%d/oauth/token", port)
 
     app = create_app()
-    uvicorn.run(app, host="127.0.0.1", port=port)
+    # Single worker: tokens, codes and clients live in this process's memory.
+    # loop/http stay "auto", which picks uvloop/httptools when installed.
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level=os.environ.get("LOG_LEVEL", "warning"))
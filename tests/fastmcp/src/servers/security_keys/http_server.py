@@ -5,245 +5,211 @@ Domain: Database Query Tool - Run SQL queries, inspect schemas, and export resul
 Validates X-GitHub-Token and X-Brave-Key headers.
 """
 
+import functools
 import os
+import random
+import re
+from time import gmtime, strftime, time
 
 from fastmcp import FastMCP
-from fastmcp.server.middleware import Middleware, MiddlewareContext
-from fastmcp.server.dependencies import get_http_headers
-from starlette.responses import JSONResponse
 
+from src.common.auth_providers import parse_api_keys
 from src.common.constants import (
     DEFAULT_BRAVE_API_KEY,
     DEFAULT_GITHUB_PAT,
     PORT_SECURITY_KEYS_HTTP,
     SERVER_NAME_SECURITY_KEYS,
 )
-from src.common.logging import get_logger, log_startup, mask_sensitive_value
-from src.common.middleware import add_standard_middleware
+from src.common.logging import get_logger, log_startup
+from src.common.security_keys_middleware import SecurityKeysAuthMiddleware
+from src.common.timestamps import SECONDS_PER_DAY, utc_iso
+from src.servers._factory import make_server
 
 
 # Get module logger
 logger = get_logger(__name__)
 
+# Module-level generator with cached bound methods for the simulated data;
+# reseeded in forked workers so they don't replay the parent's sequence
+_rng = random.Random()
+_randint = _rng.randint
+_choice = _rng.choice
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_rng.seed)
+
+# Leading SQL keyword -> query type reported by run_sql_query
+_QUERY_KEYWORD_RE = re.compile(r"\s*([A-Za-z]+)")
+_QUERY_TYPES = {"select": "SELECT", "insert": "INSERT", "update": "UPDATE", "delete": "DELETE"}
+
+# Row statuses for simulated SELECT results
+_STATUSES = ("active", "pending", "completed")
+
+# Accepted export formats (dict keys: O(1) membership, listed in order in errors)
+_VALID_EXPORT_FORMATS = dict.fromkeys(("csv", "json", "xlsx", "sql"))
+
+# Simulated schema returned by get_table_schema (shared between calls; treat as read-only)
+_DEFAULT_COLUMNS = (
+    {"name": "id", "type": "INTEGER", "nullable": False, "primary_key": True, "auto_increment": True},
+    {"name": "name", "type": "VARCHAR(255)", "nullable": False, "primary_key": False, "default": None},
+    {"name": "email", "type": "VARCHAR(255)", "nullable": True, "primary_key": False, "default": None},
+    {"name": "created_at", "type": "TIMESTAMP", "nullable": False, "primary_key": False, "default": "CURRENT_TIMESTAMP"},
+    {"name": "updated_at", "type": "TIMESTAMP", "nullable": True, "primary_key": False, "default": None},
+)
+_DEFAULT_INDEXES = (
+    {"name": "PRIMARY", "columns": ["id"], "unique": True, "type": "BTREE"},
+    {"name": "idx_email", "columns": ["email"], "unique": True, "type": "BTREE"},
+    {"name": "idx_created_at", "columns": ["created_at"], "unique": False, "type": "BTREE"},
+)
+_DEFAULT_CONSTRAINTS = (
+    {"name": "PRIMARY KEY", "type": "PRIMARY KEY", "columns": ["id"]},
+    {"name": "UNIQUE_email", "type": "UNIQUE", "columns": ["email"]},
+)
+
+
+@functools.lru_cache(maxsize=512)
+def _utc_date(epoch_day: int) -> str:
+    """ISO date (``YYYY-MM-DD``) of a day counted from the epoch, in UTC."""
+    return strftime("%Y-%m-%d", gmtime(epoch_day * SECONDS_PER_DAY))
+
 
-class SecurityKeysAuthMiddleware(Middleware):
-    """Middleware to validate custom security key headers."""
+# Domain: Database Query Tool
+def run_sql_query(query: str, database: str = "default", limit: int = 100) -> dict:
+    """Execute a SQL query and return the results.
+
+    Args:
+        query: SQL query to execute
+        database: Target database name
+        limit: Maximum number of rows to return (1-1000)
+
+    Returns:
+        Dictionary with query results, execution time, and metadata
+    """
+    if limit < 1 or limit > 1000:
+        return {"error": "Limit must be between 1 and 1000", "success": False}
     
-    def __init__(self, github_pats: set[str], brave_keys: set[str]):
-        self.github_pats = github_pats
-        self.brave_keys = brave_keys
+    # Simulate query execution
+    m = _QUERY_KEYWORD_RE.match(query)
+    query_type = _QUERY_TYPES.get(m[1].lower(), "OTHER") if m else "OTHER"
     
-    async def on_request(self, context: MiddlewareContext, call_next):
-        """Validate X-GitHub-Token and X-Brave-Key headers."""
-        headers = get_http_headers()
-        
-        if headers:
-            logger.debug("=====================================================")
-            logger.debug(f"Request: {context.method}")
-            logger.debug("HTTP Headers:")
-            
-            for header_name, header_value in headers.items():
-                if header_name.lower() in ['x-github-token', 'x-brave-key']:
-                    masked = mask_sensitive_value(header_value, show_chars=20)
-                    logger.debug(f"  {header_name}: {masked}")
-                else:
-                    logger.debug(f"  {header_name}: {header_value}")
-            
-            github_token = headers.get('x-github-token')
-            brave_key = headers.get('x-brave-key')
-            
-            github_valid = github_token in self.github_pats if github_token else False
-            brave_valid = brave_key in self.brave_keys if brave_key else False
-            
-            logger.debug(f"GitHub token valid: {github_valid}")
-            logger.debug(f"Brave key valid: {brave_valid}")
-            logger.debug("=====================================================")
-            
-            # Accept if EITHER key is valid (simulates different MCP servers)
-            if not (github_valid or brave_valid):
-                return JSONResponse(
-                    status_code=401,
-                    content={
-                        "error": "invalid_token",
-                        "error_description": "Either X-GitHub-Token or X-Brave-Key header required and must be valid"
-                    }
-                )
-        else:
-            # No headers = no auth
-            return JSONResponse(
-                status_code=401,
-                content={
-                    "error": "invalid_token",
-                    "error_description": "X-GitHub-Token and X-Brave-Key headers required"
-                }
-            )
-        
-        return await call_next(context)
+    # Generate sample results for SELECT queries
+    now_ts = time()
+    executed_at = utc_iso(now_ts)
+    results = []
+    if query_type == "SELECT":
+        # Rows are whole days before now, so they share its time of day;
+        # only the (cached) date part is looked up per row
+        today = int(now_ts // SECONDS_PER_DAY)
+        time_of_day = executed_at[10:]
+        num_rows = _randint(5, min(limit, 50))
+        results = [
+            {
+                "id": i + 1,
+                "name": f"Record_{i+1}",
+                "value": _randint(10000, 1000000) / 100,
+                "status": _choice(_STATUSES),
+                "created_at": _utc_date(today - _randint(1, 365)) + time_of_day
+            }
+            for i in range(num_rows)
+        ]
+    
+    execution_time_ms = _randint(1000, 50000) / 100
+    
+    return {
+        "success": True,
+        "query_type": query_type,
+        "database": database,
+        "rows_returned": len(results),
+        "execution_time_ms": execution_time_ms,
+        "executed_at": executed_at,
+        "results": results,
+        "truncated": len(results) >= limit
+    }
 
 
-def create_server() -> FastMCP:
-    """Create Security Keys HTTP server.
+def get_table_schema(table_name: str, database: str = "default") -> dict:
+    """Get the schema definition of a database table.
+
+    Args:
+        table_name: Name of the table to inspect
+        database: Database containing the table
 
     Returns:
-        Configured FastMCP server with custom header auth via middleware
+        Dictionary with table schema, columns, indexes, and constraints
     """
-    # Get valid security keys from environment or use defaults
-    github_pats_str = os.environ.get("GITHUB_PATS", DEFAULT_GITHUB_PAT)
-    brave_api_keys_str = os.environ.get("BRAVE_API_KEYS", DEFAULT_BRAVE_API_KEY)
-
-    valid_github_pats = {key.strip() for key in github_pats_str.split(",") if key.strip()}
-    valid_brave_keys = {key.strip() for key in brave_api_keys_str.split(",") if key.strip()}
+    # Simulate table schema
+    return {
+        "success": True,
+        "database": database,
+        "table_name": table_name,
+        "row_count": _randint(100, 100000),
+        "table_size_mb": _randint(100, 50000) / 100,
+        "columns": list(_DEFAULT_COLUMNS),
+        "indexes": list(_DEFAULT_INDEXES),
+        "constraints": list(_DEFAULT_CONSTRAINTS),
+        "engine": "InnoDB",
+        "collation": "utf8mb4_unicode_ci",
+        "created_at": utc_iso(time() - _randint(30, 1000) * SECONDS_PER_DAY)
+    }
+
+
+def export_query_results(query_id: str, format: str = "csv") -> dict:
+    """Export previously executed query results to file.
+
+    Args:
+        query_id: Unique identifier of the query to export
+        format: Export format (csv, json, xlsx, sql)
 
-    # Create FastMCP server WITHOUT built-in auth (middleware handles it)
-    mcp = FastMCP(name=SERVER_NAME_SECURITY_KEYS)
-    
-    # Add standard middleware stack (structured logging)
-    add_standard_middleware(
-        mcp,
-        server_prefix="SECURITY_KEYS_HTTP",
-        enable_structured_logging=True,
-        enable_header_logging=False,  # Custom auth middleware logs headers
-    )
-    
-    # Add middleware to validate custom headers (must be after logging)
-    mcp.add_middleware(SecurityKeysAuthMiddleware(valid_github_pats, valid_brave_keys))
-
-    # Domain: Database Query Tool
-    @mcp.tool()
-    def run_sql_query(query: str, database: str = "default", limit: int = 100) -> dict:
-        """Execute a SQL query and return the results.
-
-        Args:
-            query: SQL query to execute
-            database: Target database name
-            limit: Maximum number of rows to return (1-1000)
-
-        Returns:
-            Dictionary with query results, execution time, and metadata
-        """
-        from datetime import datetime, timedelta
-        import random
-        
-        if limit < 1 or limit > 1000:
-            return {"error": "Limit must be between 1 and 1000", "success": False}
-        
-        # Simulate query execution
-        query_lower = query.lower()
-        query_type = "SELECT" if "select" in query_lower else "INSERT" if "insert" in query_lower else "UPDATE" if "update" in query_lower else "DELETE" if "delete" in query_lower else "OTHER"
-        
-        # Generate sample results for SELECT queries
-        results = []
-        if query_type == "SELECT":
-            num_rows = random.randint(5, min(limit, 50))
-            for i in range(num_rows):
-                results.append({
-                    "id": i + 1,
-                    "name": f"Record_{i+1}",
-                    "value": round(random.uniform(100, 10000), 2),
-                    "status": random.choice(["active", "pending", "completed"]),
-                    "created_at": (datetime.utcnow() - timedelta(days=random.randint(1, 365))).isoformat()
-                })
-        
-        execution_time_ms = round(random.uniform(10, 500), 2)
-        
+    Returns:
+        Dictionary with export details and download information
+    """
+    if format not in _VALID_EXPORT_FORMATS:
         return {
-            "success": True,
-            "query_type": query_type,
-            "database": database,
-            "rows_returned": len(results),
-            "execution_time_ms": execution_time_ms,
-            "executed_at": datetime.utcnow().isoformat(),
-            "results": results,
-            "truncated": len(results) >= limit
+            "error": f"Invalid format. Must be one of: {', '.join(_VALID_EXPORT_FORMATS)}",
+            "success": False
         }
+    
+    # Simulate export
+    now_ts = time()
+    file_size_mb = _randint(10, 10000) / 100
+    row_count = _randint(100, 50000)
+    
+    return {
+        "success": True,
+        "query_id": query_id,
+        "format": format,
+        "file_name": f"query_{query_id}_{strftime('%Y%m%d_%H%M%S', gmtime(now_ts))}.{format}",
+        "file_size_mb": file_size_mb,
+        "row_count": row_count,
+        "download_url": f"https://exports.example.com/downloads/{query_id}.{format}",
+        "expires_at": utc_iso(now_ts + SECONDS_PER_DAY),
+        "generated_at": utc_iso(now_ts),
+        "status": "ready"
+    }
 
-    @mcp.tool()
-    def get_table_schema(table_name: str, database: str = "default") -> dict:
-        """Get the schema definition of a database table.
-
-        Args:
-            table_name: Name of the table to inspect
-            database: Database containing the table
-
-        Returns:
-            Dictionary with table schema, columns, indexes, and constraints
-        """
-        from datetime import datetime, timedelta
-        import random
-        
-        # Simulate table schema
-        columns = [
-            {"name": "id", "type": "INTEGER", "nullable": False, "primary_key": True, "auto_increment": True},
-            {"name": "name", "type": "VARCHAR(255)", "nullable": False, "primary_key": False, "default": None},
-            {"name": "email", "type": "VARCHAR(255)", "nullable": True, "primary_key": False, "default": None},
-            {"name": "created_at", "type": "TIMESTAMP", "nullable": False, "primary_key": False, "default": "CURRENT_TIMESTAMP"},
-            {"name": "updated_at", "type": "TIMESTAMP", "nullable": True, "primary_key": False, "default": None},
-        ]
-        
-        indexes = [
-            {"name": "PRIMARY", "columns": ["id"], "unique": True, "type": "BTREE"},
-            {"name": "idx_email", "columns": ["email"], "unique": True, "type": "BTREE"},
-            {"name": "idx_created_at", "columns": ["created_at"], "unique": False, "type": "BTREE"},
-        ]
-        
-        constraints = [
-            {"name": "PRIMARY KEY", "type": "PRIMARY KEY", "columns": ["id"]},
-            {"name": "UNIQUE_email", "type": "UNIQUE", "columns": ["email"]},
-        ]
-        
-        return {
-            "success": True,
-            "database": database,
-            "table_name": table_name,
-            "row_count": random.randint(100, 100000),
-            "table_size_mb": round(random.uniform(1, 500), 2),
-            "columns": columns,
-            "indexes": indexes,
-            "constraints": constraints,
-            "engine": "InnoDB",
-            "collation": "utf8mb4_unicode_ci",
-            "created_at": (datetime.utcnow() - timedelta(days=random.randint(30, 1000))).isoformat()
-        }
 
-    @mcp.tool()
-    def export_query_results(query_id: str, format: str = "csv") -> dict:
-        """Export previously executed query results to file.
-
-        Args:
-            query_id: Unique identifier of the query to export
-            format: Export format (csv, json, xlsx, sql)
-
-        Returns:
-            Dictionary with export details and download information
-        """
-        from datetime import datetime, timedelta
-        import random
-        
-        valid_formats = ["csv", "json", "xlsx", "sql"]
-        if format not in valid_formats:
-            return {
-                "error": f"Invalid format. Must be one of: {', '.join(valid_formats)}",
-                "success": False
-            }
-        
-        # Simulate export
-        file_size_mb = round(random.uniform(0.1, 100), 2)
-        row_count = random.randint(100, 50000)
-        
-        return {
-            "success": True,
-            "query_id": query_id,
-            "format": format,
-            "file_name": f"query_{query_id}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{format}",
-            "file_size_mb": file_size_mb,
-            "row_count": row_count,
-            "download_url": f"https://exports.example.com/downloads/{query_id}.{format}",
-            "expires_at": (datetime.utcnow() + timedelta(hours=24)).isoformat(),
-            "generated_at": datetime.utcnow().isoformat(),
-            "status": "ready"
-        }
+# Tools registered by create_server()
+TOOLS = (run_sql_query, get_table_schema, export_query_results)
 
-    return mcp
+
+def create_server() -> FastMCP:
+    """Create Security Keys HTTP server.
+
+    Returns:
+        Configured FastMCP server with custom header auth via middleware
+    """
+    # Get valid security keys from environment or use defaults
+    valid_github_pats = parse_api_keys(os.environ.get("GITHUB_PATS", DEFAULT_GITHUB_PAT))
+    valid_brave_keys = parse_api_keys(os.environ.get("BRAVE_API_KEYS", DEFAULT_BRAVE_API_KEY))
+
+    # Create FastMCP server WITHOUT built-in auth: the custom header
+    # middleware handles it, added after the standard (logging) stack
+    return make_server(
+        SERVER_NAME_SECURITY_KEYS,
+        "SECURITY_KEYS_HTTP",
+        TOOLS,
+        header_logging=False,  # Custom auth middleware logs headers
+        middleware=[SecurityKeysAuthMiddleware(valid_github_pats, valid_brave_keys)],
+    )
 
 
 if __name__ == "__main__":
@@ -1,21 +1,26 @@
 """Pytest configuration and fixtures."""
 
 import asyncio
+import importlib
 import logging
 import multiprocessing
 import os
+import re
 import signal
 import socket
+import sys
+import threading
 import time
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Callable, Generator
+from pathlib import Path
 
+import httpx
 import pytest
 import uvicorn
+from fastmcp import Client
+from fastmcp.client.transports import StreamableHttpTransport
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
+from common.auth_providers import create_basic_auth_header
 from common.constants import (
     DEFAULT_API_KEY,
     DEFAULT_BRAVE_API_KEY,
@@ -28,9 +33,47 @@ from common.constants import (
     DEFAULT_USERNAME,
     OAUTH2_PROVIDER_PORT,
     PORT_NO_AUTH_HTTP,
+    PORT_NO_AUTH_SSE,
     PORT_OAUTH2_HTTP,
 )
 
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Spawn server processes from a forkserver that has the heavy libraries,
+# the server modules and this conftest (home of the process targets)
+# preloaded, rather than forking the whole pytest process for each server
+if "forkserver" in multiprocessing.get_all_start_methods():
+    multiprocessing.set_start_method("forkserver", force=True)
+    multiprocessing.set_forkserver_preload([
+        "uvicorn",
+        "starlette",
+        "fastmcp",
+        __name__,
+        "servers.basic_auth.http_server",
+        "servers.basic_auth.sse_server",
+        "servers.api_key.http_server",
+        "servers.api_key.sse_server",
+        "servers.security_keys.http_server",
+        "servers.no_auth.http_server",
+        "servers.no_auth.sse_server",
+        "servers.oauth2.http_server",
+    ])
+
+
+def _port_offset() -> int:
+    """Port shift for this pytest-xdist worker (0 outside xdist).
+
+    Every worker runs its own copy of each server; worker ``gwN`` moves all
+    of its ports up by ``10 * N`` so the copies don't collide.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "")
+    return 10 * int(worker[2:]) if worker.startswith("gw") else 0
+
+
+PORT_OFFSET = _port_offset()
+
 
 def is_port_in_use(port: int) -> bool:
     """Check if a port is in use.
@@ -45,42 +88,6 @@ def is_port_in_use(port: int) -> bool:
         return s.connect_ex(('localhost', port)) == 0
 
 
-def wait_for_port(port: int, timeout: int = 10) -> bool:
-    """Wait for a port to become available.
-    
-    Args:
-        port: Port number to wait for
-        timeout: Maximum seconds to wait
-        
-    Returns:
-        True if port is available, False if timeout
-    """
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        if is_port_in_use(port):
-            return True
-        time.sleep(0.2)
-    return False
-
-
-def wait_for_port_release(port: int, timeout: int = 5) -> bool:
-    """Wait for a port to be released (no longer in use).
-    
-    Args:
-        port: Port number to wait for
-        timeout: Maximum seconds to wait
-        
-    Returns:
-        True if port is released, False if timeout
-    """
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        if not is_port_in_use(port):
-            return True
-        time.sleep(0.1)
-    return False
-
-
 def cleanup_process(process: multiprocessing.Process, port: int, server_name: str) -> None:
     """Cleanup a server process forcefully.
     
@@ -89,357 +96,312 @@ def cleanup_process(process: multiprocessing.Process, port: int, server_name: st
         port: Port the server is running on
         server_name: Name of the server for logging
     """
-    logger.info(f"[CLEANUP] Stopping {server_name} on port {port}")
+    logger.info("[CLEANUP] Stopping %s on port %d", server_name, port)
     
     # Try graceful termination first
     if process.is_alive():
-        logger.debug(f"[CLEANUP] Terminating {server_name} process (PID: {process.pid})")
+        logger.debug("[CLEANUP] Terminating %s process (PID: %d)", server_name, process.pid)
         process.terminate()
         process.join(timeout=5)  # Increased from 2s to 5s for FastMCP background workers
     
     # Force kill if still alive
     if process.is_alive():
-        logger.warning(f"[CLEANUP] Force killing {server_name} (PID: {process.pid})")
+        logger.warning("[CLEANUP] Force killing %s (PID: %d)", server_name, process.pid)
         process.kill()
         process.join(timeout=1)
     
-    # Wait for port to be released
+    # The listening socket closes with the process, and uvicorn binds with
+    # SO_REUSEADDR, so the port can be reused right away (TIME_WAIT left by
+    # closed connections does not block the next bind)
     if is_port_in_use(port):
-        logger.debug(f"[CLEANUP] Waiting for port {port} to be released")
-        if not wait_for_port_release(port, timeout=3):
-            logger.warning(f"[CLEANUP] Port {port} still in use after cleanup")
-        else:
-            logger.info(f"[CLEANUP] Port {port} released successfully")
+        logger.warning("[CLEANUP] Port %d still in use after cleanup", port)
     
-    logger.info(f"[CLEANUP] {server_name} cleanup complete")
+    logger.info("[CLEANUP] %s cleanup complete", server_name)
 
 
-def run_server_process(server_module: str, port: int) -> None:
-    """Run a server in a separate process.
+def listen_socket(port: int, server_name: str) -> socket.socket:
+    """Bind and listen on a server's port in this process.
+
+    A server handed this socket needs no readiness wait: connections queue in
+    the backlog from the moment it exists until the server accepts them.
+
+    Args:
+        port: Port to listen on
+        server_name: Name of the server for error messages
+
+    Returns:
+        Listening socket (SO_REUSEADDR, as uvicorn binds its own)
+
+    Raises:
+        RuntimeError: If the port is already in use
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    try:
+        sock.bind(("127.0.0.1", port))
+    except OSError as e:
+        sock.close()
+        raise RuntimeError(f"Port {port} already in use before starting {server_name} server") from e
+    sock.listen(2048)  # uvicorn's default backlog
+    return sock
+
+
+def uvicorn_server(server_module: str, port: int, create_args: tuple = ()) -> uvicorn.Server:
+    """Build a uvicorn.Server for a server module's FastMCP app.
 
     Args:
         server_module: Python module path of the server
         port: Port to run the server on
-    """
-    import importlib
+        create_args: Arguments for the module's ``create_server()``
 
+    Returns:
+        Server configured like FastMCP.run(); serve it with ``serve(sockets=...)``
+    """
     module = importlib.import_module(server_module)
-    server = module.create_server()
 
     # Determine transport from module name
     transport = "sse" if "sse" in server_module else "http"
-
-    server.run(transport=transport, port=port, log_level="error")
+    app = module.create_server(*create_args).http_app(transport=transport)
+
+    # Same uvicorn settings FastMCP.run() uses
+    config = uvicorn.Config(
+        app,
+        host="127.0.0.1",
+        port=port,
+        log_level="error",
+        lifespan="on",
+        ws="websockets-sansio",
+        timeout_graceful_shutdown=0,
+    )
+    return uvicorn.Server(config)
 
 
-def run_oauth_provider(port: int) -> None:
-    """Run OAuth2 provider in a separate process.
+def run_server_process(server_module: str, port: int, sock: socket.socket) -> None:
+    """Run a server in a separate process.
 
     Args:
-        port: Port to run the provider on
+        server_module: Python module path of the server
+        port: Port to run the server on
+        sock: Listening socket for ``port``, bound by the parent
     """
-    from servers.oauth2.provider import create_app
-
-    app = create_app()
-    uvicorn.run(app, host="127.0.0.1", port=port, log_level="error")
-
-
-@pytest.fixture
-def event_loop() -> Generator:
-    """Create event loop for async tests."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+    asyncio.run(uvicorn_server(server_module, port).serve(sockets=[sock]))
+
+
+try:
+    import uvloop
+except ImportError:
+    pass  # Without the speed extra, pytest-asyncio's default policy applies
+else:
+    @pytest.fixture(scope="session")
+    def event_loop_policy() -> uvloop.EventLoopPolicy:
+        """Event loop policy for async tests: uvloop, from the speed extra.
+
+        pytest-asyncio builds one session-wide loop from this policy
+        (asyncio_default_test_loop_scope = "session" in pyproject.toml).
+        """
+        return uvloop.EventLoopPolicy()
+
+
+# Server fixtures: fixture key -> (server module, port, display name)
+SERVERS: dict[str, tuple[str, int, str]] = {
+    key: (module, port + PORT_OFFSET, name)
+    for key, (module, port, name) in {
+        "basic_auth_http": ("servers.basic_auth.http_server", 8000, "Basic Auth HTTP"),
+        "basic_auth_sse": ("servers.basic_auth.sse_server", 8001, "Basic Auth SSE"),
+        "api_key_http": ("servers.api_key.http_server", 8002, "API Key HTTP"),
+        "api_key_sse": ("servers.api_key.sse_server", 8003, "API Key SSE"),
+        "security_keys": ("servers.security_keys.http_server", 8004, "Security Keys"),
+        "oauth2_http": ("servers.oauth2.http_server", PORT_OAUTH2_HTTP, "OAuth2 HTTP"),
+        "no_auth_http": ("servers.no_auth.http_server", PORT_NO_AUTH_HTTP, "No Auth HTTP"),
+        "no_auth_sse": ("servers.no_auth.sse_server", PORT_NO_AUTH_SSE, "No Auth SSE"),
+    }.items()
+}
+
+# OAuth2 provider port for this worker
+_PROVIDER_PORT = OAUTH2_PROVIDER_PORT + PORT_OFFSET
+
+# SERVERS keys of the servers shared by the whole session (fixture: "<key>_server")
+_STATELESS_SERVERS = (
+    "basic_auth_http",
+    "basic_auth_sse",
+    "api_key_http",
+    "api_key_sse",
+    "security_keys",
+    "no_auth_http",
+    "no_auth_sse",
+)
 
 
-# Function-scoped fixtures for per-test server management (AAA pattern)
+def _spawn(target: Callable[..., None], args: tuple, port: int, server_name: str) -> Generator[str]:
+    """Run ``target(*args, sock)`` in a server process for the duration of a fixture.
 
+    The port is bound here and the listening socket handed to the child, so
+    the server is reachable as soon as the process starts: connections queue
+    in the backlog until it accepts them, and no readiness wait is needed.
 
-@pytest.fixture
-def basic_auth_http_server() -> Generator:
-    """Start Basic Auth HTTP server for testing (port 8000).
-    
     AAA Pattern:
-    - Arrange: Start server and wait for port
+    - Arrange: Bind the port and start the server process
     - Act: Test runs (yield)
     - Cleanup: Stop server
-    """
-    port = 8000
-    server_name = "Basic Auth HTTP"
-    
-    # Ensure port is free before starting
-    if is_port_in_use(port):
-        raise RuntimeError(f"Port {port} already in use before starting {server_name} server")
-    
-    logger.info(f"[SETUP] Starting {server_name} server on port {port}")
-    process = multiprocessing.Process(
-        target=run_server_process,
-        args=("servers.basic_auth.http_server", port),
-        daemon=True,
-    )
-    process.start()
-    
-    # Wait for server to be ready
-    if not wait_for_port(port, timeout=10):
-        cleanup_process(process, port, server_name)
-        raise RuntimeError(f"{server_name} server failed to start on port {port}")
-    
-    logger.info(f"[SETUP] {server_name} server ready on port {port}")
-    
-    try:
-        yield
-    finally:
-        cleanup_process(process, port, server_name)
 
+    Args:
+        target: Module-level function that runs the server (picklable); it
+            gets the listening socket as its last argument
+        args: Arguments for ``target``
+        port: Port the server listens on
+        server_name: Name of the server for logging
 
-@pytest.fixture
-def basic_auth_sse_server() -> Generator:
-    """Start Basic Auth SSE server for testing (port 8001).
-    
-    AAA Pattern:
-    - Arrange: Start server and wait for port
-    - Act: Test runs (yield)
-    - Cleanup: Stop server
+    Yields:
+        The server's base URL
+
+    Raises:
+        RuntimeError: If the port is already taken or the server fails to start
     """
-    port = 8001
-    server_name = "Basic Auth SSE"
-    
-    if is_port_in_use(port):
-        raise RuntimeError(f"Port {port} already in use before starting {server_name} server")
-    
-    logger.info(f"[SETUP] Starting {server_name} server on port {port}")
-    process = multiprocessing.Process(
-        target=run_server_process,
-        args=("servers.basic_auth.sse_server", port),
-        daemon=True,
-    )
-    process.start()
-    
-    if not wait_for_port(port, timeout=10):
-        cleanup_process(process, port, server_name)
-        raise RuntimeError(f"{server_name} server failed to start on port {port}")
-    
-    logger.info(f"[SETUP] {server_name} server ready on port {port}")
-    
+    sock = listen_socket(port, server_name)
+    logger.info("[SETUP] Starting %s server on port %d", server_name, port)
     try:
-        yield
+        process = multiprocessing.Process(target=target, args=(*args, sock), daemon=True)
+        process.start()
     finally:
-        cleanup_process(process, port, server_name)
-
+        sock.close()  # The child has its own copy
 
-@pytest.fixture
-def api_key_http_server() -> Generator:
-    """Start API Key HTTP server for testing (port 8002).
-    
-    AAA Pattern:
-    - Arrange: Start server and wait for port
-    - Act: Test runs (yield)
-    - Cleanup: Stop server
-    """
-    port = 8002
-    server_name = "API Key HTTP"
-    
-    if is_port_in_use(port):
-        raise RuntimeError(f"Port {port} already in use before starting {server_name} server")
-    
-    logger.info(f"[SETUP] Starting {server_name} server on port {port}")
-    process = multiprocessing.Process(
-        target=run_server_process,
-        args=("servers.api_key.http_server", port),
-        daemon=True,
-    )
-    process.start()
-    
-    if not wait_for_port(port, timeout=10):
-        cleanup_process(process, port, server_name)
-        raise RuntimeError(f"{server_name} server failed to start on port {port}")
-    
-    logger.info(f"[SETUP] {server_name} server ready on port {port}")
-    
     try:
-        yield
+        if not process.is_alive():
+            raise RuntimeError(f"{server_name} server failed to start on port {port}")
+        yield f"http://localhost:{port}"
     finally:
         cleanup_process(process, port, server_name)
 
 
-@pytest.fixture
-def api_key_sse_server() -> Generator:
-    """Start API Key SSE server for testing (port 8003).
-    
-    AAA Pattern:
-    - Arrange: Start server and wait for port
-    - Act: Test runs (yield)
-    - Cleanup: Stop server
+def _fresh_servers() -> bool:
+    """Whether PYTEST_FRESH_SERVERS=1 asks for a new server process per test.
+
+    Without it, the stateless servers share one in-process event loop.
     """
-    port = 8003
-    server_name = "API Key SSE"
-    
-    if is_port_in_use(port):
-        raise RuntimeError(f"Port {port} already in use before starting {server_name} server")
-    
-    logger.info(f"[SETUP] Starting {server_name} server on port {port}")
-    process = multiprocessing.Process(
-        target=run_server_process,
-        args=("servers.api_key.sse_server", port),
-        daemon=True,
-    )
-    process.start()
-    
-    if not wait_for_port(port, timeout=10):
-        cleanup_process(process, port, server_name)
-        raise RuntimeError(f"{server_name} server failed to start on port {port}")
-    
-    logger.info(f"[SETUP] {server_name} server ready on port {port}")
-    
-    try:
-        yield
-    finally:
-        cleanup_process(process, port, server_name)
+    return os.environ.get("PYTEST_FRESH_SERVERS") == "1"
 
 
-@pytest.fixture
-def security_keys_server() -> Generator:
-    """Start Security Keys HTTP server for testing (port 8004).
-    
-    AAA Pattern:
-    - Arrange: Start server and wait for port
-    - Act: Test runs (yield)
-    - Cleanup: Stop server
+def _server_scope(fixture_name: str, config: pytest.Config) -> str:
+    """Scope for the server fixtures other than the OAuth2 provider.
+
+    These servers keep no per-test state, so one instance per server is shared
+    by the whole session. Set PYTEST_FRESH_SERVERS=1 to restart them per test.
     """
-    port = 8004
-    server_name = "Security Keys"
-    
-    if is_port_in_use(port):
-        raise RuntimeError(f"Port {port} already in use before starting {server_name} server")
-    
-    logger.info(f"[SETUP] Starting {server_name} server on port {port}")
-    process = multiprocessing.Process(
-        target=run_server_process,
-        args=("servers.security_keys.http_server", port),
-        daemon=True,
-    )
-    process.start()
-    
-    if not wait_for_port(port, timeout=10):
-        cleanup_process(process, port, server_name)
-        raise RuntimeError(f"{server_name} server failed to start on port {port}")
-    
-    logger.info(f"[SETUP] {server_name} server ready on port {port}")
-    
-    try:
-        yield
-    finally:
-        cleanup_process(process, port, server_name)
+    return "function" if _fresh_servers() else "session"
 
 
-@pytest.fixture
-def oauth2_http_server(oauth2_provider) -> Generator:
-    """Start OAuth2 HTTP server for testing.
-    
-    Requires oauth2_provider to be running.
-    
-    AAA Pattern:
-    - Arrange: Start server and wait for port
-    - Act: Test runs (yield)
-    - Cleanup: Stop server
-    """
-    port = PORT_OAUTH2_HTTP
-    server_name = "OAuth2 HTTP"
-    
-    if is_port_in_use(port):
-        raise RuntimeError(f"Port {port} already in use before starting {server_name} server")
-    
-    logger.info(f"[SETUP] Starting {server_name} server on port {port}")
-    process = multiprocessing.Process(
-        target=run_server_process,
-        args=("servers.oauth2.http_server", port),
-        daemon=True,
-    )
-    process.start()
-    
-    if not wait_for_port(port, timeout=10):
-        cleanup_process(process, port, server_name)
-        raise RuntimeError(f"{server_name} server failed to start on port {port}")
-    
-    logger.info(f"[SETUP] {server_name} server ready on port {port}")
-    
-    try:
-        yield
-    finally:
-        cleanup_process(process, port, server_name)
+@pytest.fixture(scope="session")
+def _stateless_servers(request: pytest.FixtureRequest) -> Generator:
+    """Serve every stateless server the collected tests use from one event loop.
 
+    The stateless servers hold no process-global state, so they don't need a
+    process each: every one becomes a ``uvicorn.Server`` task on a single
+    asyncio loop in a background thread, serving a socket bound upfront.
 
-@pytest.fixture
-def no_auth_http_server() -> Generator:
-    """Start No Auth HTTP server for testing.
-    
-    AAA Pattern:
-    - Arrange: Start server and wait for port
-    - Act: Test runs (yield)
-    - Cleanup: Stop server
+    Yields:
+        The thread running the servers' event loop
     """
-    port = PORT_NO_AUTH_HTTP
-    server_name = "No Auth HTTP"
-    
-    if is_port_in_use(port):
-        raise RuntimeError(f"Port {port} already in use before starting {server_name} server")
-    
-    logger.info(f"[SETUP] Starting {server_name} server on port {port}")
-    process = multiprocessing.Process(
-        target=run_server_process,
-        args=("servers.no_auth.http_server", port),
-        daemon=True,
+    used = {name for item in request.session.items for name in item.fixturenames}
+    keys = [key for key in _STATELESS_SERVERS if f"{key}_server" in used]
+    servers: list[tuple[uvicorn.Server, socket.socket]] = []
+    try:
+        for key in keys:
+            server_module, port, server_name = SERVERS[key]
+            sock = listen_socket(port, server_name)
+            servers.append((uvicorn_server(server_module, port), sock))
+            logger.info("[SETUP] Starting %s server on port %d", server_name, port)
+    except BaseException:
+        for _, sock in servers:
+            sock.close()
+        raise
+
+    async def _serve_all() -> None:
+        await asyncio.gather(*(server.serve(sockets=[sock]) for server, sock in servers))
+
+    # The sockets already listen, so tests can connect right away; requests
+    # queue until each server has finished its startup
+    thread = threading.Thread(
+        target=asyncio.run, args=(_serve_all(),), name="test-servers", daemon=True
     )
-    process.start()
-    
-    if not wait_for_port(port, timeout=10):
-        cleanup_process(process, port, server_name)
-        raise RuntimeError(f"{server_name} server failed to start on port {port}")
-    
-    logger.info(f"[SETUP] {server_name} server ready on port {port}")
-    
+    thread.start()
     try:
-        yield
+        yield thread
     finally:
-        cleanup_process(process, port, server_name)
+        logger.info("[CLEANUP] Stopping %d in-process servers", len(servers))
+        for server, _ in servers:
+            server.should_exit = True
+        thread.join(timeout=5)
+        if thread.is_alive():
+            logger.warning("[CLEANUP] In-process servers did not stop within 5s")
+        for _, sock in servers:
+            sock.close()
+        logger.info("[CLEANUP] In-process servers cleanup complete")
+
+
+def _server_fixture(request: pytest.FixtureRequest, key: str) -> Generator[str]:
+    """Provide the ``SERVERS[key]`` server: the shared instance, or a fresh process.
+
+    Yields:
+        The server's base URL
+    """
+    if _fresh_servers():
+        server_module, port, server_name = SERVERS[key]
+        yield from _spawn(run_server_process, (server_module, port), port, server_name)
+        return
 
+    _, port, server_name = SERVERS[key]
+    if not request.getfixturevalue("_stateless_servers").is_alive():
+        raise RuntimeError(f"{server_name} server is no longer running")
+    yield f"http://localhost:{port}"
+
+
+# Session-scoped fixtures for the stateless servers (AAA pattern); each yields
+# the server's base URL, as ports move per pytest-xdist worker (PORT_OFFSET)
+
+
+@pytest.fixture(scope=_server_scope)
+def basic_auth_http_server(request: pytest.FixtureRequest) -> Generator[str]:
+    """Start Basic Auth HTTP server for testing (port 8000)."""
+    yield from _server_fixture(request, "basic_auth_http")
+
+
+@pytest.fixture(scope=_server_scope)
+def basic_auth_sse_server(request: pytest.FixtureRequest) -> Generator[str]:
+    """Start Basic Auth SSE server for testing (port 8001)."""
+    yield from _server_fixture(request, "basic_auth_sse")
+
+
+@pytest.fixture(scope=_server_scope)
+def api_key_http_server(request: pytest.FixtureRequest) -> Generator[str]:
+    """Start API Key HTTP server for testing (port 8002)."""
+    yield from _server_fixture(request, "api_key_http")
+
+
+@pytest.fixture(scope=_server_scope)
+def api_key_sse_server(request: pytest.FixtureRequest) -> Generator[str]:
+    """Start API Key SSE server for testing (port 8003)."""
+    yield from _server_fixture(request, "api_key_sse")
+
+
+@pytest.fixture(scope=_server_scope)
+def security_keys_server(request: pytest.FixtureRequest) -> Generator[str]:
+    """Start Security Keys HTTP server for testing (port 8004)."""
+    yield from _server_fixture(request, "security_keys")
 
-@pytest.fixture
-def no_auth_sse_server() -> Generator:
-    """Start No Auth SSE server for testing (port 8007).
-    
-    AAA Pattern:
-    - Arrange: Start server and wait for port
-    - Act: Test runs (yield)
-    - Cleanup: Stop server
-    """
-    port = 8007
-    server_name = "No Auth SSE"
-    
-    if is_port_in_use(port):
-        raise RuntimeError(f"Port {port} already in use before starting {server_name} server")
-    
-    logger.info(f"[SETUP] Starting {server_name} server on port {port}")
-    process = multiprocessing.Process(
-        target=run_server_process,
-        args=("servers.no_auth.sse_server", port),
-        daemon=True,
-    )
-    process.start()
-    
-    if not wait_for_port(port, timeout=10):
-        cleanup_process(process, port, server_name)
-        raise RuntimeError(f"{server_name} server failed to start on port {port}")
-    
-    logger.info(f"[SETUP] {server_name} server ready on port {port}")
-    
-    try:
-        yield
-    finally:
-        cleanup_process(process, port, server_name)
 
+@pytest.fixture(scope=_server_scope)
+def no_auth_http_server(request: pytest.FixtureRequest) -> Generator[str]:
+    """Start No Auth HTTP server for testing."""
+    yield from _server_fixture(request, "no_auth_http")
 
-@pytest.fixture
+
+@pytest.fixture(scope=_server_scope)
+def no_auth_sse_server(request: pytest.FixtureRequest) -> Generator[str]:
+    """Start No Auth SSE server for testing (port 8008)."""
+    yield from _server_fixture(request, "no_auth_sse")
+
+
+@pytest.fixture(scope="session")
 def test_credentials() -> dict:
     """Provide test credentials for all auth types.
 
@@ -456,53 +418,247 @@ def test_credentials() -> dict:
         "oauth2_client_secret": DEFAULT_OAUTH2_CLIENT_SECRET,
     }
 
+
+@pytest.fixture(scope="session")
+def basic_bearer_token(test_credentials) -> str:
+    """Test credentials as a Basic Auth header value with the Bearer scheme.
+
+    FastMCP only accepts the Bearer scheme, so the Basic Auth servers take
+    ``Bearer <base64 user:password>``.
+    """
+    auth_header = create_basic_auth_header(test_credentials["username"], test_credentials["password"])
+    return auth_header.replace("Basic ", "Bearer ")
+
+
+@pytest.fixture(scope="session")
+async def shared_http_client() -> AsyncGenerator[httpx.AsyncClient]:
+    """Provide one pooled httpx client for the tests' plain HTTP requests.
+
+    Token requests and discovery GETs reuse its keep-alive connections
+    instead of opening new ones for every test.
+
+    Yields:
+        httpx.AsyncClient with a 10s timeout
+    """
+    async with httpx.AsyncClient(
+        timeout=10.0,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    ) as client:
+        yield client
+
+
+# resource_metadata URL in a WWW-Authenticate Bearer challenge
+RESOURCE_METADATA_RE = re.compile(r'resource_metadata="([^"]+)"')
+
+
+@pytest.fixture(scope=_server_scope)
+async def oauth2_discovery(oauth2_http_server, oauth2_provider_server, shared_http_client) -> dict:
+    """Discover the OAuth2 server's authorization server once (RFC 9728/8414).
+
+    Runs the 401 -> PRM -> AS metadata chain a client would, so tests that
+    only need its results don't repeat it;
+    test_oauth2_client_credentials_end_to_end still walks it step by step.
+    The authorization server is the provider fixture, so its metadata is
+    fetched alongside the PRM and checked against it afterwards.
+
+    Returns:
+        Dictionary with the PRM, the AS metadata and the token endpoint
+    """
+    response = await shared_http_client.post(
+        f"{oauth2_http_server}/mcp", json={"jsonrpc": "2.0", "id": 1, "method": "ping"}
+    )
+    assert response.status_code == 401
+    match = RESOURCE_METADATA_RE.search(response.headers.get("www-authenticate", ""))
+    assert match, "WWW-Authenticate must contain resource_metadata URL"
+
+    prm_response, as_response = await asyncio.gather(
+        shared_http_client.get(match.group(1)),
+        shared_http_client.get(f"{oauth2_provider_server}/.well-known/oauth-authorization-server"),
+    )
+    assert prm_response.status_code == 200
+    prm = prm_response.json()
+    assert prm["authorization_servers"][0].rstrip("/") == oauth2_provider_server
+    assert as_response.status_code == 200
+    as_metadata = as_response.json()
+
+    return {"prm": prm, "as_metadata": as_metadata, "token_endpoint": as_metadata["token_endpoint"]}
+
+
+# Issued access tokens by (token endpoint, client id, scope): token and
+# time.monotonic() deadline. Outlives the OAuth2 server fixture, so tests
+# restarting that server (PYTEST_FRESH_SERVERS) still reuse one token.
+_access_tokens: dict[tuple[str, str, str], tuple[str, float]] = {}
+
+# Re-mint a cached token this many seconds before it expires
+_TOKEN_EXPIRY_MARGIN = 30.0
+
+
+@pytest.fixture(scope=_server_scope)
+async def oauth2_access_token(oauth2_discovery, test_credentials, shared_http_client) -> str:
+    """Fetch an OAuth2 access token (client credentials grant), cached until it expires.
+
+    The token endpoint comes from oauth2_discovery. The token is minted
+    once and handed out again until it is close to its ``expires_in``.
+
+    Returns:
+        The access token
+    """
+    scope = "mcp:tools:read mcp:tools:write"
+    key = (oauth2_discovery["token_endpoint"], test_credentials["oauth2_client_id"], scope)
+    cached = _access_tokens.get(key)
+    if cached is not None and time.monotonic() < cached[1]:
+        return cached[0]
+
+    token_response = await shared_http_client.post(
+        oauth2_discovery["token_endpoint"],
+        data={
+            "grant_type": "client_credentials",
+            "client_id": test_credentials["oauth2_client_id"],
+            "client_secret": test_credentials["oauth2_client_secret"],
+            "scope": scope,
+        },
+    )
+    assert token_response.status_code == 200
+    token_data = token_response.json()
+    expires_in = float(token_data.get("expires_in", 0))
+    _access_tokens[key] = (
+        token_data["access_token"],
+        time.monotonic() + expires_in - _TOKEN_EXPIRY_MARGIN,
+    )
+    return token_data["access_token"]
+
+
+@pytest.fixture(scope=_server_scope)
+def oauth2_bearer_headers(oauth2_access_token) -> dict[str, str]:
+    """Authorization header for the cached OAuth2 access token, built once.
+
+    Treat as read-only; it is shared by every test using the token.
+    """
+    return {"Authorization": f"Bearer {oauth2_access_token}"}
+
+
+# Authenticated MCP clients, connected once and shared like the servers they
+# talk to; the MCP initialize handshake runs once per client, not per test.
+# Negative-path tests build their own one-off clients.
+
+
+@pytest.fixture(scope=_server_scope)
+async def basic_auth_http_client(basic_auth_http_server, basic_bearer_token) -> AsyncGenerator[Client]:
+    """Connected Basic Auth HTTP client (credentials sent with the Bearer scheme)."""
+    transport = StreamableHttpTransport(
+        f"{basic_auth_http_server}/mcp",
+        headers={"Authorization": basic_bearer_token},
+    )
+    async with Client(transport) as client:
+        yield client
+
+
+@pytest.fixture(scope=_server_scope)
+async def basic_auth_sse_client(basic_auth_sse_server, basic_bearer_token) -> AsyncGenerator[Client]:
+    """Connected Basic Auth SSE client (BearerAuth adds the "Bearer " prefix)."""
+    client = Client(f"{basic_auth_sse_server}/sse", auth=basic_bearer_token.removeprefix("Bearer "))
+    async with client:
+        yield client
+
+
+@pytest.fixture(scope=_server_scope)
+async def api_key_http_client(api_key_http_server, test_credentials) -> AsyncGenerator[Client]:
+    """Connected API Key HTTP client."""
+    client = Client(f"{api_key_http_server}/mcp", auth=test_credentials["api_key"])
+    async with client:
+        yield client
+
+
+@pytest.fixture(scope=_server_scope)
+async def api_key_sse_client(api_key_sse_server, test_credentials) -> AsyncGenerator[Client]:
+    """Connected API Key SSE client."""
+    client = Client(f"{api_key_sse_server}/sse", auth=test_credentials["api_key"])
+    async with client:
+        yield client
+
+
+@pytest.fixture(scope=_server_scope)
+async def security_keys_github_client(security_keys_server, test_credentials) -> AsyncGenerator[Client]:
+    """Connected Security Keys client sending X-GitHub-Token."""
+    transport = StreamableHttpTransport(
+        f"{security_keys_server}/mcp",
+        headers={"X-GitHub-Token": test_credentials["github_pat"]},
+    )
+    async with Client(transport) as client:
+        yield client
+
+
+@pytest.fixture(scope=_server_scope)
+async def security_keys_brave_client(security_keys_server, test_credentials) -> AsyncGenerator[Client]:
+    """Connected Security Keys client sending X-Brave-Key."""
+    transport = StreamableHttpTransport(
+        f"{security_keys_server}/mcp",
+        headers={"X-Brave-Key": test_credentials["brave_api_key"]},
+    )
+    async with Client(transport) as client:
+        yield client
+
+
+@pytest.fixture(scope=_server_scope)
+async def no_auth_http_client(no_auth_http_server) -> AsyncGenerator[Client]:
+    """Connected No Auth HTTP client."""
+    async with Client(f"{no_auth_http_server}/mcp") as client:
+        yield client
+
+
+@pytest.fixture(scope=_server_scope)
+async def no_auth_sse_client(no_auth_sse_server) -> AsyncGenerator[Client]:
+    """Connected No Auth SSE client."""
+    async with Client(f"{no_auth_sse_server}/sse") as client:
+        yield client
+
+
+@pytest.fixture(scope=_server_scope)
+async def oauth2_client(oauth2_http_server, oauth2_bearer_headers) -> AsyncGenerator[Client]:
+    """Connected OAuth2 HTTP client using the cached access token."""
+    transport = StreamableHttpTransport(f"{oauth2_http_server}/mcp", headers=oauth2_bearer_headers)
+    async with Client(transport) as client:
+        yield client
+
+
+def run_oauth2_provider(port: int, audience: str, sock: socket.socket) -> None:
+    """Run the OAuth2 provider (Authorization Server) on ``sock``.
+
+    Must be defined at module level for multiprocessing pickling. The
+    provider module is imported only here, after its environment is set,
+    since it reads its signing key at import time.
+    """
+    os.environ["PORT"] = str(port)
+    os.environ["LOG_LEVEL"] = "error"
+    # Tokens are issued for this worker's OAuth2 HTTP server
+    os.environ["OAUTH2_AUDIENCE"] = audience
+
+    from servers.oauth2.provider import create_app
+
+    config = uvicorn.Config(create_app(), host="127.0.0.1", port=port, log_level="error")
+    asyncio.run(uvicorn.Server(config).serve(sockets=[sock]))
+
+
 @pytest.fixture(scope="session")
-def oauth2_provider_server() -> Generator:
+def oauth2_provider_server() -> Generator[str]:
     """Start OAuth2 Provider (Authorization Server) for testing (port 9000).
-    
+
     Uses session scope since the provider can be shared across all tests.
-    
-    AAA Pattern:
-    - Arrange: Start OAuth2 provider and wait for port
-    - Act: Test runs (yield)
-    - Cleanup: Stop provider
+
+    Yields:
+        The provider's base URL
     """
-    port = OAUTH2_PROVIDER_PORT
-    server_name = "OAuth2 Provider"
-    
-    if is_port_in_use(port):
-        raise RuntimeError(f"Port {port} already in use before starting {server_name}")
-    
-    logger.info(f"[SETUP] Starting {server_name} on port {port}")
-    process = multiprocessing.Process(
-        target=run_oauth_provider,
-        args=(port,),
-        daemon=True,
-    )
-    process.start()
-    
-    if not wait_for_port(port, timeout=10):
-        cleanup_process(process, port, server_name)
-        raise RuntimeError(f"{server_name} failed to start on port {port}")
-    
-    logger.info(f"[SETUP] {server_name} ready on port {port}")
-    
-    try:
-        yield
-    finally:
-        cleanup_process(process, port, server_name)
+    audience = f"http://localhost:{SERVERS['oauth2_http'][1]}"
+    yield from _spawn(run_oauth2_provider, (_PROVIDER_PORT, audience), _PROVIDER_PORT, "OAuth2 Provider")
 
 
-def run_oauth2_http_server(port: int):
+def run_oauth2_http_server(port: int, provider_port: int, sock: socket.socket) -> None:
     """Run OAuth2 HTTP server with MCP + separate PRM server.
     
     Must be defined at module level for multiprocessing pickling.
     Runs both MCP server (port) and PRM server (port+1) via threading.
+    Serves ``sock``, which the parent bound to ``port``.
     """
-    import sys
-    import os
-    from pathlib import Path
-    
     # Set up Python path
     src_path = str(Path(__file__).parent.parent.absolute())
     if src_path not in sys.path:
@@ -510,52 +666,26 @@ def run_oauth2_http_server(port: int):
     
     # Set environment
     os.environ["PORT"] = str(port)
-    os.environ["OAUTH2_PROVIDER_PORT"] = str(OAUTH2_PROVIDER_PORT)
+    os.environ["OAUTH2_PROVIDER_PORT"] = str(provider_port)
     
-    # Import and run - the module's __main__ handles both servers
-    import runpy
-    runpy.run_module("servers.oauth2.http_server", run_name="__main__")
+    # The module is preloaded by the forkserver; create_server reads the
+    # environment set above
+    server = uvicorn_server("servers.oauth2.http_server", port, create_args=(port,))
+    asyncio.run(server.serve(sockets=[sock]))
 
 
-@pytest.fixture
-def oauth2_http_server(oauth2_provider_server) -> Generator:
+@pytest.fixture(scope=_server_scope)
+def oauth2_http_server(oauth2_provider_server) -> Generator[str]:
     """Start OAuth2 HTTP server for testing.
-    
+
     Depends on oauth2_provider_server to ensure AS is running first.
     Uses the combined Starlette app with both PRM and MCP endpoints.
-    
-    AAA Pattern:
-    - Arrange: Start OAuth2 MCP server and wait for port
-    - Act: Test runs (yield)
-    - Cleanup: Stop server
+    The server sets process-wide environment, so it keeps a process of its
+    own, but like the stateless servers it is shared by the whole session
+    unless PYTEST_FRESH_SERVERS=1.
+
+    Yields:
+        The server's base URL
     """
-    port = PORT_OAUTH2_HTTP
-    server_name = "OAuth2 HTTP"
-    
-    if is_port_in_use(port):
-        raise RuntimeError(f"Port {port} already in use before starting {server_name} server")
-    
-    logger.info(f"[SETUP] Starting {server_name} server on port {port}")
-    
-    # Set environment variables for OAuth2 configuration
-    env = os.environ.copy()
-    env["PORT"] = str(port)
-    env["OAUTH2_PROVIDER_PORT"] = str(OAUTH2_PROVIDER_PORT)
-    
-    process = multiprocessing.Process(
-        target=run_oauth2_http_server,
-        args=(port,),
-        daemon=True,
-    )
-    process.start()
-    
-    if not wait_for_port(port, timeout=10):
-        cleanup_process(process, port, server_name)
-        raise RuntimeError(f"{server_name} server failed to start on port {port}")
-    
-    logger.info(f"[SETUP] {server_name} server ready on port {port}")
-    
-    try:
-        yield
-    finally:
-        cleanup_process(process, port, server_name)
\ No newline at end of file
+    _, port, server_name = SERVERS["oauth2_http"]
+    yield from _spawn(run_oauth2_http_server, (port, _PROVIDER_PORT), port, server_name)
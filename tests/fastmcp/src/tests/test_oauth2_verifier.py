@@ -0,0 +1,99 @@
+"""Tests for the OAuth2 HTTP server's token verifier (shape check, introspection cache)."""
+
+import asyncio
+import json
+import time
+from collections import Counter
+
+import httpx
+import pytest
+
+from servers.oauth2 import http_server
+from servers.oauth2.http_server import OAuth2TokenVerifier
+
+_PROVIDER_URL = "http://provider.test"
+
+
+class _Provider:
+    """Introspection endpoint stand-in that counts requests per token."""
+
+    def __init__(self) -> None:
+        self.calls: Counter[str] = Counter()
+        self.revoked: set[str] = set()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        token = request.headers["Authorization"].removeprefix("Bearer ")
+        self.calls[token] += 1
+        if token in self.revoked:
+            return httpx.Response(401, json={"active": False, "error": "token_revoked"})
+        body = {"active": True, "client_id": "test-client", "scope": "mcp:tools:read", "exp": int(time.time()) + 3600}
+        return httpx.Response(200, content=json.dumps(body).encode())
+
+
+@pytest.fixture
+async def provider_and_verifier():
+    """Verifier whose introspection requests are answered by a ``_Provider``."""
+    provider = _Provider()
+    verifier = OAuth2TokenVerifier(_PROVIDER_URL, base_url="http://server.test")
+    await verifier.aclose()
+    verifier._client = httpx.AsyncClient(base_url=_PROVIDER_URL, transport=httpx.MockTransport(provider))
+    yield provider, verifier
+    await verifier.aclose()
+
+
+class TestIntrospectionCache:
+    """Introspection results are reused until their TTL, LRU-evicted when full."""
+
+    async def test_hit_skips_provider(self, provider_and_verifier) -> None:
+        provider, verifier = provider_and_verifier
+
+        first = await verifier.verify_token("opaque-token-1")
+        second = await verifier.verify_token("opaque-token-1")
+
+        assert first is not None and second is first
+        assert provider.calls["opaque-token-1"] == 1
+
+    async def test_rejection_is_not_cached(self, provider_and_verifier) -> None:
+        provider, verifier = provider_and_verifier
+        provider.revoked.add("opaque-token-1")
+
+        assert await verifier.verify_token("opaque-token-1") is None
+        assert await verifier.verify_token("opaque-token-1") is None
+        assert provider.calls["opaque-token-1"] == 2
+
+    async def test_revoked_token_accepted_until_ttl(self, provider_and_verifier, monkeypatch) -> None:
+        provider, verifier = provider_and_verifier
+        monkeypatch.setattr(http_server, "_INTROSPECTION_CACHE_TTL", 0.05)
+
+        assert await verifier.verify_token("opaque-token-1") is not None
+        provider.revoked.add("opaque-token-1")
+        # Within the TTL the cached result still answers
+        assert await verifier.verify_token("opaque-token-1") is not None
+        await asyncio.sleep(0.1)
+        # After it the provider is asked again and the revocation is seen
+        assert await verifier.verify_token("opaque-token-1") is None
+        assert provider.calls["opaque-token-1"] == 2
+
+    async def test_least_recently_used_evicted(self, provider_and_verifier, monkeypatch) -> None:
+        provider, verifier = provider_and_verifier
+        monkeypatch.setattr(http_server, "_INTROSPECTION_CACHE_SIZE", 2)
+
+        await verifier.verify_token("opaque-token-1")
+        await verifier.verify_token("opaque-token-2")
+        await verifier.verify_token("opaque-token-1")  # token 2 is now least recently used
+        await verifier.verify_token("opaque-token-3")  # evicts token 2
+        await verifier.verify_token("opaque-token-1")
+        await verifier.verify_token("opaque-token-2")
+
+        assert provider.calls == {"opaque-token-1": 1, "opaque-token-2": 2, "opaque-token-3": 1}
+
+
+class TestTokenShape:
+    """Tokens of neither provider shape are rejected before introspection."""
+
+    @pytest.mark.parametrize("token", ["not.a.jwt.at.all", "one.dot", "bad token!", ""])
+    async def test_misshapen_token_never_introspected(self, provider_and_verifier, token: str) -> None:
+        provider, verifier = provider_and_verifier
+
+        assert await verifier.verify_token(token) is None
+        assert not provider.calls
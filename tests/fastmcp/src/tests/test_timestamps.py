@@ -0,0 +1,30 @@
+"""Tests for the shared UTC timestamp helpers."""
+
+import random
+from datetime import UTC, datetime
+
+import pytest
+
+from common.timestamps import utc_iso
+
+
+def _datetime_iso(ts: float) -> str:
+    """Reference formatting: naive UTC datetime, always with microseconds."""
+    return datetime.fromtimestamp(ts, UTC).replace(tzinfo=None).isoformat(timespec="microseconds")
+
+
+class TestUtcIso:
+    """utc_iso must produce the same text as datetime for the same timestamp."""
+
+    @pytest.mark.parametrize(
+        "ts",
+        [0, 0.5, 1791979276.719528, 1791979276.9999996, 1700000000.0000004, 86_399.999_999_5],
+    )
+    def test_matches_datetime_edge_cases(self, ts: float) -> None:
+        assert utc_iso(ts) == _datetime_iso(ts)
+
+    def test_matches_datetime_random(self) -> None:
+        rng = random.Random(1234)
+        for _ in range(100_000):
+            ts = rng.uniform(0, 4_102_444_800)  # 1970 .. 2100
+            assert utc_iso(ts) == _datetime_iso(ts), ts